@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from harness import Measurement, save
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    # "import time: self [us] | cumulative | imported package"
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative)))
+    return entries
+
+
+def run_once(statement: str) -> list[tuple[str, int, int, int]]:
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True
+    )
+    return parse_importtime(proc.stderr)
+
+
+def statement_cost(entries: list[tuple[str, int, int, int]]) -> int:
+    # Imports de topo depois do `site` foram disparados pelo próprio comando.
+    names = [name for name, *_ in entries]
+    start = names.index('site') + 1 if 'site' in names else 0
+    return sum(cumulative for _, depth, _, cumulative in entries[start:] if depth == 0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Tempo de import a frio do pympeg')
+    parser.add_argument('-s', '--statement', default='import pympeg')
+    parser.add_argument('-n', '--runs', type=int, default=15)
+    parser.add_argument('-b', '--budget', type=float, default=20.0,
+                        help='limite em ms para a mediana; acima disso sai com código 1')
+    parser.add_argument('--top', type=int, default=10, help='imports mais pesados a listar')
+    parser.add_argument('-o', '--output', type=Path, help='arquivo JSON de resultados')
+    args = parser.parse_args()
+
+    # Um processo novo por rodada; a primeira também aquece os .pyc.
+    run_once(args.statement)
+    timings, last = [], []
+    for _ in range(args.runs):
+        last = run_once(args.statement)
+        timings.append(statement_cost(last) / 1e6)
+
+    median = statistics.median(timings)
+    print(f'{args.statement!r}: mediana {median * 1e3:.2f} ms, '
+          f'mínimo {min(timings) * 1e3:.2f} ms ({args.runs} processos)')
+
+    names = [name for name, *_ in last]
+    start = names.index('site') + 1 if 'site' in names else 0
+    heaviest = sorted(last[start:], key=lambda entry: entry[2], reverse=True)[:args.top]
+    print('\nImports mais caros (self):')
+    for name, _, self_us, cumulative in heaviest:
+        print(f'  {name:<40} {self_us / 1e3:8.2f} ms  (cumulativo {cumulative / 1e3:.2f} ms)')
+
+    name = f'import.{args.statement}'
+    save([Measurement(
+        name, 1, args.runs, min(timings), median, statistics.fmean(timings),
+        statistics.stdev(timings) if args.runs > 1 else 0.0
+    )], args.output or RESULTS_DIR / 'import.json')
+
+    if median * 1e3 > args.budget:
+        print(f'\nACIMA DO ORÇAMENTO: {median * 1e3:.2f} ms > {args.budget:.2f} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
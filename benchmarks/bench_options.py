@@ -0,0 +1,69 @@
+import argparse
+import time
+import tracemalloc
+from pympeg import OutputVideoOptions
+from pympeg.descriptors import BaseOption
+
+
+def scan_args(options) -> list[str]:
+    # Implementação anterior: varre o __dict__ da classe a cada chamada.
+    args = []
+    for attr_name, attr_value in options.__class__.__dict__.items():
+        if isinstance(attr_value, BaseOption):
+            value = getattr(options, attr_name)
+            if value is not None:
+                args.extend(attr_value.to_args(value))
+    return args
+
+
+def make_jobs(n: int) -> list[OutputVideoOptions]:
+    return [
+        OutputVideoOptions(codec='libx264', preset='fast', crf=18 + i % 10, movflags='faststart')
+        for i in range(n)
+    ]
+
+
+def measure(func, jobs) -> float:
+    start = time.perf_counter()
+    for options in jobs:
+        func(options)
+    return time.perf_counter() - start
+
+
+def allocated(build) -> int:
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Geração de argumentos para N jobs')
+    parser.add_argument('-n', '--jobs', type=int, default=100_000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    assert scan_args(jobs[0]) == jobs[0].generate_command_args()
+
+    scan = min(measure(scan_args, jobs) for _ in range(args.repeat))
+    compiled = min(
+        measure(OutputVideoOptions.generate_command_args, jobs) for _ in range(args.repeat)
+    )
+
+    print(f'{args.jobs} jobs, melhor de {args.repeat}')
+    print(f'  varredura do __dict__: {scan * 1000:8.1f} ms')
+    print(f'  schema compilado:      {compiled * 1000:8.1f} ms')
+    print(f'  ganho:                 {scan / compiled:8.2f}x')
+
+    base = OutputVideoOptions.Frozen(codec='libx264', preset='fast', movflags='faststart')
+    mutable = allocated(lambda: make_jobs(args.jobs))
+    frozen = allocated(lambda: [base.replace(crf=18 + i % 10) for i in range(args.jobs)])
+    print(f'  memória, mutável:      {mutable / 2**20:8.1f} MiB')
+    print(f'  memória, Frozen:       {frozen / 2**20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
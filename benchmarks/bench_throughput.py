@@ -0,0 +1,43 @@
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from pympeg import GlobalOptions, Runner
+from pympeg.testing import install_fakes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Vazão do run_batch com o ffmpeg falso')
+    parser.add_argument('-n', '--files', type=int, default=64)
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--duration', type=float, default=2.0, help='duração de cada mídia (s)')
+    parser.add_argument('--speed', type=float, default=20.0, help='velocidade do encode (x)')
+    parser.add_argument('--work', choices=['sleep', 'cpu'], default='sleep')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        ffmpeg, ffprobe = install_fakes(root / 'bin', {
+            'duration': args.duration, 'speed': args.speed, 'work': args.work,
+        })
+        source = root / 'in'
+        source.mkdir()
+        for i in range(args.files):
+            (source / f'aula_{i:04d}.mp4').write_bytes(b'video')
+
+        for workers in args.workers:
+            runner = Runner(source, root / f'out_{workers}', max_workers=workers)
+            runner.ffmpeg, runner.ffprobe = str(ffmpeg), str(ffprobe)
+            runner.add_global_options(GlobalOptions(stats=False))
+            start = time.perf_counter()
+            results = runner.run()
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for r in results if not r.ok)
+            print(f'{workers:3d} workers: {elapsed:7.2f} s  {len(results) / elapsed:7.1f} arquivos/s'
+                  f'  ({failed} falhas)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass(slots=True)
+class Measurement:
+    name: str
+    number: int
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+
+def calibrate(func: Callable[[], object], min_time: float) -> int:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time or number >= 1 << 24:
+            return number
+        number *= 4
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    rounds: int = 7,
+    min_time: float = 0.02
+) -> Measurement:
+
+    number = calibrate(func, min_time)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return Measurement(
+        name, number, rounds,
+        min(timings), statistics.median(timings), statistics.fmean(timings),
+        statistics.stdev(timings) if rounds > 1 else 0.0
+    )
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results: list[Measurement], path: Path) -> None:
+    payload = {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'revision': _git_revision(),
+        },
+        'unit': 'seconds per call',
+        'results': {m.name: asdict(m) for m in results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+
+def compare(results: list[Measurement], baseline_path: Path, threshold: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text())['results']
+    regressions = []
+    for m in results:
+        old = baseline.get(m.name)
+        if old is None:
+            print(f'  {m.name:<40} (novo)')
+            continue
+        ratio = m.min / old['min']
+        flag = '  REGRESSÃO' if ratio > 1 + threshold else ''
+        print(f'  {m.name:<40} {ratio:6.2f}x{flag}')
+        if flag:
+            regressions.append(m.name)
+    return regressions
@@ -0,0 +1,180 @@
+import argparse
+import fnmatch
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterator
+
+from harness import Measurement, compare, measure, save
+from pympeg import (
+    GlobalOptions, InputVideoOptions, OutputAudioOptions, OutputVideoOptions, Runner
+)
+from pympeg.interfaces import Options
+from pympeg.descriptors import (
+    BaseOption, BitrateOption, BoolOption, ChoiceOption, DictOption, FloatOption,
+    IntOption, SampleRateOption, TimeOption, VideoSizeOption
+)
+from pympeg.constants import VIDEO_CODECS, VIDEO_SIZES
+from pympeg.hooks import HookRegistry, ProgressEvent
+from pympeg.progress import Progress
+from pympeg.scheduling import dispatch_order
+from pympeg.template import FlatOutput, JobTemplate, scan_files
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+class DescriptorBench(Options):
+    base = BaseOption(flag='-x265-params')
+    bitrate = BitrateOption(flag='-b:v')
+    boolean = BoolOption(true_flag='-y', false_flag='-n')
+    choice = ChoiceOption(flag='-c:v', choices=VIDEO_CODECS)
+    mapping = DictOption(flag='-metadata')
+    real = FloatOption(flag='-r', min_val=0.00001)
+    integer = IntOption(flag='-crf', min_val=0, max_val=51)
+    sample_rate = SampleRateOption(flag='-ar')
+    time = TimeOption(flag='-ss')
+    size = VideoSizeOption(flag='-s', valid_sizes=VIDEO_SIZES)
+
+
+DESCRIPTOR_VALUES = {
+    'base': 'crf=23',
+    'bitrate': '2.5m',
+    'boolean': True,
+    'choice': 'libx264',
+    'mapping': {'title': 'aula'},
+    'real': 29.97,
+    'integer': 23,
+    'sample_rate': '48k',
+    'time': 90.5,
+    'size': '1920x1080',
+}
+
+VIDEO_KWARGS = {
+    'codec': 'libx264', 'preset': 'fast', 'crf': 23, 'bitrate': '2.5m',
+    'size': 'hd720', 'pixel_format': 'yuv420p', 'movflags': 'faststart',
+    'metadata': {'title': 'aula'},
+}
+
+
+def descriptor_cases() -> Iterator[tuple[str, Callable[[], object]]]:
+    target = DescriptorBench()
+    for name, value in DESCRIPTOR_VALUES.items():
+        option = vars(DescriptorBench)[name]
+        yield f'descriptor.{name}.set', lambda n=name, v=value: setattr(target, n, v)
+        yield f'descriptor.{name}.validate', lambda o=option, v=value: o.validate(v)
+
+
+def options_cases() -> Iterator[tuple[str, Callable[[], object]]]:
+    video = OutputVideoOptions(**VIDEO_KWARGS)
+    frozen = video.freeze()
+    yield 'options.video.construct', lambda: OutputVideoOptions(**VIDEO_KWARGS)
+    yield 'options.video.frozen_construct', lambda: OutputVideoOptions.Frozen(**VIDEO_KWARGS)
+    yield 'options.video.frozen_replace', lambda: frozen.replace(crf=28)
+    yield 'options.video.generate_args', video.generate_command_args
+    yield 'options.video.frozen_generate_args', frozen.generate_command_args
+    yield 'options.audio.generate_args', OutputAudioOptions(
+        codec='aac', bitrate='128k', sample_rate=48000, n_channels=2
+    ).generate_command_args
+
+
+def runner_cases() -> Iterator[tuple[str, Callable[[], object]]]:
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_global_options(GlobalOptions(overwrite=True, hide_banner=True))
+    runner.add_input_options(InputVideoOptions(start_time=5))
+    runner.add_output_options(OutputVideoOptions(**VIDEO_KWARGS))
+    input_file, output_file = Path('in.mp4'), Path('out.mp4')
+    yield 'runner.build_command', lambda: runner._build_command(input_file, output_file)
+
+    multi = Runner('in.mp4', 'out.mp4')
+    multi.add_output_options(OutputVideoOptions(size='hd1080'))
+    multi.add_output('preview.mp4', OutputVideoOptions(size='hd720'))
+    yield 'runner.build_command_multi_output', lambda: multi._build_command(input_file, output_file)
+
+    template = runner.job_template()
+    yield 'template.command', lambda: template.command(input_file, output_file)
+
+
+def hook_cases() -> Iterator[tuple[str, Callable[[], object]]]:
+    # Mesmo caminho de run_file a cada bloco de progresso do ffmpeg.
+    input_file, output_file, progress = Path('in.mp4'), Path('out.mp4'), Progress(frame=1)
+
+    def dispatch(hooks: HookRegistry) -> None:
+        if hooks.on_progress:
+            hooks.emit('on_progress', ProgressEvent(input_file, output_file, progress))
+
+    empty, one = HookRegistry(), HookRegistry()
+    one.register('on_progress', lambda event: None)
+    yield 'hooks.progress_no_hooks', lambda: dispatch(empty)
+    yield 'hooks.progress_one_hook', lambda: dispatch(one)
+
+
+def make_tree(root: Path, n_files: int) -> None:
+    extensions = ('.mp4', '.mkv', '.mov', '.txt')
+    for i in range(n_files):
+        (root / f'aula_{i:06d}{extensions[i % len(extensions)]}').write_bytes(b'x' * (i % 97))
+
+
+def batch_cases(root: Path) -> Iterator[tuple[str, Callable[[], object]]]:
+    runner = Runner(root, root / 'out')
+    runner.add_output_options(OutputVideoOptions(**VIDEO_KWARGS))
+
+    def plan(schedule: str) -> list:
+        files = runner._collect_files()
+        order = dispatch_order(files, schedule)
+        return [
+            runner._build_command(files[i], runner.output_path / files[i].name)
+            for i in order
+        ]
+
+    template = JobTemplate.from_runner(runner, FlatOutput(runner.output_path))
+
+    yield 'batch.collect_files', runner._collect_files
+    yield 'batch.plan_glob', lambda: plan('glob')
+    yield 'batch.plan_largest_first', lambda: plan('largest_first')
+    yield 'batch.template_scan', lambda: sum(
+        1 for _ in template.jobs(scan_files(root, Runner.extensions))
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Microbenchmarks do pympeg')
+    parser.add_argument('-o', '--output', type=Path, help='arquivo JSON de resultados')
+    parser.add_argument('-c', '--compare', type=Path, help='JSON de referência')
+    parser.add_argument('-k', '--filter', default='*', help='padrão de nomes (fnmatch)')
+    parser.add_argument('--files', type=int, default=10_000, help='arquivos na árvore sintética')
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='piora relativa tolerada no --compare')
+    args = parser.parse_args()
+
+    results: list[Measurement] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files)
+
+        cases = [
+            *descriptor_cases(), *options_cases(), *runner_cases(), *hook_cases(),
+            *batch_cases(root)
+        ]
+        for name, func in cases:
+            if not fnmatch.fnmatchcase(name, args.filter):
+                continue
+            rounds = min(args.rounds, 3) if name.startswith('batch.') else args.rounds
+            m = measure(name, func, rounds=rounds)
+            results.append(m)
+            print(f'{name:<40} {m.min * 1e6:12.2f} µs  (x{m.number}, {m.rounds} rodadas)')
+
+    output = args.output or RESULTS_DIR / 'latest.json'
+    save(results, output)
+    print(f'\nResultados salvos em {output}')
+
+    if args.compare:
+        print(f'\nComparando com {args.compare}:')
+        if compare(results, args.compare, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,11 @@
 import logging
 import time
 from pathlib import Path
-from pympeg import Builder, GlobalOptions, OutputVideoOptions, OutputAudioOptions
+from pympeg import Builder, GlobalOptions, OutputVideoOptions, OutputAudioOptions, JobJournal
+from pympeg import ProbeCache
+from pympeg.probe import probe_many
+from pympeg.journal import is_partial
 
-from utils.get_fps import get_fps
 from utils.rename_videos import gerar_nome_formatado
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -19,9 +21,12 @@ def main(path: str):
         logger.error(f"A pasta {root_path} não existe, meu!")
         return
 
-    files = list(root_path.rglob('*.mp4'))
+    files = [f for f in root_path.rglob('*.mp4') if not is_partial(f)]
+    journal = JobJournal(root_path / '.pympeg-journal.jsonl')
+    probe_cache = ProbeCache()
     logger.info(f"\nEncontrados {len(files)} arquivos .mp4 para processar.")
 
+    candidates = []
     for video_file in files:
         novo_nome = gerar_nome_formatado(video_file)
 
@@ -37,12 +42,24 @@ def main(path: str):
             logger.warning(f"O arquivo final já existe: {output_file.name}. Pulando conversão.")
             continue
 
-        fps = get_fps(video_file)
+        candidates.append((video_file, output_file))
+
+    probes = {
+        result.path: result
+        for result in probe_many([v for v, _ in candidates], probe_func=probe_cache.probe)
+    }
+
+    for video_file, output_file in candidates:
+        result = probes[video_file]
+        fps = result.info.fps if result.ok else None
+        if not result.ok:
+            logger.error(f"Falha ao ler FPS de '{video_file.name}': {result.error}")
+
         if fps is None:
             logger.error(f"Pulando {video_file.name} (FPS não detectado).")
             continue
 
-        fps_rounded = round(fps, 3)
+        fps_rounded = round(float(fps), 3)
         target_fps = 29.97 if fps_rounded in [59.94, 29.97] else 24
 
         logger.info(f"Comprimindo: {video_file.name}")
@@ -52,6 +69,7 @@ def main(path: str):
         try:
             (
                 Builder(video_file, output_file)
+                .with_journal(journal)
                 .with_global_options(
                     GlobalOptions(hide_banner=True, loglevel='warning', stats=True, overwrite=False)
                 )
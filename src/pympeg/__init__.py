@@ -1,14 +1,114 @@
-from .runner import Runner
-from .builder import Builder
-from .options import (
-    GlobalOptions, InputImageOptions, InputAudioOptions, InputVideoOptions,
-    OutputImageOptions, OutputAudioOptions, OutputVideoOptions
-)
+import sys
+
+# Sem `from typing import TYPE_CHECKING`: só o typing já custa mais que o resto.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .runner import Runner
+    from .async_runner import AsyncRunner
+    from .builder import Builder
+    from .chunked import ChunkedEncoder
+    from .frames import FrameReader, FrameWriter
+    from .audio import AudioReader
+    from .results import JobResult
+    from .metrics import BatchResults, BatchSummary, JobMetrics
+    from .progress import Progress
+    from .hooks import HookRegistry
+    from .probe import MediaInfo, ProbeResult, StreamInfo, probe_many
+    from .cache import ProbeCache
+    from .journal import JobJournal
+    from .template import FlatOutput, Job, JobTemplate, MirrorOutput, scan_files
+    from .output_cache import OutputCache
+    from .memory import MemoryBudget
+    from .two_pass import TwoPassEncoder
+    from .options import (
+        GlobalOptions, InputImageOptions, InputAudioOptions, InputVideoOptions,
+        OutputImageOptions, OutputAudioOptions, OutputVideoOptions
+    )
+
+
+# Nome público -> submódulo. `import pympeg` não carrega nada além deste arquivo;
+# runner, subprocess, asyncio, numpy etc. só entram no primeiro acesso.
+_LAZY = {
+    'Runner': 'runner',
+    'AsyncRunner': 'async_runner',
+    'Builder': 'builder',
+    'ChunkedEncoder': 'chunked',
+    'FrameReader': 'frames',
+    'FrameWriter': 'frames',
+    'AudioReader': 'audio',
+    'JobResult': 'results',
+    'JobMetrics': 'metrics',
+    'BatchResults': 'metrics',
+    'BatchSummary': 'metrics',
+    'Progress': 'progress',
+    'HookRegistry': 'hooks',
+    'MediaInfo': 'probe',
+    'StreamInfo': 'probe',
+    'probe_many': 'probe',
+    'ProbeResult': 'probe',
+    'ProbeCache': 'cache',
+    'JobJournal': 'journal',
+    'JobTemplate': 'template',
+    'Job': 'template',
+    'FlatOutput': 'template',
+    'MirrorOutput': 'template',
+    'scan_files': 'template',
+    'OutputCache': 'output_cache',
+    'MemoryBudget': 'memory',
+    'TwoPassEncoder': 'two_pass',
+    'GlobalOptions': 'options',
+    'InputImageOptions': 'options',
+    'InputAudioOptions': 'options',
+    'InputVideoOptions': 'options',
+    'OutputImageOptions': 'options',
+    'OutputAudioOptions': 'options',
+    'OutputVideoOptions': 'options',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    __import__(f'{__name__}.{module}')
+    value = getattr(sys.modules[f'{__name__}.{module}'], name)
+    # Cacheia no módulo: os próximos acessos não passam mais por aqui.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
 
 
 __all__ = [
     'Runner',
+    'AsyncRunner',
     'Builder',
+    'ChunkedEncoder',
+    'FrameReader',
+    'FrameWriter',
+    'AudioReader',
+    'JobResult',
+    'JobMetrics',
+    'BatchResults',
+    'BatchSummary',
+    'Progress',
+    'HookRegistry',
+    'MediaInfo',
+    'StreamInfo',
+    'probe_many',
+    'ProbeResult',
+    'ProbeCache',
+    'JobJournal',
+    'JobTemplate',
+    'Job',
+    'FlatOutput',
+    'MirrorOutput',
+    'scan_files',
+    'OutputCache',
+    'MemoryBudget',
+    'TwoPassEncoder',
     'GlobalOptions',
     'InputImageOptions',
     'InputAudioOptions',
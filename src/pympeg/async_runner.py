@@ -0,0 +1,223 @@
+import asyncio
+import codecs
+import io
+import logging
+import shlex
+import subprocess
+import time
+from pathlib import Path
+from typing import Iterable, List
+from .hooks import ErrorEvent, FinishEvent, ProgressEvent, StartEvent, StderrLineEvent
+from .metrics import BatchResults, BatchSummary
+from .runner import Runner
+from .progress import ProgressParser
+from .results import JobResult
+from .scheduling import dispatch_order
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# Recursos do Runner que ainda não têm caminho assíncrono: em vez de ignorá-los
+# em silêncio, o AsyncRunner recusa rodar com eles configurados.
+UNSUPPORTED_FEATURES = (
+    ('two_pass', 'o modo de tamanho alvo'),
+    ('journal', 'o journal de jobs'),
+    ('output_cache', 'o cache de saídas'),
+    ('memory_budget', 'o orçamento de memória'),
+    ('memory_limit', 'o limite de memória por job'),
+)
+
+
+def _check_supported(runner: Runner) -> None:
+    for attr, feature in UNSUPPORTED_FEATURES:
+        if getattr(runner, attr) is not None:
+            raise ValueError(f'O AsyncRunner ainda não suporta {feature}.')
+    if runner.oom_retries:
+        raise ValueError('O AsyncRunner ainda não suporta novas tentativas após falta de memória.')
+
+
+class AsyncRunner(Runner):
+    terminate_timeout: float = 5.0
+
+    @classmethod
+    def from_runner(cls, runner: Runner) -> 'AsyncRunner':
+        _check_supported(runner)
+        async_runner = cls(
+            runner.input_path, runner.output_path,
+            max_workers=runner.max_workers,
+            threads_per_job=runner.threads_per_job,
+            schedule=runner.schedule
+        )
+        async_runner._global_options = list(runner._global_options)
+        async_runner._input_options = list(runner._input_options)
+        async_runner._output_options = list(runner._output_options)
+        async_runner._extra_outputs = list(runner._extra_outputs)
+        async_runner.on_progress = runner.on_progress
+        async_runner.hooks = runner.hooks
+        async_runner._media_info = runner._media_info
+        async_runner.probe_cache = runner.probe_cache
+        async_runner.ffmpeg = runner.ffmpeg
+        async_runner.ffprobe = runner.ffprobe
+        return async_runner
+
+    async def run(self) -> BatchResults | None:
+        if not self.input_path.exists():
+            raise FileNotFoundError(f'Arquivo não encontrado: {self.input_path}')
+
+        if self.input_path.is_file():
+            await self.run_file(self.input_path, self.output_path)
+        elif self.input_path.is_dir():
+            return await self.run_batch()
+        else:
+            raise ValueError('O input deve ser um arquivo ou pasta.')
+
+    async def run_file(self, input_file: Path, output_file: Path) -> None:
+        _check_supported(self)
+        hooks = self.hooks
+        tracking = self.on_progress is not None or bool(hooks.on_progress)
+        if not tracking:
+            command_list = self._build_command(input_file, output_file)
+        else:
+            command_list = self._progress_command(input_file, output_file)
+            duration = await asyncio.to_thread(self._expected_duration, input_file)
+            parser = ProgressParser(duration)
+
+        logger.info(f"cmd: {shlex.join(command_list)}")
+
+        output_existed = output_file.exists()
+        process = await asyncio.create_subprocess_exec(
+            *command_list,
+            stdout=asyncio.subprocess.PIPE if tracking else None,
+            stderr=asyncio.subprocess.PIPE if hooks.on_stderr_line else None
+        )
+        reader = None
+        if hooks.on_stderr_line:
+            reader = asyncio.create_task(self._pump_stderr(process.stderr, input_file, output_file))
+        try:
+            if tracking:
+                async for line in process.stdout:
+                    progress = parser.feed(line.decode(errors='replace'))
+                    if progress is None:
+                        continue
+                    if self.on_progress is not None:
+                        self.on_progress(progress)
+                    if hooks.on_progress:
+                        hooks.emit('on_progress', ProgressEvent(input_file, output_file, progress))
+            returncode = await process.wait()
+        except BaseException as e:
+            # Qualquer falha aqui (cancelamento, callback, leitura do pipe) deixaria
+            # o ffmpeg órfão escrevendo a saída parcial.
+            await self._terminate(process)
+            if not output_existed or '-y' in self._global_options:
+                output_file.unlink(missing_ok=True)
+            if isinstance(e, asyncio.CancelledError):
+                logger.warning(f'Conversão cancelada: {input_file.name}')
+            raise
+        finally:
+            if reader is not None:
+                await reader
+
+        if returncode != 0:
+            logger.error(f'FFmpeg falhou com código {returncode}.')
+            raise subprocess.CalledProcessError(returncode, command_list)
+        logger.info('Comando executado com sucesso.')
+
+    async def _pump_stderr(
+        self,
+        stream: asyncio.StreamReader,
+        input_file: Path,
+        output_file: Path
+    ) -> None:
+
+        # Mesmo corte de linhas do modo texto do Popen: as stats do ffmpeg usam '\r'.
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+        )
+        pending = ''
+        while chunk := await stream.read(4096):
+            *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+            for line in lines:
+                self.hooks.emit('on_stderr_line', StderrLineEvent(input_file, output_file, line))
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            self.hooks.emit('on_stderr_line', StderrLineEvent(input_file, output_file, pending))
+
+    async def _terminate(self, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.terminate_timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def run_batch(self) -> BatchResults:
+        start = time.perf_counter()
+        files = self._collect_files()
+        if files:
+            self.output_path.mkdir(parents=True, exist_ok=True)
+            for output_path, _ in self._extra_outputs:
+                output_path.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f'{len(files)} arquivos encontrados.')
+
+        if self.schedule == 'longest_first':
+            await asyncio.to_thread(
+                self.prefetch_media_info, files, max(8, self.max_workers)
+            )
+        order = await asyncio.to_thread(
+            dispatch_order, files, self.schedule, self._probe_duration
+        )
+        jobs = [(files[i], self.output_path / files[i].name) for i in order]
+        if self.hooks.on_plan:
+            self._emit_plan(jobs)
+        dispatched = await self.gather(jobs, limit=self.max_workers)
+        results = [result for _, result in sorted(zip(order, dispatched), key=lambda p: p[0])]
+        return BatchResults(
+            results, BatchSummary.from_results(results, time.perf_counter() - start)
+        )
+
+    async def gather(
+        self,
+        jobs: Iterable[tuple[Path, Path]],
+        limit: int | None = None
+    ) -> List[JobResult]:
+
+        _check_supported(self)
+        jobs = [(Path(i), Path(o)) for i, o in jobs]
+        semaphore = asyncio.Semaphore(limit or self.max_workers)
+        hooks = self.hooks
+
+        async def run_job(index: int, input_file: Path, output_file: Path) -> JobResult:
+            async with semaphore:
+                attempt = 1
+                while True:
+                    if hooks.on_start:
+                        command_list = self._build_command(input_file, output_file)
+                        hooks.emit('on_start', StartEvent(
+                            input_file, output_file, command_list, index, len(jobs), attempt
+                        ))
+                    try:
+                        await self.run_file(input_file, output_file)
+                        break
+                    except Exception as e:
+                        if hooks.on_error:
+                            event = ErrorEvent(input_file, output_file, e, attempt)
+                            hooks.emit('on_error', event)
+                            if event.retry:
+                                attempt += 1
+                                continue
+                        logger.error(f'Erro ao converter {input_file.name}: {e}')
+                        return JobResult(input_file, output_file, error=e)
+
+                result = JobResult(input_file, output_file)
+                if hooks.on_finish:
+                    hooks.emit('on_finish', FinishEvent(result, attempt))
+                return result
+
+        return list(await asyncio.gather(
+            *(run_job(index, i, o) for index, (i, o) in enumerate(jobs, start=1))
+        ))
@@ -0,0 +1,55 @@
+from pathlib import Path
+from .constants import PCM_DTYPES
+from .options import GlobalOptions, InputAudioOptions, OutputAudioOptions
+from .raw import RawReader, _require_numpy, np
+
+
+class AudioReader(RawReader):
+
+    def __init__(
+        self,
+        input_file: str | Path,
+        sample_rate: int | float | str,
+        n_channels: int = 1,
+        sample_format: str = 's16le',
+        chunk_frames: int = 65536,
+        input_options: InputAudioOptions | None = None,
+        global_options: GlobalOptions | None = None,
+        reuse_buffer: bool = False
+    ) -> None:
+
+        _require_numpy()
+        if sample_format not in PCM_DTYPES:
+            raise ValueError(
+                f"Value '{sample_format}' not allowed. Valid: {set(PCM_DTYPES)}"
+            )
+        if chunk_frames < 1:
+            raise ValueError("chunk_frames must be >= 1")
+
+        super().__init__(
+            input_file,
+            OutputAudioOptions(
+                format=sample_format,
+                codec=f'pcm_{sample_format}',
+                sample_rate=sample_rate,
+                n_channels=n_channels,
+                no_video=True
+            ),
+            input_options,
+            global_options,
+            reuse_buffer
+        )
+        self.dtype = np.dtype(PCM_DTYPES[sample_format])
+        self.chunk_frames = chunk_frames
+
+    @property
+    def sample_rate(self) -> int:
+        return self.output_options.sample_rate
+
+    @property
+    def n_channels(self) -> int:
+        return self.output_options.n_channels
+
+    def _layout(self) -> tuple[tuple[int, ...], 'np.dtype', int]:
+        shape = (self.chunk_frames, self.n_channels)
+        return shape, self.dtype, self.n_channels * self.dtype.itemsize
@@ -0,0 +1,13 @@
+import os
+
+
+FFMPEG_ENV = 'PYMPEG_FFMPEG'
+FFPROBE_ENV = 'PYMPEG_FFPROBE'
+
+
+def ffmpeg_binary() -> str:
+    return os.environ.get(FFMPEG_ENV) or 'ffmpeg'
+
+
+def ffprobe_binary() -> str:
+    return os.environ.get(FFPROBE_ENV) or 'ffprobe'
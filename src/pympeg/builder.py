@@ -1,11 +1,26 @@
+from pathlib import Path
+from typing import BinaryIO, Callable
 from .runner import Runner
+from .cache import ProbeCache
+from .chunked import ChunkedEncoder
+from .constants import VIDEO_PRESETS
+from .hooks import HOOK_EVENTS
 from .interfaces import Options
+from .journal import JobJournal
+from .memory import MemoryBudget
+from .output_cache import OutputCache
+from .pipes import PIPE_INPUT, PIPE_OUTPUT, PipeSource
+from .probe import MediaInfo
+from .progress import Progress
+from .scheduling import SCHEDULES
+from .template import JobTemplate
+from .two_pass import DEFAULT_MUX_OVERHEAD, TwoPassEncoder
 from .options import *
 
 
 class Builder:
 
-    def __init__(self, input_path: str, output_path: str):
+    def __init__(self, input_path: str = PIPE_INPUT, output_path: str = PIPE_OUTPUT):
         self._runner = Runner(input_path, output_path)
 
     def with_global_options(self, options: GlobalOptions):
@@ -34,5 +49,131 @@ class Builder:
         self._runner.add_output_options(options)
         return self
 
+    def with_output(self, output_path: str | Path, *options: Options):
+        valid_outputs = (OutputVideoOptions, OutputAudioOptions, OutputImageOptions)
+        for option in options:
+            if not isinstance(option, valid_outputs):
+                raise TypeError(
+                    f"Expected output options, got {type(option).__name__}"
+                )
+
+        self._runner.add_output(output_path, *options)
+        return self
+
+    def with_max_workers(self, max_workers: int, threads_per_job: int | None = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._runner.max_workers = max_workers
+        self._runner.threads_per_job = threads_per_job
+        return self
+
+    def with_schedule(self, schedule: str):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Invalid schedule: '{schedule}'. Valid: {SCHEDULES}")
+        self._runner.schedule = schedule
+        return self
+
+    def with_journal(self, journal: JobJournal | str | Path):
+        if not isinstance(journal, JobJournal):
+            journal = JobJournal(journal)
+        self._runner.journal = journal
+        return self
+
+    def with_probe_cache(self, cache: ProbeCache | str | Path | None = None):
+        if not isinstance(cache, ProbeCache):
+            cache = ProbeCache(cache)
+        self._runner.probe_cache = cache
+        return self
+
+    def with_output_cache(self, cache: OutputCache | str | Path | None = None):
+        if not isinstance(cache, OutputCache):
+            cache = OutputCache(cache)
+        self._runner.output_cache = cache
+        return self
+
+    def with_memory_budget(
+        self,
+        budget: MemoryBudget | int | None = None,
+        per_job_limit: int | None = None,
+        oom_retries: int = 1
+    ):
+        if oom_retries < 0:
+            raise ValueError("oom_retries must be >= 0")
+        if per_job_limit is not None and per_job_limit <= 0:
+            raise ValueError("per_job_limit must be > 0")
+        if budget is None:
+            budget = MemoryBudget.from_available()
+        elif not isinstance(budget, MemoryBudget):
+            budget = MemoryBudget(budget)
+        self._runner.memory_budget = budget
+        self._runner.memory_limit = per_job_limit
+        self._runner.oom_retries = oom_retries
+        return self
+
+    def with_target_size(
+        self,
+        size: int | str,
+        first_pass_preset: str | None = None,
+        overhead: float = DEFAULT_MUX_OVERHEAD
+    ):
+        if not isinstance(size, (int, str)):
+            raise TypeError("Expected target size as int bytes or str like '25MB'")
+        if first_pass_preset is not None and first_pass_preset not in VIDEO_PRESETS:
+            raise ValueError(f"Invalid preset: '{first_pass_preset}'")
+        self._runner.two_pass = TwoPassEncoder(self._runner, size, first_pass_preset, overhead)
+        return self
+
+    def with_binaries(self, ffmpeg: str | Path | None = None, ffprobe: str | Path | None = None):
+        if ffmpeg is not None:
+            self._runner.ffmpeg = str(ffmpeg)
+        if ffprobe is not None:
+            self._runner.ffprobe = str(ffprobe)
+        return self
+
+    def with_progress(self, callback: Callable[[Progress], None]):
+        if not callable(callback):
+            raise TypeError("Expected a callable progress callback")
+        self._runner.on_progress = callback
+        return self
+
+    def with_hook(self, event: str, callback: Callable):
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Invalid hook event: '{event}'. Valid: {HOOK_EVENTS}")
+        if not callable(callback):
+            raise TypeError("Expected a callable hook")
+        self._runner.hooks.register(event, callback)
+        return self
+
+    def with_hooks(self, *plugins: object):
+        for plugin in plugins:
+            if not any(callable(getattr(plugin, event, None)) for event in HOOK_EVENTS):
+                raise TypeError(
+                    f"Expected an object with hook methods, got {type(plugin).__name__}"
+                )
+        for plugin in plugins:
+            self._runner.hooks.add(plugin)
+        return self
+
+    def media_info(self) -> MediaInfo:
+        return self._runner.media_info(self._runner.input_path)
+
+    def job_template(self, output: Callable[[Path], Path] | None = None) -> JobTemplate:
+        return self._runner.job_template(output)
+
     def run(self):
-        self._runner.run()
+        return self._runner.run()
+
+    def stream(self, source: PipeSource | None = None):
+        return self._runner.stream(source)
+
+    def run_pipe(self, source: PipeSource | None = None, output: BinaryIO | None = None):
+        return self._runner.run_pipe(source, output)
+
+    def run_chunked(self, chunks: int | None = None, max_workers: int | None = None):
+        encoder = ChunkedEncoder(self._runner, chunks=chunks, max_workers=max_workers)
+        return encoder.run(self._runner.input_path, self._runner.output_path)
+
+    async def run_async(self):
+        # asyncio só é carregado por quem de fato usa o modo assíncrono.
+        from .async_runner import AsyncRunner
+        return await AsyncRunner.from_runner(self._runner).run()
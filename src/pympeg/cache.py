@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+from .probe import MediaInfo, probe_json
+
+
+def default_cache_dir() -> Path:
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'pympeg'
+
+
+def file_key(path: str | Path) -> tuple[str, int, int, int]:
+    path = Path(path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class ProbeCache:
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            accessed REAL NOT NULL,
+            UNIQUE (path, size, mtime_ns, inode, kind)
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 200_000,
+        memo_size: int = 4096
+    ) -> None:
+
+        if max_entries < 1:
+            raise ValueError('max_entries must be >= 1')
+
+        self.path = Path(path) if path is not None else default_cache_dir() / 'probe.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.memo_size = memo_size
+
+        self._lock = threading.RLock()
+        self._memo: OrderedDict[tuple, object] = OrderedDict()
+        self._touched: dict[int, float] = {}
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(self._SCHEMA)
+
+    def __enter__(self) -> 'ProbeCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def _remember(self, memo_key: tuple, value: object) -> None:
+        self._memo[memo_key] = value
+        self._memo.move_to_end(memo_key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        self._db.executemany(
+            'UPDATE entries SET accessed = ? WHERE rowid = ?',
+            [(accessed, rowid) for rowid, accessed in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        count = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Remove um pouco além do limite para não despejar a cada inserção.
+        excess = count - int(self.max_entries * 0.9)
+        self._db.execute(
+            'DELETE FROM entries WHERE rowid IN '
+            '(SELECT rowid FROM entries ORDER BY accessed LIMIT ?)',
+            (excess,)
+        )
+
+    def get(self, path: str | Path, kind: str = 'probe') -> object | None:
+        key = file_key(path)
+        with self._lock:
+            memo_key = (kind, *key)
+            if memo_key in self._memo:
+                self._memo.move_to_end(memo_key)
+                return self._memo[memo_key]
+
+            row = self._db.execute(
+                'SELECT rowid, value FROM entries WHERE path = ? AND size = ? '
+                'AND mtime_ns = ? AND inode = ? AND kind = ?',
+                (*key, kind)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._touched[row[0]] = time.time()
+            if len(self._touched) >= 256:
+                self._flush_touched()
+
+            value = json.loads(row[1])
+            self._remember(memo_key, value)
+            return value
+
+    def put(self, path: str | Path, value: object, kind: str = 'probe') -> None:
+        key = file_key(path)
+        with self._lock:
+            self._flush_touched()
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(path, size, mtime_ns, inode, kind, value, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (*key, kind, json.dumps(value), time.time())
+            )
+            self._remember((kind, *key), value)
+            self._evict()
+
+    def cached(
+        self,
+        path: str | Path,
+        kind: str,
+        compute: Callable[[Path], object]
+    ) -> object:
+
+        value = self.get(path, kind)
+        if value is None:
+            value = compute(Path(path))
+            self.put(path, value, kind)
+        return value
+
+    def probe(self, path: str | Path, ffprobe: str | None = None) -> MediaInfo:
+        data = self.cached(path, 'probe', lambda p: probe_json(p, ffprobe))
+        return MediaInfo.from_json(Path(path), data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+            self._memo.clear()
+            self._touched.clear()
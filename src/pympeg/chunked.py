@@ -0,0 +1,179 @@
+import logging
+import os
+import shlex
+import subprocess
+import tempfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import List
+from .binaries import ffprobe_binary
+from .runner import Runner, split_thread_budget
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+Segment = tuple[float, float | None]
+
+
+def probe_keyframes(path: Path, ffprobe: str | None = None) -> List[float]:
+    cmd = [
+        ffprobe or ffprobe_binary(), '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=print_section=0',
+        str(path)
+    ]
+    output = subprocess.check_output(cmd, text=True)
+
+    keyframes = []
+    for line in output.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags and pts_time not in ('', 'N/A'):
+            keyframes.append(float(pts_time))
+    return sorted(keyframes)
+
+
+def split_points(keyframes: List[float], duration: float, chunks: int) -> List[float]:
+    points = []
+    for i in range(1, chunks):
+        target = duration * i / chunks
+        nearest = min(keyframes, key=lambda t: abs(t - target), default=None)
+        if nearest is not None and nearest > 0 and nearest not in points:
+            points.append(nearest)
+    return sorted(points)
+
+
+def segments(points: List[float]) -> List[Segment]:
+    bounds = [0.0] + points
+    return [
+        (start, bounds[i + 1] - start if i + 1 < len(bounds) else None)
+        for i, start in enumerate(bounds)
+    ]
+
+
+class ChunkedEncoder:
+
+    def __init__(
+        self,
+        runner: Runner,
+        chunks: int | None = None,
+        max_workers: int | None = None
+    ) -> None:
+
+        if '-ss' in runner._input_options or '-t' in runner._input_options:
+            raise ValueError('Encode em partes não suporta -ss/-t no input.')
+        if runner._extra_outputs:
+            raise ValueError('Encode em partes não suporta múltiplas saídas.')
+        if runner.two_pass is not None:
+            raise ValueError('Encode em partes não suporta o modo de tamanho alvo.')
+
+        if max_workers is not None and max_workers < 1:
+            raise ValueError('max_workers deve ser >= 1')
+        if chunks is not None and chunks < 1:
+            raise ValueError('chunks deve ser >= 1')
+
+        self.runner = runner
+        # Um runner de um worker só é o padrão de batch; aqui as partes de um
+        # único arquivo são o que roda em paralelo, então usa todas as CPUs.
+        default_workers = runner.max_workers if runner.max_workers > 1 else os.cpu_count() or 1
+        self.max_workers = max_workers or default_workers
+        self.chunks = chunks or self.max_workers
+
+    def plan(self, input_file: Path) -> List[Segment]:
+        duration = self.runner._probe_duration(input_file)
+        if duration is None or self.chunks < 2:
+            return [(0.0, None)]
+        return segments(split_points(probe_keyframes(input_file, self.runner.ffprobe), duration, self.chunks))
+
+    def _thread_args(self) -> List[str]:
+        if '-threads' in self.runner._output_options:
+            return []
+        return ['-threads', str(split_thread_budget(self.max_workers))]
+
+    def _chunk_command(
+        self,
+        input_file: Path,
+        segment: Segment,
+        chunk_file: Path
+    ) -> List[str]:
+
+        start, length = segment
+        cmd = [self.runner.ffmpeg]
+        cmd.extend(self.runner._global_options)
+        cmd.extend(self.runner._input_options)
+        cmd.extend(['-ss', f'{start:.6f}'])
+        if length is not None:
+            cmd.extend(['-t', f'{length:.6f}'])
+        cmd.extend(['-i', str(input_file)])
+        cmd.extend(self.runner._output_options)
+        cmd.extend(self._thread_args())
+        cmd.extend(['-an', str(chunk_file)])
+        return cmd
+
+    def _audio_command(self, input_file: Path, audio_file: Path) -> List[str]:
+        cmd = [self.runner.ffmpeg]
+        cmd.extend(self.runner._global_options)
+        cmd.extend(self.runner._input_options)
+        cmd.extend(['-i', str(input_file)])
+        cmd.extend(self.runner._output_options)
+        cmd.extend(['-vn', str(audio_file)])
+        return cmd
+
+    def _concat_command(
+        self,
+        list_file: Path,
+        audio_file: Path | None,
+        output_file: Path
+    ) -> List[str]:
+
+        cmd = [self.runner.ffmpeg]
+        cmd.extend(self.runner._global_options)
+        cmd.extend(['-f', 'concat', '-safe', '0', '-i', str(list_file)])
+        if audio_file is not None:
+            cmd.extend(['-i', str(audio_file), '-map', '0:v', '-map', '1:a'])
+        cmd.extend(['-c', 'copy', str(output_file)])
+        return cmd
+
+    def _execute(self, command_list: List[str]) -> None:
+        logger.info(f"cmd: {shlex.join(command_list)}")
+        subprocess.run(command_list, check=True, text=True)
+
+    def run(self, input_file: str | Path, output_file: str | Path) -> None:
+        input_file, output_file = Path(input_file), Path(output_file)
+        plan = self.plan(input_file)
+        suffix = output_file.suffix
+        logger.info(f'{input_file.name}: {len(plan)} partes.')
+
+        with tempfile.TemporaryDirectory(prefix='.pympeg-', dir=output_file.parent) as tmp:
+            tmp_dir = Path(tmp)
+            chunk_files = [tmp_dir / f'chunk_{i:04d}{suffix}' for i in range(len(plan))]
+            has_audio = self.runner.media_info(input_file).has_audio
+            audio_file = tmp_dir / f'audio{suffix}' if has_audio else None
+
+            commands = [
+                self._chunk_command(input_file, segment, chunk_file)
+                for segment, chunk_file in zip(plan, chunk_files)
+            ]
+            if audio_file is not None:
+                commands.append(self._audio_command(input_file, audio_file))
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self._execute, cmd) for cmd in commands]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+                for future in done:
+                    if future.exception() is not None:
+                        logger.error(f'Falha ao codificar parte de {input_file.name}.')
+                        raise future.exception()
+
+            list_file = tmp_dir / 'chunks.txt'
+            list_file.write_text(
+                ''.join(f"file '{chunk.name}'\n" for chunk in chunk_files),
+                encoding='utf-8'
+            )
+            self._execute(self._concat_command(list_file, audio_file, output_file))
+
+        logger.info('Comando executado com sucesso.')
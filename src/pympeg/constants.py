@@ -41,7 +41,7 @@ IMAGE_SIZES = {
 # ===========================================================================
 AUDIO_FORMATS = {
     'mp3', 'wav', 'flac', 'aac', 'ogg', 'm4a', 'aiff',
-    's16le', 'f32be', 'pcm_s16le', 'alsa', 'pulse',
+    's16le', 'f32le', 'f32be', 'pcm_s16le', 'alsa', 'pulse',
     'opus', 'ac3', 'eac3', 'dts', 'pcm_s24le', 'pcm_f32le',
 }
 
@@ -94,3 +94,24 @@ VIDEO_TUNES = {
     'film', 'animation', 'grain', 'stillimage', 'fastdecode', 
     'zerolatency', 'psnr', 'ssim'
 }
+
+VIDEO_SIZE_DIMENSIONS = {
+    'sqcif': (128, 96), 'qcif': (176, 144), 'cif': (352, 288),
+    '4cif': (704, 576), '16cif': (1408, 1152), 'qqvga': (160, 120),
+    'qvga': (320, 240), 'vga': (640, 480), 'svga': (800, 600),
+    'xga': (1024, 768), 'uxga': (1600, 1200), 'qxga': (2048, 1536),
+    'sxga': (1280, 1024), 'qsxga': (2560, 2048), 'hsxga': (5120, 4096),
+    'wsxga': (1600, 1024), 'wuxga': (1920, 1200), 'woxga': (2560, 1600),
+    'wqsxga': (3200, 2048), 'wquxga': (3840, 2400), 'cga': (320, 200),
+    'ega': (640, 350), 'hd480': (852, 480), 'hd720': (1280, 720),
+    'hd1080': (1920, 1080), 'uhd2160': (3840, 2160), 'ntsc': (720, 480),
+    'pal': (720, 576), 'qntsc': (352, 240), 'qpal': (352, 288),
+    'sntsc': (640, 480), 'spal': (768, 576), 'film': (352, 240),
+    'ntsc-film': (352, 240), '2k': (2048, 1080), '2kflat': (1998, 1080),
+    '2kscope': (2048, 858), '4k': (4096, 2160), '4kflat': (3996, 2160),
+    '4kscope': (4096, 1716)
+}
+
+RAWVIDEO_CHANNELS = {'rgb24': 3, 'bgr24': 3, 'gray': 1}
+
+PCM_DTYPES = {'s16le': '<i2', 'f32le': '<f4'}
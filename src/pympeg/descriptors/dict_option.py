@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from .base_option import BaseOption
 
 
@@ -10,7 +11,7 @@ class DictOption(BaseOption):
 
     def to_args(self, value: object) -> list[str]:
         args = []
-        if isinstance(value, dict):
+        if isinstance(value, Mapping):
             for k, v in value.items():
                 if k and v:
                     args.extend([self.flag, f"{k}={v}"])
@@ -0,0 +1,174 @@
+import subprocess
+from pathlib import Path
+from .constants import RAWVIDEO_CHANNELS, VIDEO_SIZE_DIMENSIONS
+from .interfaces import Options
+from .options import GlobalOptions, InputVideoOptions, OutputVideoOptions
+from .probe import probe
+from .pipes import PIPE_INPUT, _write_all
+from .raw import RawReader, _require_numpy, np
+from .runner import Runner
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    if size in VIDEO_SIZE_DIMENSIONS:
+        return VIDEO_SIZE_DIMENSIONS[size]
+    try:
+        width, height = size.split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise ValueError(f"Unknown dimensions for size '{size}'; use WxH.")
+
+
+class FrameReader(RawReader):
+
+    def __init__(
+        self,
+        input_file: str | Path,
+        size: str | None = None,
+        pixel_format: str = 'rgb24',
+        input_options: InputVideoOptions | None = None,
+        global_options: GlobalOptions | None = None,
+        batch_size: int = 1,
+        reuse_buffer: bool = False
+    ) -> None:
+
+        _require_numpy()
+        if pixel_format not in RAWVIDEO_CHANNELS:
+            raise ValueError(
+                f"Value '{pixel_format}' not allowed. Valid: {set(RAWVIDEO_CHANNELS)}"
+            )
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+
+        super().__init__(
+            input_file,
+            OutputVideoOptions(format='rawvideo', pixel_format=pixel_format, size=size),
+            input_options,
+            global_options,
+            reuse_buffer
+        )
+        self.batch_size = batch_size
+
+    @property
+    def width_height(self) -> tuple[int, int]:
+        if self.output_options.size is None:
+            resolution = probe(self.input_file, self._runner.ffprobe).resolution
+            if resolution is None:
+                raise ValueError(f'Nenhum stream de vídeo em {self.input_file}')
+            return resolution
+        return parse_size(self.output_options.size)
+
+    @property
+    def channels(self) -> int:
+        return RAWVIDEO_CHANNELS[self.output_options.pixel_format]
+
+    def _layout(self) -> tuple[tuple[int, ...], 'np.dtype', int]:
+        width, height = self.width_height
+        frame_shape = (height, width, self.channels)
+        shape = frame_shape if self.batch_size == 1 else (self.batch_size, *frame_shape)
+        return shape, np.dtype(np.uint8), height * width * self.channels
+
+
+class FrameWriter:
+
+    def __init__(
+        self,
+        output_file: str | Path,
+        size: str,
+        *output_options: Options,
+        pixel_format: str = 'rgb24',
+        fps: float | int = 25,
+        global_options: GlobalOptions | None = None
+    ) -> None:
+
+        _require_numpy()
+        if pixel_format not in RAWVIDEO_CHANNELS:
+            raise ValueError(
+                f"Value '{pixel_format}' not allowed. Valid: {set(RAWVIDEO_CHANNELS)}"
+            )
+
+        self.output_file = Path(output_file)
+        self.input_options = InputVideoOptions(
+            format='rawvideo', pixel_format=pixel_format, size=size, fps=fps
+        )
+        width, height = parse_size(self.input_options.size)
+        self.frame_shape = (height, width, RAWVIDEO_CHANNELS[pixel_format])
+        self.frame_bytes = height * width * RAWVIDEO_CHANNELS[pixel_format]
+
+        self._runner = Runner(PIPE_INPUT, self.output_file)
+        if global_options is not None:
+            self._runner.add_global_options(global_options)
+        self._runner.add_input_options(self.input_options)
+        for options in output_options:
+            self._runner.add_output_options(options)
+
+        self._process: subprocess.Popen | None = None
+        self.frames_written = 0
+
+    def command(self) -> list[str]:
+        return self._runner._build_command(Path(PIPE_INPUT), self.output_file)
+
+    def open(self) -> 'FrameWriter':
+        if self._process is None:
+            self._process = subprocess.Popen(
+                self.command(), stdin=subprocess.PIPE, bufsize=0
+            )
+        return self
+
+    def __enter__(self) -> 'FrameWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _frames_view(self, frames: 'np.ndarray') -> memoryview:
+        frames = np.asarray(frames)
+        if frames.dtype != np.uint8:
+            raise TypeError(f"frames must be uint8, got {frames.dtype}")
+
+        height, width, channels = self.frame_shape
+        with_channels = frames.ndim in (3, 4) and frames.shape[-3:] == self.frame_shape
+        gray = channels == 1 and frames.ndim in (2, 3) and frames.shape[-2:] == (height, width)
+        if not (with_channels or gray):
+            raise ValueError(
+                f"frames must have shape {self.frame_shape} or (N, *{self.frame_shape}), "
+                f"got {frames.shape}"
+            )
+
+        if not frames.flags.c_contiguous:
+            frames = np.ascontiguousarray(frames)
+        return memoryview(frames).cast('B')
+
+    def write(self, frames: 'np.ndarray') -> None:
+        view = self._frames_view(frames)
+        self.open()
+        try:
+            _write_all(self._process.stdin, view)
+        except BrokenPipeError:
+            returncode = self._process.wait()
+            self._process = None
+            raise subprocess.CalledProcessError(returncode, self.command())
+        self.frames_written += len(view) // self.frame_bytes
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self.command())
+
+    def abort(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        process.kill()
+        process.wait()
+        process.stdin.close()
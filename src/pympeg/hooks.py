@@ -0,0 +1,117 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List
+from .progress import Progress
+from .results import JobResult
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+HOOK_EVENTS = ('on_plan', 'on_start', 'on_progress', 'on_stderr_line', 'on_finish', 'on_error')
+
+
+@dataclass(slots=True)
+class PlanEvent:
+    jobs: List[tuple[Path, Path]]
+    schedule: str
+    max_workers: int
+
+
+@dataclass(slots=True)
+class StartEvent:
+    input_file: Path
+    output_file: Path
+    command: List[str]
+    index: int = 1
+    total: int = 1
+    attempt: int = 1
+    # Modo de tamanho alvo: os comandos de cada passada; command é o último.
+    passes: tuple[List[str], ...] = ()
+
+
+@dataclass(slots=True)
+class ProgressEvent:
+    input_file: Path
+    output_file: Path
+    progress: Progress
+
+
+@dataclass(slots=True)
+class StderrLineEvent:
+    input_file: Path
+    output_file: Path
+    line: str
+
+
+@dataclass(slots=True)
+class FinishEvent:
+    result: JobResult
+    attempt: int = 1
+
+
+@dataclass(slots=True)
+class ErrorEvent:
+    input_file: Path
+    output_file: Path
+    error: BaseException
+    attempt: int = 1
+    # Um hook pode marcar retry=True para o runner tentar o job de novo.
+    retry: bool = field(default=False)
+
+
+class HookRegistry:
+    # Um atributo por evento com uma tupla imutável de callbacks: quem dispara
+    # testa `if hooks.on_progress:` antes de montar o payload, e registrar
+    # durante um batch nunca altera uma tupla que outra thread está percorrendo.
+    __slots__ = HOOK_EVENTS
+
+    def __init__(self) -> None:
+        for event in HOOK_EVENTS:
+            setattr(self, event, ())
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, event) for event in HOOK_EVENTS)
+
+    def register(self, event: str, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        if event not in HOOK_EVENTS:
+            raise ValueError(f'Evento de hook desconhecido: {event}')
+        if not callable(callback):
+            raise TypeError(f'O hook de {event} deve ser chamável.')
+        setattr(self, event, (*getattr(self, event), callback))
+        return callback
+
+    def unregister(self, event: str, callback: Callable[[Any], None]) -> None:
+        if event not in HOOK_EVENTS:
+            raise ValueError(f'Evento de hook desconhecido: {event}')
+        setattr(self, event, tuple(cb for cb in getattr(self, event) if cb != callback))
+
+    def add(self, plugin: object) -> object:
+        found = [event for event in HOOK_EVENTS if callable(getattr(plugin, event, None))]
+        if not found:
+            raise ValueError(f'{type(plugin).__name__} não define nenhum hook.')
+        for event in found:
+            self.register(event, getattr(plugin, event))
+        return plugin
+
+    def remove(self, plugin: object) -> None:
+        for event in HOOK_EVENTS:
+            callback = getattr(plugin, event, None)
+            if callback is not None:
+                self.unregister(event, callback)
+
+    def copy(self) -> 'HookRegistry':
+        registry = HookRegistry()
+        for event in HOOK_EVENTS:
+            setattr(registry, event, getattr(self, event))
+        return registry
+
+    def emit(self, event: str, payload: Any) -> None:
+        for callback in getattr(self, event):
+            try:
+                callback(payload)
+            except Exception as e:
+                # Um hook de notificação com defeito não pode derrubar a conversão.
+                logger.error(f'Hook {event} falhou: {e!r}')
@@ -1,8 +1,177 @@
 from abc import ABC
+from types import MappingProxyType
 from .descriptors import BaseOption
 
 
+def compile_schema(cls: type) -> tuple[tuple[str, BaseOption], ...]:
+    schema: dict[str, BaseOption] = {}
+    # Bases primeiro: subclasses sobrescrevem a opção mas mantêm a posição original.
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, BaseOption):
+                schema[name] = value
+            elif name in schema:
+                del schema[name]
+    return tuple(schema.items())
+
+
+def _freeze(value: object) -> object:
+    if isinstance(value, dict):
+        return MappingProxyType(dict(value))
+    return value
+
+
+def _thaw(value: object) -> object:
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    return value
+
+
+def _hashable(value: object) -> object:
+    if isinstance(value, MappingProxyType):
+        # A igualdade compara mapeamentos por valor; o hash não pode depender da ordem.
+        return frozenset(value.items())
+    return value
+
+
+class FrozenOptions:
+    # Guarda só as opções definidas: _set tem os valores e _layout, compartilhado
+    # entre instâncias com as mesmas opções, diz a posição de cada uma em _set.
+    __slots__ = ('_layout', '_set', '_hash')
+
+    _schema: tuple[tuple[str, BaseOption], ...] = ()
+    _index: dict[str, int] = {}
+    _layouts: dict[tuple[int, ...], dict[int, int]] = {}
+
+    def __init__(self, **kwargs) -> None:
+        values = [None] * len(self._schema)
+        for key, value in kwargs.items():
+            index = self._index.get(key)
+            if index is None:
+                raise AttributeError(f"Opção inválida: '{key}'")
+            if value is not None:
+                values[index] = _freeze(self._schema[index][1].validate(value))
+        self._load(values)
+
+    @classmethod
+    def _from_values(cls, values) -> 'FrozenOptions':
+        self = cls.__new__(cls)
+        self._load(values)
+        return self
+
+    def _load(self, values) -> None:
+        indexes = tuple(i for i, value in enumerate(values) if value is not None)
+        layout = self._layouts.get(indexes)
+        if layout is None:
+            layout = self._layouts.setdefault(indexes, {i: pos for pos, i in enumerate(indexes)})
+        FrozenOptions._layout.__set__(self, layout)
+        FrozenOptions._set.__set__(self, tuple(values[i] for i in indexes))
+        FrozenOptions._hash.__set__(self, None)
+
+    @property
+    def _values(self) -> tuple:
+        values = [None] * len(self._schema)
+        for index, value in zip(self._layout, self._set):
+            values[index] = value
+        return tuple(values)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__qualname__} is immutable; use replace()")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__qualname__} is immutable; use replace()")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        # Layouts são únicos por classe e conjunto de opções.
+        return self._layout is other._layout and self._set == other._set
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            key = (type(self), tuple(self._layout), tuple(_hashable(v) for v in self._set))
+            FrozenOptions._hash.__set__(self, hash(key))
+        return self._hash
+
+    def __repr__(self) -> str:
+        fields = ', '.join(
+            f'{self._schema[index][0]}={value!r}'
+            for index, value in zip(self._layout, self._set)
+        )
+        return f'{type(self).__qualname__}({fields})'
+
+    def __getstate__(self) -> tuple:
+        # Só os valores, sem Nones no final: o schema vem da própria classe.
+        values = list(self._values)
+        while values and values[-1] is None:
+            values.pop()
+        return tuple(_thaw(v) for v in values)
+
+    def __setstate__(self, state: tuple) -> None:
+        padding = (None,) * (len(self._schema) - len(state))
+        self._load([_freeze(v) for v in state] + list(padding))
+
+    def replace(self, **changes) -> 'FrozenOptions':
+        values = self._values
+        changed = list(values)
+        for key, value in changes.items():
+            index = self._index.get(key)
+            if index is None:
+                raise AttributeError(f"Opção inválida: '{key}'")
+            if value is not None:
+                value = _freeze(self._schema[index][1].validate(value))
+            changed[index] = value
+        return type(self)._from_values(changed)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            self._schema[index][0]: _thaw(value)
+            for index, value in zip(self._layout, self._set)
+        }
+
+    def thaw(self) -> 'Options':
+        return self._mutable(**self.as_dict())
+
+    def generate_command_args(self) -> list[str]:
+        args = []
+        schema = self._schema
+        for index, value in zip(self._layout, self._set):
+            args.extend(schema[index][1].to_args(value))
+        return args
+
+
+def _field(index: int) -> property:
+    def get(self: FrozenOptions) -> object:
+        pos = self._layout.get(index)
+        return None if pos is None else self._set[pos]
+    return property(get)
+
+
+def make_frozen(cls: type) -> type:
+    names = tuple(name for name, _ in cls._schema)
+    namespace = {
+        '__slots__': (),
+        '__module__': cls.__module__,
+        '__qualname__': f'{cls.__qualname__}.Frozen',
+        '_schema': cls._schema,
+        '_index': {name: i for i, name in enumerate(names)},
+        '_layouts': {},
+        '_mutable': cls,
+    }
+    for index, name in enumerate(names):
+        namespace[name] = _field(index)
+    return type('Frozen', (FrozenOptions,), namespace)
+
+
 class Options(ABC):
+    _schema: tuple[tuple[str, BaseOption], ...] = ()
+    Frozen: type[FrozenOptions] = FrozenOptions
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._schema = compile_schema(cls)
+        cls.Frozen = make_frozen(cls)
+
     def __init__(self, **kwargs) -> None:
         for key, value in kwargs.items():
             if hasattr(self, key):
@@ -10,14 +179,17 @@ class Options(ABC):
             else:
                 raise AttributeError(f"Opção inválida: '{key}'")
 
+    def freeze(self) -> FrozenOptions:
+        values = self.__dict__
+        return self.Frozen._from_values(
+            tuple(_freeze(values.get(name)) for name, _ in self._schema)
+        )
+
     def generate_command_args(self) -> list[str]:
         args = []
-        for attr_name, attr_value in self.__class__.__dict__.items():
-            
-            if isinstance(attr_value, BaseOption):
-                value = getattr(self, attr_name)
-                
-                if value is not None:
-                    args.extend(attr_value.to_args(value))
-
+        values = self.__dict__
+        for name, option in self._schema:
+            value = values.get(name)
+            if value is not None:
+                args.extend(option.to_args(value))
         return args
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+from .output_cache import normalize_args
+
+
+def partial_path(output_file: Path) -> Path:
+    return output_file.with_name(f'.{output_file.stem}.partial{output_file.suffix}')
+
+
+def is_partial(path: Path) -> bool:
+    return path.name.startswith('.') and path.stem.endswith('.partial')
+
+
+class JobJournal:
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha truncada por uma queda no meio da escrita.
+                    continue
+                self._entries[self._key(entry['input'], entry['output'])] = entry
+
+    @staticmethod
+    def _key(input_file: str | Path, output_file: str | Path) -> str:
+        return f'{input_file}\0{output_file}'
+
+    @staticmethod
+    def fingerprint(input_file: Path) -> dict:
+        stat = input_file.stat()
+        return {
+            'input': str(input_file.resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def get(self, input_file: Path, output_file: Path) -> dict | None:
+        key = self._key(input_file.resolve(), output_file.resolve())
+        with self._lock:
+            return self._entries.get(key)
+
+    def is_complete(
+        self,
+        input_file: Path,
+        output_file: Path,
+        command: List[str],
+        settings: dict | None = None
+    ) -> bool:
+
+        entry = self.get(input_file, output_file)
+        if entry is None or entry['status'] != 'done':
+            return False
+
+        # -threads, -loglevel etc. variam com a máquina e o número de workers
+        # sem mudar o arquivo gerado; não podem forçar um novo encode.
+        if normalize_args(entry['args']) != normalize_args(command):
+            return False
+        if entry.get('settings') != settings:
+            return False
+
+        fingerprint = self.fingerprint(input_file)
+        if (entry['size'], entry['mtime_ns']) != (fingerprint['size'], fingerprint['mtime_ns']):
+            return False
+
+        try:
+            return output_file.stat().st_size == entry['output_size']
+        except OSError:
+            return False
+
+    def record(
+        self,
+        input_file: Path,
+        output_file: Path,
+        command: List[str],
+        status: str,
+        output_size: int | None = None,
+        settings: dict | None = None
+    ) -> None:
+
+        entry = self.fingerprint(input_file)
+        entry.update({
+            'output': str(output_file.resolve()),
+            'args': command,
+            'settings': settings,
+            'status': status,
+            'output_size': output_size,
+            'time': time.time(),
+        })
+
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries[self._key(entry['input'], entry['output'])] = entry
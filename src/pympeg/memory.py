@@ -0,0 +1,189 @@
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+from .probe import MediaInfo
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MiB = 1024 ** 2
+
+# Processo do ffmpeg, demuxer, decoder e buffers de I/O.
+BASE_MEMORY = 96 * MiB
+
+# Quadros que o encoder segura além do lookahead (referências + fila de saída).
+REFERENCE_FRAMES = 6
+DEFAULT_RESOLUTION = (1920, 1080)
+
+# Peso por quadro em relação a um quadro yuv420p cru (estruturas de análise,
+# quadros reduzidos do lookahead, buffers de movimento). É uma heurística
+# conservadora para admissão de jobs, não uma medida exata.
+CODEC_WEIGHTS = {
+    'libx264': 2.0,
+    'h264': 2.0,
+    'libx265': 4.5,
+    'hevc': 4.5,
+    'vp9': 3.0,
+    'vp8': 2.0,
+    'mpeg4': 1.0,
+    'mpeg2video': 1.0,
+    'prores': 1.0,
+    'dnxhd': 1.0,
+    'ffv1': 1.0,
+    'mjpeg': 0.5,
+    'gif': 0.5,
+    'rawvideo': 0.5,
+    'copy': 0.0,
+}
+
+# rc-lookahead de cada preset (x264 / x265).
+LOOKAHEAD = {
+    'libx264': {
+        'ultrafast': 0, 'superfast': 0, 'veryfast': 10, 'faster': 20, 'fast': 30,
+        'medium': 40, 'slow': 50, 'slower': 60, 'veryslow': 60, 'placebo': 60,
+    },
+    'libx265': {
+        'ultrafast': 5, 'superfast': 10, 'veryfast': 15, 'faster': 15, 'fast': 15,
+        'medium': 20, 'slow': 25, 'slower': 40, 'veryslow': 40, 'placebo': 60,
+    },
+}
+LOOKAHEAD['h264'] = LOOKAHEAD['libx264']
+LOOKAHEAD['hevc'] = LOOKAHEAD['libx265']
+
+# Sinais com que um filho morre por falta de memória: SIGKILL do OOM killer e,
+# sob RLIMIT_AS, SIGABRT/SIGSEGV de um malloc que devolveu NULL.
+OOM_SIGNALS = (signal.SIGKILL, signal.SIGABRT, signal.SIGSEGV)
+
+
+def estimate_encoder_memory(
+    resolution: tuple[int, int] | None,
+    codec: str | None = None,
+    preset: str | None = None,
+    threads: int | None = None,
+    pixel_format: str | None = None
+) -> int:
+
+    codec = codec or 'libx264'
+    weight = CODEC_WEIGHTS.get(codec, 1.0)
+    if not weight:
+        return 0
+
+    width, height = resolution or DEFAULT_RESOLUTION
+    frame = width * height * 1.5
+    if pixel_format is not None and ('10' in pixel_format or '12' in pixel_format):
+        frame *= 2
+
+    lookahead = LOOKAHEAD.get(codec, {}).get(preset or 'medium', 0)
+    threads = threads or os.cpu_count() or 1
+    # Com threading por quadro, cada thread mantém quadros próprios em andamento.
+    frames = lookahead + REFERENCE_FRAMES + 2 * threads
+    return int(frame * frames * weight)
+
+
+def _value(args: List[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    return args[args.index(flag) + 1]
+
+
+def _output_resolution(args: List[str]) -> tuple[int, int] | None:
+    size = _value(args, '-s')
+    if size is None:
+        return None
+    # Import tardio: frames importa o runner, que importa este módulo.
+    from .frames import parse_size
+    try:
+        return parse_size(size)
+    except ValueError:
+        return None
+
+
+def estimate_job_memory(
+    info: MediaInfo | None,
+    outputs: List[List[str]],
+    threads: int | None = None
+) -> int:
+
+    source = info.resolution if info is not None else None
+    pixel_format = info.pixel_format if info is not None else None
+    total = BASE_MEMORY
+    for args in outputs:
+        total += estimate_encoder_memory(
+            _output_resolution(args) or source,
+            _value(args, '-c:v'),
+            _value(args, '-preset'),
+            threads,
+            _value(args, '-pix_fmt') or pixel_format,
+        )
+    return total
+
+
+def available_memory() -> int | None:
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def is_out_of_memory(returncode: int) -> bool:
+    # Negativo quando o Popen vê o sinal; 128 + sinal quando passa por um shell.
+    return any(returncode in (-sig, 128 + sig) for sig in OOM_SIGNALS)
+
+
+def limit_address_space(pid: int, limit: int) -> None:
+    # Aplicado de fora, no processo já criado: um preexec_fn no Popen não é
+    # seguro com o runner disparando jobs de várias threads.
+    if resource is None or not hasattr(resource, 'prlimit'):
+        raise OSError('RLIMIT_AS por processo não está disponível nesta plataforma.')
+    resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+
+
+class MemoryBudget:
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError('O orçamento de memória deve ser > 0')
+        self.limit = limit
+        self.used = 0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_available(cls, fraction: float = 0.8) -> 'MemoryBudget':
+        if not 0 < fraction <= 1:
+            raise ValueError('fraction deve estar em (0, 1]')
+        available = available_memory()
+        if available is None:
+            raise OSError('Não foi possível medir a memória disponível.')
+        return cls(int(available * fraction))
+
+    def acquire(self, amount: int) -> None:
+        with self._cond:
+            # Um job maior que o orçamento inteiro roda sozinho em vez de travar o batch.
+            while self.used and self.used + amount > self.limit:
+                self._cond.wait()
+            self.used += amount
+
+    def release(self, amount: int) -> None:
+        with self._cond:
+            self.used = max(0, self.used - amount)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, amount: int) -> Iterator[None]:
+        self.acquire(amount)
+        try:
+            yield
+        finally:
+            self.release(amount)
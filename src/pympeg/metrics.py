@@ -0,0 +1,263 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List
+from .memory import limit_address_space
+
+
+@dataclass(slots=True, frozen=True)
+class ProcessUsage:
+    returncode: int
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss: int = 0
+
+
+def _rss_bytes(ru_maxrss: int) -> int:
+    # Linux reporta em KiB, macOS em bytes.
+    return ru_maxrss if sys.platform == 'darwin' else ru_maxrss * 1024
+
+
+def wait_measured(process: subprocess.Popen) -> ProcessUsage:
+    if not hasattr(os, 'wait4'):
+        return ProcessUsage(process.wait())
+
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return ProcessUsage(
+        process.returncode, usage.ru_utime, usage.ru_stime, _rss_bytes(usage.ru_maxrss)
+    )
+
+
+def _pump(stream, on_line: Callable[[str], None]) -> None:
+    with stream:
+        for line in stream:
+            on_line(line)
+
+
+def run_measured(
+    command_list: List[str],
+    on_line: Callable[[str], None] | None = None,
+    on_stderr: Callable[[str], None] | None = None,
+    memory_limit: int | None = None
+) -> ProcessUsage:
+
+    process = subprocess.Popen(
+        command_list,
+        stdout=None if on_line is None else subprocess.PIPE,
+        stderr=None if on_stderr is None else subprocess.PIPE,
+        text=True
+    )
+    # stderr vai numa thread à parte para não travar quando o pipe de stdout
+    # também está sendo lido. O modo texto já separa as linhas de stats em '\r'.
+    reader = None
+    if on_stderr is not None:
+        reader = threading.Thread(target=_pump, args=(process.stderr, on_stderr), daemon=True)
+        reader.start()
+    try:
+        if memory_limit is not None:
+            limit_address_space(process.pid, memory_limit)
+        if on_line is not None:
+            for line in process.stdout:
+                on_line(line)
+    except BaseException:
+        process.kill()
+        wait_measured(process)
+        raise
+    finally:
+        if process.stdout is not None:
+            process.stdout.close()
+        if reader is not None:
+            reader.join()
+
+    usage = wait_measured(process)
+    if usage.returncode != 0:
+        raise subprocess.CalledProcessError(usage.returncode, command_list)
+    return usage
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+@dataclass(slots=True)
+class JobMetrics:
+    wall_time: float = 0.0
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    media_duration: float | None = None
+
+    @classmethod
+    def from_usage(cls, usage: ProcessUsage, wall_time: float) -> 'JobMetrics':
+        return cls(wall_time, usage.user_time, usage.system_time, usage.max_rss)
+
+    @property
+    def cpu_time(self) -> float:
+        return self.user_time + self.system_time
+
+    @property
+    def compression_ratio(self) -> float | None:
+        return self.output_bytes / self.input_bytes if self.input_bytes else None
+
+    @property
+    def speed(self) -> float | None:
+        if not self.media_duration or not self.wall_time:
+            return None
+        return self.media_duration / self.wall_time
+
+    def measure_files(self, input_file: Path, output_files: Iterable[Path]) -> None:
+        self.input_bytes = _size(input_file)
+        self.output_bytes = sum(_size(path) for path in output_files)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.update(
+            cpu_time=self.cpu_time,
+            compression_ratio=self.compression_ratio,
+            speed=self.speed,
+        )
+        return data
+
+
+def _label_value(value: object) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@dataclass(slots=True)
+class BatchSummary:
+    jobs: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    cached: int = 0
+    wall_time: float = 0.0
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    media_duration: float = 0.0
+    finished_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_results(cls, results: Iterable, wall_time: float) -> 'BatchSummary':
+        summary = cls(wall_time=wall_time)
+        for result in results:
+            summary.jobs += 1
+            if not result.ok:
+                summary.failed += 1
+                continue
+            summary.succeeded += 1
+            summary.skipped += result.skipped
+            summary.cached += result.cached
+
+            metrics = result.metrics
+            if metrics is None:
+                continue
+            summary.user_time += metrics.user_time
+            summary.system_time += metrics.system_time
+            summary.max_rss = max(summary.max_rss, metrics.max_rss)
+            summary.input_bytes += metrics.input_bytes
+            summary.output_bytes += metrics.output_bytes
+            summary.media_duration += metrics.media_duration or 0.0
+        return summary
+
+    @property
+    def cpu_time(self) -> float:
+        return self.user_time + self.system_time
+
+    @property
+    def throughput(self) -> float | None:
+        return self.jobs / self.wall_time if self.wall_time else None
+
+    @property
+    def compression_ratio(self) -> float | None:
+        return self.output_bytes / self.input_bytes if self.input_bytes else None
+
+    @property
+    def speed(self) -> float | None:
+        if not self.media_duration or not self.wall_time:
+            return None
+        return self.media_duration / self.wall_time
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.update(
+            cpu_time=self.cpu_time,
+            throughput=self.throughput,
+            compression_ratio=self.compression_ratio,
+            speed=self.speed,
+        )
+        return data
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'pympeg_batch', labels: dict[str, str] | None = None) -> str:
+        base = dict(labels or {})
+
+        def sample(name: str, value: float, **extra: str) -> str:
+            merged = {**base, **extra}
+            rendered = ','.join(f'{k}="{_label_value(v)}"' for k, v in merged.items())
+            return f'{prefix}_{name}{{{rendered}}} {value}' if rendered else f'{prefix}_{name} {value}'
+
+        metrics = [
+            ('jobs', 'Jobs in the last batch by status.', [
+                sample('jobs', self.succeeded - self.skipped - self.cached, status='encoded'),
+                sample('jobs', self.cached, status='cached'),
+                sample('jobs', self.skipped, status='skipped'),
+                sample('jobs', self.failed, status='failed'),
+            ]),
+            ('wall_seconds', 'Wall-clock duration of the last batch.',
+             [sample('wall_seconds', self.wall_time)]),
+            ('cpu_seconds', 'CPU time used by ffmpeg children.', [
+                sample('cpu_seconds', self.user_time, mode='user'),
+                sample('cpu_seconds', self.system_time, mode='system'),
+            ]),
+            ('max_rss_bytes', 'Largest peak RSS among ffmpeg children.',
+             [sample('max_rss_bytes', self.max_rss)]),
+            ('input_bytes', 'Bytes read from input files.',
+             [sample('input_bytes', self.input_bytes)]),
+            ('output_bytes', 'Bytes written to output files.',
+             [sample('output_bytes', self.output_bytes)]),
+            ('media_seconds', 'Media duration processed.',
+             [sample('media_seconds', self.media_duration)]),
+            ('speed_ratio', 'Media seconds processed per wall-clock second.',
+             [sample('speed_ratio', self.speed or 0.0)]),
+            ('compression_ratio', 'Output bytes divided by input bytes.',
+             [sample('compression_ratio', self.compression_ratio or 0.0)]),
+            ('last_run_timestamp_seconds', 'Unix time when the last batch finished.',
+             [sample('last_run_timestamp_seconds', self.finished_at)]),
+        ]
+
+        lines = []
+        for name, help_text, samples in metrics:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str | Path, **kwargs) -> None:
+        # O textfile collector pode ler a qualquer momento: escreve em temp e troca.
+        path = Path(path)
+        temp = path.with_name(f'.{path.name}.{os.getpid()}')
+        temp.write_text(self.to_prometheus(**kwargs))
+        os.replace(temp, path)
+
+
+class BatchResults(list):
+
+    def __init__(self, results: Iterable = (), summary: BatchSummary | None = None) -> None:
+        super().__init__(results)
+        self.summary = summary if summary is not None else BatchSummary.from_results(self, 0.0)
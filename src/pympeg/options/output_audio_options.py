@@ -2,7 +2,7 @@ from pympeg.interfaces import Options
 from pympeg.constants import AUDIO_FORMATS, AUDIO_CODECS
 from pympeg.descriptors import (
     ChoiceOption, TimeOption, IntOption, FloatOption, SampleRateOption,
-    BitrateOption, DictOption
+    BitrateOption, DictOption, BoolOption
 )
 
 
@@ -16,6 +16,7 @@ class OutputAudioOptions(Options):
     qscale: float | int | None
     duration: str | None
     metadata: dict[str, str] | None
+    no_video: bool | None
 
     format = ChoiceOption(flag='-f', choices=AUDIO_FORMATS)
     codec = ChoiceOption(flag='-c:a', choices=AUDIO_CODECS | {'copy'})
@@ -25,3 +26,4 @@ class OutputAudioOptions(Options):
     qscale = FloatOption(flag='-qscale:a', min_val=0)
     duration = TimeOption(flag='-t')
     metadata = DictOption(flag='-metadata')
+    no_video = BoolOption(true_flag='-vn')
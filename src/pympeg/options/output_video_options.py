@@ -25,6 +25,7 @@ class OutputVideoOptions(Options):
     movflags: str | None
     tune: str | None
     x265_params: str | None
+    threads: int | None
 
     format = ChoiceOption(flag='-f', choices=VIDEO_FORMATS)
     codec = ChoiceOption(flag='-c:v', choices=VIDEO_CODECS)
@@ -40,3 +41,4 @@ class OutputVideoOptions(Options):
     movflags = ChoiceOption(flag='-movflags', choices=VIDEO_MOVFLAGS)
     tune = ChoiceOption(flag='-tune', choices=VIDEO_TUNES)
     x265_params = BaseOption(flag='-x265-params')
+    threads = IntOption(flag='-threads', min_val=0)
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+from .cache import default_cache_dir, file_key
+from .probe import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# Flags que mudam só o comportamento do processo, não o arquivo gerado.
+VOLATILE_FLAGS = {'-y', '-n', '-stats', '-nostats', '-hide_banner'}
+VOLATILE_VALUE_FLAGS = {'-loglevel', '-progress', '-threads'}
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def normalize_args(args: List[str]) -> List[str]:
+    normalized = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in VOLATILE_VALUE_FLAGS:
+            skip = True
+        elif arg not in VOLATILE_FLAGS:
+            normalized.append(arg)
+    return normalized
+
+
+def content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    buffer = memoryview(bytearray(HASH_CHUNK_SIZE))
+    with open(path, 'rb', buffering=0) as f:
+        while n := f.readinto(buffer):
+            digest.update(buffer[:n])
+    return digest.hexdigest()
+
+
+class OutputCache:
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = 50 * 1024 ** 3,
+        link: bool = True
+    ) -> None:
+
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be >= 1')
+
+        self.directory = Path(directory) if directory is not None else default_cache_dir() / 'outputs'
+        self.objects = self.directory / 'objects'
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.link = link
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        self._flight = SingleFlight()
+        self._hashes: dict[tuple, str] = {}
+        self._db = sqlite3.connect(
+            self.directory / 'index.sqlite', check_same_thread=False, isolation_level=None
+        )
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS artifacts ('
+            'key TEXT PRIMARY KEY, name TEXT NOT NULL, '
+            'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+
+    def __enter__(self) -> 'OutputCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            total_bytes = self._db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM artifacts'
+            ).fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'bytes': total_bytes,
+            }
+
+    def fingerprint(self, input_file: Path) -> str:
+        key = file_key(input_file)
+        with self._lock:
+            cached = self._hashes.get(key)
+        if cached is None:
+            cached = content_hash(input_file)
+            with self._lock:
+                self._hashes[key] = cached
+        return cached
+
+    def key(self, input_file: Path, args: List[str], settings: dict | None = None) -> str:
+        digest = hashlib.sha256(self.fingerprint(input_file).encode())
+        for arg in normalize_args(args):
+            digest.update(b'\0' + arg.encode())
+        if settings is not None:
+            digest.update(b'\1' + json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _artifact(self, key: str, name: str) -> Path:
+        return self.objects / key[:2] / name
+
+    def _materialize(self, source: Path, target: Path) -> None:
+        target.unlink(missing_ok=True)
+        if self.link:
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, target)
+
+    def fetch(self, key: str, output_file: Path) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT name FROM artifacts WHERE key = ?', (key,)
+            ).fetchone()
+            artifact = self._artifact(key, row[0]) if row else None
+
+            if artifact is None or not artifact.exists():
+                if row:
+                    self._db.execute('DELETE FROM artifacts WHERE key = ?', (key,))
+                return False
+
+            self._db.execute(
+                'UPDATE artifacts SET accessed = ? WHERE key = ?', (time.time(), key)
+            )
+
+        self._materialize(artifact, output_file)
+        logger.info(f'Cache hit: {output_file.name}')
+        return True
+
+    def store(self, key: str, output_file: Path) -> None:
+        name = f'{key}{output_file.suffix}'
+        artifact = self._artifact(key, name)
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+
+        temp = artifact.with_name(f'.{name}.{threading.get_ident()}')
+        self._materialize(output_file, temp)
+        os.replace(temp, artifact)
+
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO artifacts (key, name, size, accessed) '
+                'VALUES (?, ?, ?, ?)',
+                (key, name, artifact.stat().st_size, time.time())
+            )
+            self._evict()
+
+    def _count(self, hit: bool) -> bool:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def run(
+        self,
+        key: str,
+        output_file: Path,
+        produce: Callable[[Path], None]
+    ) -> bool:
+
+        if self.fetch(key, output_file):
+            return self._count(True)
+
+        def encode_once() -> Path:
+            # Nunca escreve por cima de output_file: ele pode ser um hardlink de um
+            # artefato e o O_TRUNC do ffmpeg alteraria o cache junto.
+            temp = output_file.with_name(
+                f'.{output_file.stem}.{threading.get_ident()}.partial{output_file.suffix}'
+            )
+            temp.unlink(missing_ok=True)
+            try:
+                produce(temp)
+                os.replace(temp, output_file)
+            except BaseException:
+                temp.unlink(missing_ok=True)
+                raise
+            self.store(key, output_file)
+            return output_file
+
+        # Jobs idênticos simultâneos esperam o primeiro encode e reutilizam o artefato.
+        owner = self._flight.do(key, encode_once)
+        if owner == output_file:
+            return self._count(False)
+
+        if self.fetch(key, output_file):
+            return self._count(True)
+
+        encode_once()
+        return self._count(False)
+
+    def _evict(self) -> None:
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM artifacts').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute(
+            'SELECT key, name, size FROM artifacts ORDER BY accessed'
+        ).fetchall()
+        for key, name, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._artifact(key, name).unlink(missing_ok=True)
+            self._db.execute('DELETE FROM artifacts WHERE key = ?', (key,))
+            total -= size
+            self.evictions += 1
@@ -0,0 +1,139 @@
+import io
+import logging
+import os
+import shlex
+import subprocess
+import threading
+from typing import BinaryIO, Iterable, Iterator, List, Union
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+PIPE_INPUT = 'pipe:0'
+PIPE_OUTPUT = 'pipe:1'
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+PipeSource = Union[bytes, bytearray, memoryview, BinaryIO, Iterable[bytes]]
+
+
+def _write_all(stdin: BinaryIO, view: memoryview) -> None:
+    while view:
+        written = stdin.write(view)
+        view = view[written:]
+
+
+def _read_into(stream: BinaryIO, view: memoryview) -> int:
+    total = 0
+    while total < len(view):
+        n = stream.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+def _passthrough_fd(source: object) -> int | None:
+    try:
+        fd = source.fileno()
+        if not source.seekable():
+            return None
+        os.lseek(fd, source.tell(), os.SEEK_SET)
+        return fd
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+class StdinWriter(threading.Thread):
+
+    def __init__(self, stdin: BinaryIO, source: PipeSource, chunk_size: int) -> None:
+        super().__init__(daemon=True)
+        self.stdin = stdin
+        self.source = source
+        self.chunk_size = chunk_size
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        try:
+            self._feed()
+        except BrokenPipeError:
+            # O FFmpeg fechou a entrada (ex.: -t atingido ou processo encerrado).
+            pass
+        except BaseException as e:
+            self.error = e
+        finally:
+            try:
+                self.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def _feed(self) -> None:
+        source = self.source
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            _write_all(self.stdin, memoryview(source).cast('B'))
+            return
+
+        if hasattr(source, 'readinto'):
+            buffer = memoryview(bytearray(self.chunk_size))
+            while n := source.readinto(buffer):
+                _write_all(self.stdin, buffer[:n])
+            return
+
+        if hasattr(source, 'read'):
+            while chunk := source.read(self.chunk_size):
+                _write_all(self.stdin, memoryview(chunk).cast('B'))
+            return
+
+        for chunk in source:
+            _write_all(self.stdin, memoryview(chunk).cast('B'))
+
+
+def run_piped(
+    command_list: List[str],
+    source: PipeSource | None = None,
+    capture: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+
+    if source is None:
+        stdin = subprocess.DEVNULL
+    else:
+        fd = _passthrough_fd(source)
+        stdin = subprocess.PIPE if fd is None else fd
+
+    logger.info(f"cmd: {shlex.join(command_list)}")
+    process = subprocess.Popen(
+        command_list,
+        stdin=stdin,
+        stdout=subprocess.PIPE if capture else None,
+        bufsize=0
+    )
+
+    writer = None
+    if stdin is subprocess.PIPE:
+        writer = StdinWriter(process.stdin, source, chunk_size)
+        writer.start()
+
+    try:
+        if capture:
+            while chunk := process.stdout.read(chunk_size):
+                yield chunk
+        returncode = process.wait()
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        if writer is not None:
+            writer.join()
+        if capture:
+            process.stdout.close()
+
+    if writer is not None and writer.error is not None:
+        raise writer.error
+
+    if returncode != 0:
+        logger.error(f'FFmpeg falhou com código {returncode}.')
+        raise subprocess.CalledProcessError(returncode, command_list)
+    logger.info('Comando executado com sucesso.')
@@ -0,0 +1,226 @@
+import json
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from .binaries import ffprobe_binary
+
+
+def _float(value: object) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: object) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate(value: str | None) -> Fraction | None:
+    if not value:
+        return None
+    try:
+        rate = Fraction(value)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return rate if rate > 0 else None
+
+
+@dataclass(slots=True, frozen=True)
+class StreamInfo:
+    index: int
+    codec_type: str | None = None
+    codec_name: str | None = None
+    width: int | None = None
+    height: int | None = None
+    pixel_format: str | None = None
+    fps: Fraction | None = None
+    bit_rate: int | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    duration: float | None = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'StreamInfo':
+        return cls(
+            index=data.get('index', 0),
+            codec_type=data.get('codec_type'),
+            codec_name=data.get('codec_name'),
+            width=_int(data.get('width')),
+            height=_int(data.get('height')),
+            pixel_format=data.get('pix_fmt'),
+            fps=parse_rate(data.get('avg_frame_rate')) or parse_rate(data.get('r_frame_rate')),
+            bit_rate=_int(data.get('bit_rate')),
+            sample_rate=_int(data.get('sample_rate')),
+            channels=_int(data.get('channels')),
+            duration=_float(data.get('duration')),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class MediaInfo:
+    path: Path
+    format_name: str | None = None
+    duration: float | None = None
+    bit_rate: int | None = None
+    size: int | None = None
+    streams: tuple[StreamInfo, ...] = ()
+
+    @classmethod
+    def from_json(cls, path: Path, data: dict) -> 'MediaInfo':
+        fmt = data.get('format', {})
+        streams = tuple(StreamInfo.from_json(s) for s in data.get('streams', []))
+        duration = _float(fmt.get('duration'))
+        if duration is None:
+            duration = max((s.duration for s in streams if s.duration), default=None)
+
+        return cls(
+            path=path,
+            format_name=fmt.get('format_name'),
+            duration=duration,
+            bit_rate=_int(fmt.get('bit_rate')),
+            size=_int(fmt.get('size')),
+            streams=streams,
+        )
+
+    def _first(self, codec_type: str) -> StreamInfo | None:
+        return next((s for s in self.streams if s.codec_type == codec_type), None)
+
+    @property
+    def video(self) -> StreamInfo | None:
+        return self._first('video')
+
+    @property
+    def audio(self) -> StreamInfo | None:
+        return self._first('audio')
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio is not None
+
+    @property
+    def fps(self) -> Fraction | None:
+        return self.video.fps if self.video else None
+
+    @property
+    def width(self) -> int | None:
+        return self.video.width if self.video else None
+
+    @property
+    def height(self) -> int | None:
+        return self.video.height if self.video else None
+
+    @property
+    def resolution(self) -> tuple[int, int] | None:
+        if self.width is None or self.height is None:
+            return None
+        return self.width, self.height
+
+    @property
+    def pixel_format(self) -> str | None:
+        return self.video.pixel_format if self.video else None
+
+    @property
+    def video_codec(self) -> str | None:
+        return self.video.codec_name if self.video else None
+
+    @property
+    def audio_codec(self) -> str | None:
+        return self.audio.codec_name if self.audio else None
+
+
+def probe_json(path: str | Path, ffprobe: str | None = None) -> dict:
+    cmd = [
+        ffprobe or ffprobe_binary(), '-v', 'error',
+        '-print_format', 'json',
+        '-show_format', '-show_streams',
+        str(path)
+    ]
+    output = subprocess.check_output(cmd, stderr=subprocess.PIPE)
+    return json.loads(output)
+
+
+def probe(path: str | Path, ffprobe: str | None = None) -> MediaInfo:
+    path = Path(path)
+    return MediaInfo.from_json(path, probe_json(path, ffprobe))
+
+
+def probe_duration(path: Path, ffprobe: str | None = None) -> float | None:
+    try:
+        return probe(path, ffprobe).duration
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class ProbeResult:
+    path: Path
+    info: MediaInfo | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class SingleFlight:
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[object, Future] = {}
+
+    def do(self, key: object, func: Callable[[], object]) -> object:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        return future.result()
+
+
+_probe_flight = SingleFlight()
+
+
+def probe_many(
+    paths: Iterable[str | Path],
+    max_workers: int = 8,
+    probe_func: Callable[[Path], MediaInfo] | None = None
+) -> Iterator[ProbeResult]:
+
+    probe_func = probe_func or probe
+    requested: dict[str, list[Path]] = {}
+    for path in paths:
+        path = Path(path)
+        requested.setdefault(str(path.resolve()), []).append(path)
+
+    def run(key: str) -> MediaInfo:
+        path = requested[key][0]
+        return _probe_flight.do((probe_func, key), lambda: probe_func(path))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(run, key): key for key in requested}
+        for future in as_completed(futures):
+            error = future.exception()
+            info = None if error is not None else future.result()
+            for path in requested[futures[future]]:
+                yield ProbeResult(path, info=info, error=error)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+
+
+PROGRESS_ARGS = ['-progress', 'pipe:1']
+
+
+@dataclass(slots=True)
+class Progress:
+    frame: int | None = None
+    fps: float | None = None
+    out_time: float | None = None
+    speed: float | None = None
+    total_size: int | None = None
+    bitrate: float | None = None
+    percent: float | None = None
+    done: bool = False
+
+
+def parse_time(value: str) -> float | None:
+    try:
+        if ':' not in value:
+            return float(value)
+        hours, minutes, seconds = value.split(':')
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+def _number(value: str, cast: type, suffix: str = '') -> int | float | None:
+    value = value.strip()
+    if suffix and value.endswith(suffix):
+        value = value[:-len(suffix)]
+    try:
+        return cast(value)
+    except ValueError:
+        return None
+
+
+class ProgressParser:
+
+    def __init__(self, duration: float | None = None) -> None:
+        self.duration = duration if duration and duration > 0 else None
+        self._fields: dict[str, str] = {}
+
+    def feed(self, line: str) -> Progress | None:
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            return None
+
+        if key != 'progress':
+            self._fields[key] = value
+            return None
+
+        fields, self._fields = self._fields, {}
+        return self._build(fields, done=value == 'end')
+
+    def _build(self, fields: dict[str, str], done: bool) -> Progress:
+        progress = Progress(done=done)
+
+        if 'frame' in fields:
+            progress.frame = _number(fields['frame'], int)
+        if 'fps' in fields:
+            progress.fps = _number(fields['fps'], float)
+        if 'speed' in fields:
+            progress.speed = _number(fields['speed'], float, suffix='x')
+        if 'total_size' in fields:
+            progress.total_size = _number(fields['total_size'], int)
+        if 'bitrate' in fields:
+            progress.bitrate = _number(fields['bitrate'], float, suffix='kbits/s')
+
+        if 'out_time_us' in fields:
+            out_time_us = _number(fields['out_time_us'], int)
+            if out_time_us is not None:
+                progress.out_time = out_time_us / 1_000_000
+        elif 'out_time' in fields:
+            progress.out_time = parse_time(fields['out_time'])
+
+        if done:
+            progress.percent = 100.0
+        elif self.duration and progress.out_time is not None:
+            percent = progress.out_time / self.duration * 100
+            progress.percent = min(100.0, max(0.0, percent))
+
+        return progress
+
@@ -0,0 +1,98 @@
+import subprocess
+from pathlib import Path
+from typing import Iterator
+from .interfaces import Options
+from .options import GlobalOptions
+from .pipes import PIPE_OUTPUT, _read_into
+from .runner import Runner
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "FrameReader/FrameWriter/AudioReader precisam do numpy: pip install pympeg[numpy]"
+        )
+
+
+class RawReader:
+    # Base dos leitores de saída crua: o ffmpeg escreve no stdout e os blocos
+    # de tamanho fixo são lidos direto em arrays do numpy.
+
+    def __init__(
+        self,
+        input_file: str | Path,
+        output_options: Options,
+        input_options: Options | None = None,
+        global_options: GlobalOptions | None = None,
+        reuse_buffer: bool = False
+    ) -> None:
+
+        _require_numpy()
+        self.input_file = Path(input_file)
+        self.output_options = output_options
+        self.reuse_buffer = reuse_buffer
+
+        self._runner = Runner(self.input_file, PIPE_OUTPUT)
+        if global_options is not None:
+            self._runner.add_global_options(global_options)
+        if input_options is not None:
+            self._runner.add_input_options(input_options)
+        self._runner.add_output_options(self.output_options)
+
+        self._process: subprocess.Popen | None = None
+
+    def _layout(self) -> tuple[tuple[int, ...], 'np.dtype', int]:
+        # Forma de cada bloco, dtype e bytes de um item do primeiro eixo.
+        raise NotImplementedError
+
+    def command(self) -> list[str]:
+        return self._runner._build_command(self.input_file, Path(PIPE_OUTPUT))
+
+    def __enter__(self) -> 'RawReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        process.stdout.close()
+
+    def __iter__(self) -> Iterator['np.ndarray']:
+        shape, dtype, item_bytes = self._layout()
+
+        command_list = self.command()
+        self._process = subprocess.Popen(
+            command_list, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, bufsize=0
+        )
+        stdout = self._process.stdout
+        buffer = np.empty(shape, dtype=dtype) if self.reuse_buffer else None
+
+        try:
+            while True:
+                array = buffer if buffer is not None else np.empty(shape, dtype=dtype)
+                n = _read_into(stdout, memoryview(array).cast('B'))
+                items = n // item_bytes
+                if items == 0:
+                    break
+                if n < array.nbytes:
+                    yield array[:items]
+                    break
+                yield array
+
+            returncode = self._process.wait()
+        finally:
+            self.close()
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command_list)
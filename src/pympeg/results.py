@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from pathlib import Path
+from .metrics import JobMetrics
+
+
+@dataclass(slots=True)
+class JobResult:
+    input_file: Path
+    output_file: Path
+    error: BaseException | None = None
+    skipped: bool = False
+    cached: bool = False
+    metrics: JobMetrics | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -1,23 +1,113 @@
+import os
 import subprocess
 import logging
 import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator, List
+from .binaries import ffmpeg_binary, ffprobe_binary
+from .cache import ProbeCache
+from .constants import AUDIO_FORMATS
+from .hooks import (
+    ErrorEvent, FinishEvent, HookRegistry, PlanEvent, ProgressEvent, StartEvent, StderrLineEvent
+)
 from .interfaces import Options
+from .memory import MemoryBudget, estimate_job_memory, is_out_of_memory
+from .output_cache import OutputCache
+from .journal import JobJournal, is_partial, partial_path
+from .metrics import BatchResults, BatchSummary, JobMetrics, run_measured
+from .pipes import DEFAULT_CHUNK_SIZE, PIPE_INPUT, PIPE_OUTPUT, PipeSource, run_piped
+from .probe import MediaInfo, probe, probe_many
+from .progress import PROGRESS_ARGS, Progress, ProgressParser, parse_time
+from .results import JobResult
+from .scheduling import SCHEDULES, dispatch_order
+from .template import JobTemplate
+
+if TYPE_CHECKING:
+    from .two_pass import TwoPassEncoder
 
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
+def split_thread_budget(max_workers: int, cpu_count: int | None = None) -> int:
+    total = cpu_count or os.cpu_count() or 1
+    return max(1, total // max(1, max_workers))
+
+
+def _flag_value(args: List[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    return args[args.index(flag) + 1]
+
+
+def _without_flag(args: List[str], flag: str) -> List[str]:
+    if flag not in args:
+        return args
+    i = args.index(flag)
+    return args[:i] + args[i + 2:]
+
+
+def _carries_video(target_file: Path, args: List[str]) -> bool:
+    if '-vn' in args:
+        return False
+    container = _flag_value(args, '-f') or target_file.suffix.lstrip('.').lower()
+    return container not in AUDIO_FORMATS
+
+
+def _split_filter(sizes: List[str | None]) -> str:
+    legs = ''.join(f'[v{i}]' for i in range(len(sizes)))
+    graph = [f'[0:v]split={len(sizes)}{legs}']
+    for i, size in enumerate(sizes):
+        if size is not None:
+            graph.append(f'[v{i}]scale=s={size}[s{i}]')
+    return ';'.join(graph)
+
+
 class Runner:
-    def __init__(self, input_path: str | Path, output_path: str | Path) -> None:
+    extensions = ['*.mp4', '*.mkv', '*.mov', '*.avi', '*.webm']
+
+    def __init__(
+        self,
+        input_path: str | Path = PIPE_INPUT,
+        output_path: str | Path = PIPE_OUTPUT,
+        max_workers: int = 1,
+        threads_per_job: int | None = None,
+        schedule: str = 'glob'
+    ) -> None:
+
+        if max_workers < 1:
+            raise ValueError('max_workers deve ser >= 1')
+        if schedule not in SCHEDULES:
+            raise ValueError(f'schedule inválido: {schedule}')
+
         self.input_path = Path(input_path)
         self.output_path = Path(output_path)
-        
+        self.max_workers = max_workers
+        self.threads_per_job = threads_per_job
+        self.schedule = schedule
+        self.journal: JobJournal | None = None
+        self.probe_cache: ProbeCache | None = None
+        self.output_cache: OutputCache | None = None
+        self.memory_budget: MemoryBudget | None = None
+        self.memory_limit: int | None = None
+        self.oom_retries = 0
+        self.two_pass: 'TwoPassEncoder | None' = None
+        self.ffmpeg = ffmpeg_binary()
+        self.ffprobe = ffprobe_binary()
+        self.on_progress: Callable[[Progress], None] | None = None
+        self.hooks = HookRegistry()
+
         self._global_options: List[str] = []
         self._input_options: List[str] = []
         self._output_options: List[str] = []
+        self._extra_outputs: List[tuple[Path, List[str]]] = []
+        self._media_info: dict[Path, MediaInfo] = {}
+        self._job_threads: dict[Path, int] = {}
 
     def add_global_options(self, options: Options) -> None:
         self._global_options.extend(options.generate_command_args())
@@ -28,55 +118,487 @@ class Runner:
     def add_output_options(self, options: Options) -> None:
         self._output_options.extend(options.generate_command_args())
 
-    def _build_command(self, input_file: Path, output_file: Path) -> List[str]:
-        cmd = ['ffmpeg']
+    def add_output(self, output_path: str | Path, *options: Options) -> None:
+        args = []
+        for option in options:
+            args.extend(option.generate_command_args())
+        self._extra_outputs.append((Path(output_path), args))
+
+    def _output_targets(
+        self,
+        input_file: Path,
+        output_file: Path
+    ) -> List[tuple[Path, List[str]]]:
+
+        targets = [(output_file, self._output_options)]
+        for output_path, args in self._extra_outputs:
+            if input_file.parent == self.input_path:
+                output_path = output_path / input_file.name
+            targets.append((output_path, args))
+        return targets
+
+    def _build_command(
+        self,
+        input_file: Path,
+        output_file: Path,
+        retry_threads: bool = True
+    ) -> List[str]:
+
+        cmd = [self.ffmpeg]
         cmd.extend(self._global_options)
         cmd.extend(self._input_options)
         cmd.extend(['-i', str(input_file)])
-        cmd.extend(self._output_options)
-        cmd.append(str(output_file))
+
+        targets = self._output_targets(input_file, output_file)
+        video = [_carries_video(target_file, args) for target_file, args in targets]
+        sizes = [_flag_value(args, '-s') for _, args in targets]
+        video_sizes = [size for size, has_video in zip(sizes, video) if has_video]
+        threads = self._job_threads.get(input_file) if retry_threads else None
+        if threads is not None:
+            targets = [
+                (target_file, _without_flag(args, '-threads')) for target_file, args in targets
+            ]
+
+        if len(set(video_sizes)) <= 1:
+            for target_file, args in targets:
+                cmd.extend(args)
+                cmd.extend(self._thread_args(args, threads))
+                cmd.append(str(target_file))
+            return cmd
+
+        # Só as saídas com vídeo ganham uma perna do split; as de áudio mapeiam só 0:a.
+        cmd.extend(['-filter_complex', _split_filter(video_sizes)])
+        leg = 0
+        for (target_file, args), size, has_video in zip(targets, sizes, video):
+            if has_video:
+                cmd.extend(['-map', f'[v{leg}]' if size is None else f'[s{leg}]'])
+                leg += 1
+            cmd.extend(['-map', '0:a?'])
+            cmd.extend(_without_flag(args, '-s'))
+            cmd.extend(self._thread_args(args, threads))
+            cmd.append(str(target_file))
         return cmd
 
-    def run(self) -> None:
+    def _job_command(self, input_file: Path, output_file: Path) -> List[str]:
+        # Identifica o job no journal e no cache de saídas. As threads reduzidas
+        # de uma nova tentativa por falta de memória não fazem parte da
+        # identidade: a próxima rodada monta o comando sem elas.
+        return self._build_command(input_file, output_file, retry_threads=False)
+
+    def _job_settings(self) -> dict | None:
+        # O que muda o resultado sem caber num comando só (modo de tamanho alvo).
+        return None if self.two_pass is None else self.two_pass.settings()
+
+    def job_template(self, output: Callable[[Path], Path] | None = None) -> JobTemplate:
+        return JobTemplate.from_runner(self, output)
+
+    def _thread_args(
+        self,
+        output_options: List[str] | None = None,
+        threads: int | None = None
+    ) -> List[str]:
+
+        if threads is not None:
+            return ['-threads', str(threads)]
+        if output_options is None:
+            output_options = self._output_options
+        if '-threads' in output_options:
+            return []
+
+        threads = self.threads_per_job
+        if threads is None and self.max_workers > 1:
+            threads = split_thread_budget(self.max_workers)
+
+        return [] if threads is None else ['-threads', str(threads)]
+
+    def _job_thread_count(self, input_file: Path) -> int:
+        threads = self._job_threads.get(input_file)
+        if threads is None:
+            args = self._thread_args() or self._output_options
+            threads = int(_flag_value(args, '-threads') or 0)
+        # -threads 0 (ou ausente) deixa o ffmpeg usar todos os núcleos.
+        return threads or os.cpu_count() or 1
+
+    def estimate_memory(self, input_file: Path) -> int:
+        try:
+            info = self.media_info(input_file)
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            info = None
+        outputs = [args for _, args in self._output_targets(input_file, input_file)]
+        return estimate_job_memory(info, outputs, self._job_thread_count(input_file))
+
+    def run(self) -> BatchResults | JobResult:
         if not self.input_path.exists():
             raise FileNotFoundError(f'Arquivo não encontrado: {self.input_path}')
 
         if self.input_path.is_file():
-            self.run_file(self.input_path, self.output_path)
+            if self.hooks.on_plan:
+                self._emit_plan([(self.input_path, self.output_path)])
+            return self._run_admitted(self.input_path, self.output_path)
         elif self.input_path.is_dir():
-            self.run_batch()
+            return self.run_batch()
         else:
             raise ValueError('O input deve ser um arquivo ou pasta.')
 
-    def run_file(self, input_file: Path, output_file: Path) -> None:
-        command_list = self._build_command(input_file, output_file)
-        command_str = shlex.join(command_list)
+    def run_file(self, input_file: Path, output_file: Path) -> JobMetrics:
+        if self.two_pass is not None:
+            return self.two_pass.run(input_file, output_file)
+        if self._tracks_progress():
+            command_list = self._progress_command(input_file, output_file)
+            return self._execute(command_list, input_file, output_file, track_progress=True)
+        return self._execute(self._build_command(input_file, output_file), input_file, output_file)
+
+    def _tracks_progress(self) -> bool:
+        return self.on_progress is not None or bool(self.hooks.on_progress)
+
+    def _execute(
+        self,
+        command_list: List[str],
+        input_file: Path,
+        output_file: Path,
+        track_progress: bool = False
+    ) -> JobMetrics:
+
+        hooks = self.hooks
+        on_line = on_stderr = None
+        if track_progress:
+            parser = ProgressParser(self._expected_duration(input_file))
+
+            def on_line(line: str) -> None:
+                progress = parser.feed(line)
+                if progress is None:
+                    return
+                if self.on_progress is not None:
+                    self.on_progress(progress)
+                if hooks.on_progress:
+                    hooks.emit('on_progress', ProgressEvent(input_file, output_file, progress))
 
-        logger.info(f"cmd: {command_str}")
+        if hooks.on_stderr_line:
+            def on_stderr(line: str) -> None:
+                event = StderrLineEvent(input_file, output_file, line.rstrip('\n'))
+                hooks.emit('on_stderr_line', event)
+
+        logger.info(f"cmd: {shlex.join(command_list)}")
+        start = time.perf_counter()
         try:
-            subprocess.run(command_list, check=True, text=True)
+            usage = run_measured(
+                command_list, on_line=on_line, on_stderr=on_stderr, memory_limit=self.memory_limit
+            )
             logger.info('Comando executado com sucesso.')
         except subprocess.CalledProcessError as e:
             logger.error(f'FFmpeg falhou com código {e.returncode}.')
             raise e
+        return JobMetrics.from_usage(usage, time.perf_counter() - start)
+
+    def stream(
+        self,
+        source: PipeSource | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+
+        input_file = self.input_path if source is None else Path(PIPE_INPUT)
+        command_list = self._build_command(input_file, Path(PIPE_OUTPUT))
+        yield from run_piped(command_list, source, chunk_size=chunk_size)
+
+    def run_pipe(
+        self,
+        source: PipeSource | None = None,
+        output: BinaryIO | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+
+        if output is not None:
+            for chunk in self.stream(source, chunk_size=chunk_size):
+                output.write(chunk)
+            return
 
-    def run_batch(self) -> None:
-        extensions = ['*.mp4', '*.mkv', '*.mov', '*.avi', '*.webm']
+        input_file = self.input_path if source is None else Path(PIPE_INPUT)
+        command_list = self._build_command(input_file, self.output_path)
+        for _ in run_piped(command_list, source, capture=False, chunk_size=chunk_size):
+            pass
+
+    def _progress_command(self, input_file: Path, output_file: Path) -> List[str]:
+        command_list = self._build_command(input_file, output_file)
+        command_list[1:1] = PROGRESS_ARGS
+        return command_list
+
+    def media_info(self, input_file: Path) -> MediaInfo:
+        info = self._media_info.get(input_file)
+        if info is None:
+            if self.probe_cache is not None:
+                info = self.probe_cache.probe(input_file, self.ffprobe)
+            else:
+                info = probe(input_file, self.ffprobe)
+            self._media_info[input_file] = info
+        return info
+
+    def prefetch_media_info(self, files: List[Path], max_workers: int = 8) -> None:
+        probe_func = self.probe_cache.probe if self.probe_cache is not None else probe
+        probe_func = partial(probe_func, ffprobe=self.ffprobe)
+        missing = [file for file in files if file not in self._media_info]
+        for result in probe_many(missing, max_workers=max_workers, probe_func=probe_func):
+            if result.ok:
+                self._media_info[result.path] = result.info
+            else:
+                logger.warning(f'Falha ao inspecionar {result.path.name}: {result.error}')
+
+    def _probe_duration(self, input_file: Path) -> float | None:
+        try:
+            return self.media_info(input_file).duration
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            return None
+
+    def _expected_duration(self, input_file: Path) -> float | None:
+        duration = self._probe_duration(input_file)
+        if duration is None:
+            return None
+
+        if '-ss' in self._input_options:
+            start = self._input_options[self._input_options.index('-ss') + 1]
+            duration -= parse_time(start) or 0
+
+        for options in (self._input_options, self._output_options):
+            if '-t' in options:
+                limit = parse_time(options[options.index('-t') + 1])
+                if limit is not None:
+                    duration = min(duration, limit)
+
+        return max(duration, 0.0)
+
+    def iter_progress(self, input_file: Path, output_file: Path) -> Iterator[Progress]:
+        command_list = self._progress_command(input_file, output_file)
+        parser = ProgressParser(self._expected_duration(input_file))
+
+        logger.info(f"cmd: {shlex.join(command_list)}")
+        process = subprocess.Popen(command_list, stdout=subprocess.PIPE, text=True)
+        try:
+            for line in process.stdout:
+                progress = parser.feed(line)
+                if progress is not None:
+                    yield progress
+            returncode = process.wait()
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+            process.stdout.close()
+
+        if returncode != 0:
+            logger.error(f'FFmpeg falhou com código {returncode}.')
+            raise subprocess.CalledProcessError(returncode, command_list)
+        logger.info('Comando executado com sucesso.')
+
+    def _collect_files(self) -> List[Path]:
         files = []
-        for ext in extensions:
-            files.extend(self.input_path.glob(ext))
+        for ext in self.extensions:
+            files.extend(sorted(self.input_path.glob(ext)))
+        return [file for file in files if not is_partial(file)]
+
+    def run_batch(self) -> BatchResults:
+        start = time.perf_counter()
+        files = self._collect_files()
 
         total = len(files)
         if total:
             self.output_path.mkdir(parents=True, exist_ok=True)
+            for output_path, _ in self._extra_outputs:
+                output_path.mkdir(parents=True, exist_ok=True)
 
         logger.info(f'{total} arquivos encontrados.')
 
-        for i, video_file in enumerate(files, start=1):
-            target_file = self.output_path / video_file.name
+        if self.schedule == 'longest_first' or self.memory_budget is not None:
+            self.prefetch_media_info(files, max_workers=max(8, self.max_workers))
+        order = dispatch_order(files, self.schedule, probe=self._probe_duration)
+        jobs = [
+            (i, total, files[index], self.output_path / files[index].name)
+            for i, index in enumerate(order, start=1)
+        ]
+        if self.hooks.on_plan:
+            self._emit_plan([(input_file, output_file) for _, _, input_file, output_file in jobs])
+
+        if self.max_workers == 1:
+            dispatched = [self._run_job(*job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                dispatched = list(executor.map(lambda job: self._run_job(*job), jobs))
+
+        results = [result for _, result in sorted(zip(order, dispatched), key=lambda p: p[0])]
+
+        failed = sum(1 for result in results if not result.ok)
+        skipped = sum(1 for result in results if result.skipped)
+        cached = sum(1 for result in results if result.cached)
+        logger.info(
+            f'{total - failed - skipped - cached} convertidos, {cached} do cache, '
+            f'{skipped} pulados, {failed} com erro.'
+        )
+        return BatchResults(
+            results, BatchSummary.from_results(results, time.perf_counter() - start)
+        )
+
+    def _run_job(
+        self,
+        i: int,
+        total: int,
+        input_file: Path,
+        output_file: Path
+    ) -> JobResult:
 
-            logger.info(f'--- Processando [{i}/{total}]: {video_file.name} ---')
+        logger.info(f'--- Processando [{i}/{total}]: {input_file.name} ---')
+        try:
+            return self._run_admitted(input_file, output_file, i, total)
+        except Exception as e:
+            logger.error(f'Erro ao converter {input_file.name}: {e}')
+            return JobResult(input_file, output_file, error=e)
+
+    def _emit_plan(self, jobs: List[tuple[Path, Path]]) -> None:
+        self.hooks.emit('on_plan', PlanEvent(jobs, self.schedule, self.max_workers))
+
+    def _run_hooked(
+        self,
+        input_file: Path,
+        output_file: Path,
+        i: int = 1,
+        total: int = 1
+    ) -> JobResult:
+
+        hooks = self.hooks
+        attempt = 1
+        while True:
+            if hooks.on_start:
+                passes = ()
+                if self.two_pass is None:
+                    command_list = self._build_command(input_file, output_file)
+                else:
+                    passes = self.two_pass.commands(input_file, output_file)
+                    command_list = passes[-1]
+                hooks.emit('on_start', StartEvent(
+                    input_file, output_file, command_list, i, total, attempt, passes
+                ))
             try:
-                self.run_file(video_file, target_file)
+                result = self._run_tracked(input_file, output_file)
             except Exception as e:
-                logger.error(f'Erro ao converter {video_file.name}: {e}')
+                if not hooks.on_error:
+                    raise
+                event = ErrorEvent(input_file, output_file, e, attempt)
+                hooks.emit('on_error', event)
+                if not event.retry:
+                    raise
+                logger.warning(f'Nova tentativa ({attempt + 1}) pedida por hook: {input_file.name}')
+                attempt += 1
+                continue
+
+            if hooks.on_finish:
+                hooks.emit('on_finish', FinishEvent(result, attempt))
+            return result
+
+    def _run_admitted(
+        self,
+        input_file: Path,
+        output_file: Path,
+        i: int = 1,
+        total: int = 1
+    ) -> JobResult:
+
+        if self.memory_budget is None and not self.oom_retries:
+            return self._run_hooked(input_file, output_file, i, total)
+
+        retries = self.oom_retries
+        try:
+            while True:
+                if self.memory_budget is None:
+                    reservation = nullcontext()
+                else:
+                    reservation = self.memory_budget.reserve(self.estimate_memory(input_file))
+                with reservation:
+                    try:
+                        return self._run_hooked(input_file, output_file, i, total)
+                    except subprocess.CalledProcessError as e:
+                        threads = self._job_thread_count(input_file)
+                        if retries < 1 or threads < 2 or not is_out_of_memory(e.returncode):
+                            raise
+                retries -= 1
+                self._job_threads[input_file] = threads // 2
+                logger.warning(
+                    f'Sem memória em {input_file.name}; tentando de novo com {threads // 2} threads.'
+                )
+        finally:
+            self._job_threads.pop(input_file, None)
+
+    def _cache_key(self, input_file: Path, output_file: Path) -> str:
+        placeholder = Path(f'output{output_file.suffix}')
+        args = self._job_command(Path(PIPE_INPUT), placeholder)
+        return self.output_cache.key(input_file, args, self._job_settings())
+
+    def _encode(
+        self,
+        input_file: Path,
+        output_file: Path,
+        target_file: Path
+    ) -> tuple[JobMetrics | None, bool]:
+
+        if self.output_cache is None or self._extra_outputs:
+            return self.run_file(input_file, target_file), False
+
+        # Hit e miss substituem a saída com os.replace/unlink, fora do alcance do -n.
+        self._check_overwrite(output_file)
+        metrics = []
+        key = self._cache_key(input_file, output_file)
+        hit = self.output_cache.run(
+            key, target_file, lambda path: metrics.append(self.run_file(input_file, path))
+        )
+        return (None if hit else metrics[-1]), hit
+
+    def _known_duration(self, input_file: Path) -> float | None:
+        info = self._media_info.get(input_file)
+        if info is None and self.probe_cache is not None:
+            return self._probe_duration(input_file)
+        return info.duration if info is not None else None
+
+    def _run_tracked(self, input_file: Path, output_file: Path) -> JobResult:
+        start = time.perf_counter()
+        result = self._run_journaled(input_file, output_file)
+        if not result.skipped:
+            metrics = result.metrics or JobMetrics()
+            metrics.wall_time = time.perf_counter() - start
+            metrics.measure_files(
+                input_file, [path for path, _ in self._output_targets(input_file, output_file)]
+            )
+            metrics.media_duration = self._known_duration(input_file)
+            result.metrics = metrics
+        return result
+
+    def _check_overwrite(self, output_file: Path) -> None:
+        # O encode vai para um arquivo temporário e é movido por cima da saída;
+        # o -n do ffmpeg nunca veria o arquivo existente.
+        if '-n' in self._global_options and output_file.exists():
+            raise FileExistsError(f'O arquivo de saída já existe: {output_file}')
+
+    def _run_journaled(self, input_file: Path, output_file: Path) -> JobResult:
+        if self.journal is None:
+            metrics, cached = self._encode(input_file, output_file, output_file)
+            return JobResult(input_file, output_file, cached=cached, metrics=metrics)
+
+        command_list = self._job_command(input_file, output_file)
+        settings = self._job_settings()
+        if self.journal.is_complete(input_file, output_file, command_list, settings):
+            logger.info(f'Já convertido, pulando: {input_file.name}')
+            return JobResult(input_file, output_file, skipped=True)
+
+        self._check_overwrite(output_file)
+        temp_file = partial_path(output_file)
+        temp_file.unlink(missing_ok=True)
+        self.journal.record(input_file, output_file, command_list, 'started', settings=settings)
+        try:
+            metrics, cached = self._encode(input_file, output_file, temp_file)
+            os.replace(temp_file, output_file)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            self.journal.record(input_file, output_file, command_list, 'failed', settings=settings)
+            raise
+
+        output_size = output_file.stat().st_size
+        self.journal.record(
+            input_file, output_file, command_list, 'done', output_size=output_size,
+            settings=settings
+        )
+        return JobResult(input_file, output_file, cached=cached, metrics=metrics)
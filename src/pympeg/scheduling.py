@@ -0,0 +1,59 @@
+import logging
+from pathlib import Path
+from typing import Callable, List, Sequence
+from .probe import probe_duration
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+SCHEDULES = {'glob', 'longest_first', 'largest_first'}
+
+
+def file_sizes(files: Sequence[Path]) -> List[float]:
+    sizes = []
+    for file in files:
+        try:
+            sizes.append(float(file.stat().st_size))
+        except OSError:
+            sizes.append(0.0)
+    return sizes
+
+
+def durations_or_sizes(
+    files: Sequence[Path],
+    probe: Callable[[Path], float | None] | None = None
+) -> List[float]:
+
+    probe = probe or probe_duration
+    durations = []
+    for file in files:
+        duration = probe(file)
+        if duration is None:
+            logger.warning(
+                f'Duração indisponível para {file.name}; ordenando por tamanho.'
+            )
+            return file_sizes(files)
+        durations.append(duration)
+    return durations
+
+
+def lpt_order(weights: Sequence[float]) -> List[int]:
+    return sorted(range(len(weights)), key=lambda i: weights[i], reverse=True)
+
+
+def dispatch_order(
+    files: Sequence[Path],
+    schedule: str,
+    probe: Callable[[Path], float | None] | None = None
+) -> List[int]:
+
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Invalid schedule: '{schedule}'. Valid: {SCHEDULES}")
+
+    if schedule == 'longest_first':
+        return lpt_order(durations_or_sizes(files, probe))
+    if schedule == 'largest_first':
+        return lpt_order(file_sizes(files))
+    return list(range(len(files)))
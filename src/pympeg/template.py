@@ -0,0 +1,115 @@
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List
+from .binaries import ffmpeg_binary
+from .journal import is_partial
+
+
+@dataclass(slots=True)
+class Job:
+    input_file: Path
+    output_file: Path
+    command: List[str]
+
+
+@dataclass(frozen=True, slots=True)
+class FlatOutput:
+    directory: Path
+    suffix: str | None = None
+
+    def __call__(self, input_file: Path) -> Path:
+        name = input_file.name if self.suffix is None else input_file.stem + self.suffix
+        return self.directory / name
+
+
+@dataclass(frozen=True, slots=True)
+class MirrorOutput:
+    source_root: Path
+    output_root: Path
+    suffix: str | None = None
+
+    def __call__(self, input_file: Path) -> Path:
+        relative = input_file.relative_to(self.source_root)
+        if self.suffix is not None:
+            relative = relative.with_suffix(self.suffix)
+        return self.output_root / relative
+
+
+def _matcher(patterns: Iterable[str]) -> Callable[[str], bool]:
+    patterns = tuple(patterns)
+    # '*.mp4' e afins viram um endswith, bem mais barato que fnmatch por arquivo.
+    if all(p.startswith('*.') and not any(c in p[1:] for c in '*?[') for p in patterns):
+        suffixes = tuple(p[1:] for p in patterns)
+        return lambda name: name.endswith(suffixes)
+    return lambda name: any(fnmatchcase(name, p) for p in patterns)
+
+
+def scan_files(
+    directory: str | Path,
+    patterns: Iterable[str],
+    recursive: bool = False
+) -> Iterator[Path]:
+
+    matches = _matcher(patterns)
+    pending = [os.fspath(directory)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif matches(entry.name):
+                    path = Path(entry.path)
+                    if not is_partial(path):
+                        yield path
+
+
+class JobTemplate:
+
+    def __init__(
+        self,
+        output: Callable[[Path], Path],
+        global_args: Iterable[str] = (),
+        input_args: Iterable[str] = (),
+        output_args: Iterable[str] = (),
+        binary: str | None = None
+    ) -> None:
+
+        self.output = output
+        self.prefix = (binary or ffmpeg_binary(), *global_args, *input_args, '-i')
+        self.output_args = tuple(output_args)
+
+    @classmethod
+    def from_runner(
+        cls,
+        runner,
+        output: Callable[[Path], Path] | None = None
+    ) -> 'JobTemplate':
+
+        if runner._extra_outputs:
+            raise ValueError('Templates de job não suportam múltiplas saídas.')
+        return cls(
+            output if output is not None else FlatOutput(runner.output_path),
+            runner._global_options,
+            runner._input_options,
+            [*runner._output_options, *runner._thread_args()],
+            runner.ffmpeg
+        )
+
+    def command(self, input_file: Path, output_file: Path) -> List[str]:
+        return [*self.prefix, str(input_file), *self.output_args, str(output_file)]
+
+    def jobs(self, paths: Iterable[str | os.PathLike]) -> Iterator[Job]:
+        prefix = self.prefix
+        output_args = self.output_args
+        output = self.output
+        for path in paths:
+            input_file = Path(path)
+            output_file = output(input_file)
+            yield Job(
+                input_file,
+                output_file,
+                [*prefix, str(input_file), *output_args, str(output_file)]
+            )
@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+from .fake_ffmpeg import PROFILE_ENV, load_profile, main_ffmpeg, main_ffprobe
+
+
+SCRIPT = '''#!{python}
+import os
+import sys
+# Importa o módulo direto, sem carregar o pacote pympeg inteiro a cada chamada.
+sys.path.insert(0, {module_dir!r})
+os.environ.setdefault({env!r}, {profile!r})
+from fake_ffmpeg import {entry}
+sys.exit({entry}())
+'''
+
+
+def install_fakes(directory: str | Path, profile: dict | None = None) -> tuple[Path, Path]:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profile_path = directory / 'fake-profile.json'
+    profile_path.write_text(json.dumps({'state_dir': str(directory), **(profile or {})}))
+
+    binaries = []
+    for name, entry in (('ffmpeg', 'main_ffmpeg'), ('ffprobe', 'main_ffprobe')):
+        path = directory / name
+        path.write_text(SCRIPT.format(
+            python=sys.executable,
+            module_dir=str(Path(__file__).resolve().parent),
+            env=PROFILE_ENV,
+            profile=str(profile_path),
+            entry=entry,
+        ))
+        path.chmod(0o755)
+        binaries.append(path)
+    return binaries[0], binaries[1]
+
+
+__all__ = [
+    'PROFILE_ENV',
+    'install_fakes',
+    'load_profile',
+    'main_ffmpeg',
+    'main_ffprobe',
+]
@@ -0,0 +1,384 @@
+import json
+import os
+import signal
+import sys
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, TextIO
+
+
+PROFILE_ENV = 'PYMPEG_FAKE_PROFILE'
+
+DEFAULT_PROFILE = {
+    'duration': 10.0,
+    'speed': 100.0,
+    'work': 'sleep',
+    'progress_interval': 0.05,
+    'output_size': 4096,
+    'exit_code': 0,
+    'fail_at': 0.0,
+    'fail_times': None,
+    'hang': False,
+    'hang_at': 0.0,
+    'oom_threads': None,
+    'probe_exit_code': 0,
+    'fps': 25,
+    'width': 1920,
+    'height': 1080,
+    'pixel_format': 'yuv420p',
+    'video_codec': 'h264',
+    'audio_codec': 'aac',
+    'keyframe_interval': 2.0,
+    'state_dir': None,
+    'files': {},
+}
+
+# Flags sem valor; qualquer outro '-flag' consome o argumento seguinte.
+NO_VALUE_FLAGS = {
+    '-y', '-n', '-hide_banner', '-stats', '-nostats', '-nostdin', '-vn', '-an',
+    '-sn', '-dn', '-shortest', '-re', '-copyts', '-report',
+}
+PROBE_VALUE_FLAGS = {
+    '-v', '-loglevel', '-print_format', '-of', '-select_streams', '-show_entries',
+    '-read_intervals', '-f', '-i',
+}
+PIPES = {'-', 'pipe:', 'pipe:0', 'pipe:1'}
+
+
+def load_profile(input_file: str | None = None) -> dict:
+    profile = dict(DEFAULT_PROFILE)
+    source = os.environ.get(PROFILE_ENV)
+    if source:
+        path = Path(source)
+        profile.update(json.loads(path.read_text() if path.exists() else source))
+
+    # Regras por arquivo, casadas pelo nome do input (ex.: {"*ruim*": {"exit_code": 1}}).
+    if input_file is not None:
+        name = Path(input_file).name
+        for pattern, overrides in profile['files'].items():
+            if fnmatchcase(name, pattern):
+                profile.update(overrides)
+    return profile
+
+
+def parse_args(args: List[str]) -> tuple[List[str], List[str], dict[str, str], set[str]]:
+    inputs, outputs, values, flags = [], [], {}, set()
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith('-') and arg not in PIPES:
+            if arg in NO_VALUE_FLAGS:
+                flags.add(arg)
+            elif i + 1 < len(args):
+                i += 1
+                if arg == '-i':
+                    inputs.append(args[i])
+                else:
+                    values[arg] = args[i]
+        else:
+            outputs.append(arg)
+        i += 1
+    return inputs, outputs, values, flags
+
+
+def _seconds(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        parts = [float(p) for p in value.split(':')]
+    except ValueError:
+        return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+
+def _bitrate(value: str | None) -> int | None:
+    if value is None:
+        return None
+    multiplier = {'k': 1000, 'm': 1000 ** 2}.get(value[-1:].lower(), 1)
+    try:
+        return int(float(value.rstrip('kKmM')) * multiplier)
+    except ValueError:
+        return None
+
+
+def _clock(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f'{int(hours):02d}:{int(minutes):02d}:{secs:09.6f}'
+
+
+def _failures_left(profile: dict, input_file: str) -> bool:
+    limit = profile['fail_times']
+    if limit is None:
+        return True
+    state_dir = Path(profile['state_dir'] or os.environ.get('TMPDIR', '/tmp'))
+    counter = state_dir / f'.fake-ffmpeg-{Path(input_file).name}.count'
+    count = int(counter.read_text()) if counter.exists() else 0
+    counter.write_text(str(count + 1))
+    return count < limit
+
+
+def _work(seconds: float, mode: str) -> None:
+    if mode != 'cpu':
+        time.sleep(seconds)
+        return
+    deadline = time.perf_counter() + seconds
+    x = 0
+    while time.perf_counter() < deadline:
+        x = (x * 31 + 7) % 1000003
+
+
+def _hang() -> None:
+    while True:
+        time.sleep(3600)
+
+
+class Encoder:
+
+    def __init__(self, args: List[str]) -> None:
+        self.inputs, self.outputs, self.values, self.flags = parse_args(args)
+        self.input_file = self.inputs[0] if self.inputs else None
+        self.profile = load_profile(self.input_file)
+
+        duration = float(self.profile['duration'])
+        duration -= _seconds(self.values.get('-ss')) or 0.0
+        limit = _seconds(self.values.get('-t'))
+        self.duration = max(0.0, duration if limit is None else min(duration, limit))
+
+        self.progress: TextIO | None = None
+        target = self.values.get('-progress')
+        if target in ('pipe:1', 'pipe:', '-'):
+            self.progress = sys.stdout
+        elif target is not None:
+            self.progress = open(target, 'a')
+
+        self.stats = '-nostats' not in self.flags
+        self.output_size = self._output_size()
+        self.written = 0
+        self._files = []
+
+    def _open_outputs(self) -> bool:
+        for output in self.outputs:
+            if output in PIPES or self.values.get('-f') == 'null':
+                continue
+            path = Path(output)
+            if path.exists() and '-n' in self.flags:
+                print(f"File '{output}' already exists. Exiting.", file=sys.stderr)
+                return False
+            self._files.append(open(path, 'wb'))
+        return True
+
+    def _output_size(self) -> int:
+        # Com -b:v o tamanho segue o bitrate pedido, como num encode com controle de taxa.
+        video = _bitrate(self.values.get('-b:v'))
+        if video is None:
+            return int(self.profile['output_size'])
+        audio = 0 if '-an' in self.flags else _bitrate(self.values.get('-b:a')) or 0
+        return int((video + audio) * self.duration / 8)
+
+    def _passlog(self) -> tuple[int, Path] | None:
+        number = self.values.get('-pass')
+        prefix = self.values.get('-passlogfile', 'ffmpeg2pass')
+        stats = None
+        for item in self.values.get('-x265-params', '').split(':'):
+            key, _, value = item.partition('=')
+            if key == 'pass':
+                number = value
+            elif key == 'stats':
+                stats = value
+        if number is None:
+            return None
+        return int(number), Path(stats or f'{prefix}-0.log')
+
+    def _write(self, fraction: float) -> None:
+        target = int(self.output_size * fraction)
+        chunk = b'\0' * (target - self.written)
+        for f in self._files:
+            f.write(chunk)
+            f.flush()
+        null = self.values.get('-f') == 'null'
+        if not null and any(o in PIPES for o in self.outputs) and self.progress is not sys.stdout:
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+        self.written = target
+
+    def _report(self, fraction: float, elapsed: float, done: bool) -> None:
+        out_time = self.duration * fraction
+        frame = int(out_time * self.profile['fps'])
+        fps = frame / elapsed if elapsed > 0 else 0.0
+        speed = out_time / elapsed if elapsed > 0 else 0.0
+        bitrate = self.written * 8 / out_time / 1000 if out_time > 0 else 0.0
+
+        if self.progress is not None:
+            self.progress.write(
+                f'frame={frame}\nfps={fps:.2f}\nstream_0_0_q=28.0\n'
+                f'bitrate={bitrate:.1f}kbits/s\ntotal_size={self.written}\n'
+                f'out_time_us={int(out_time * 1e6)}\nout_time_ms={int(out_time * 1e6)}\n'
+                f'out_time={_clock(out_time)}\ndup_frames=0\ndrop_frames=0\n'
+                f'speed={speed:.3g}x\nprogress={"end" if done else "continue"}\n'
+            )
+            self.progress.flush()
+
+        if self.stats:
+            sys.stderr.write(
+                f'frame={frame:5d} fps={fps:4.0f} q=28.0 size={self.written // 1024:8d}kB '
+                f'time={_clock(out_time)[:-4]} bitrate={bitrate:6.1f}kbits/s '
+                f'speed={speed:.3g}x' + ('\n' if done else '\r')
+            )
+            sys.stderr.flush()
+
+    def _out_of_memory(self) -> bool:
+        # Simula o OOM killer: acima de oom_threads (ou sem -threads) o processo morre.
+        limit = self.profile['oom_threads']
+        if limit is None:
+            return False
+        threads = int(self.values.get('-threads', 0))
+        return threads == 0 or threads > int(limit)
+
+    def run(self) -> int:
+        if self.input_file is None:
+            print('At least one input file must be specified', file=sys.stderr)
+            return 1
+        if self.input_file in PIPES:
+            for _ in iter(lambda: sys.stdin.buffer.read(1 << 16), b''):
+                pass
+        elif not Path(self.input_file).exists():
+            print(f'{self.input_file}: No such file or directory', file=sys.stderr)
+            return 1
+        if not self.outputs:
+            print('At least one output file must be specified', file=sys.stderr)
+            return 1
+        passlog = self._passlog()
+        if passlog is not None and passlog[0] == 2 and not passlog[1].exists():
+            print(f'ratecontrol_init: can\'t open stats file {passlog[1]}', file=sys.stderr)
+            return 1
+        if not self._open_outputs():
+            return 1
+
+        profile = self.profile
+        if self._out_of_memory():
+            os.kill(os.getpid(), signal.SIGKILL)
+        exit_code = int(profile['exit_code'])
+        failing = exit_code != 0 and _failures_left(profile, self.input_file)
+        wall = self.duration / max(float(profile['speed']), 1e-9)
+        interval = max(float(profile['progress_interval']), 1e-3)
+        stop_at = min(
+            float(profile['fail_at']) if failing else 1.0,
+            float(profile['hang_at']) if profile['hang'] else 1.0,
+        )
+
+        start = time.perf_counter()
+        fraction = 0.0
+        try:
+            while fraction < stop_at:
+                step = min(interval / wall if wall > 0 else 1.0, stop_at - fraction)
+                _work(step * wall, profile['work'])
+                fraction = min(stop_at, fraction + step)
+                self._write(fraction)
+                self._report(fraction, time.perf_counter() - start, fraction >= 1.0)
+
+            if profile['hang'] and fraction >= float(profile['hang_at']):
+                _hang()
+            if failing:
+                print(f'\nConversion failed! (fake exit {exit_code})', file=sys.stderr)
+                return exit_code
+            if fraction < 1.0 or self.duration == 0:
+                self._write(1.0)
+                self._report(1.0, time.perf_counter() - start, True)
+            if passlog is not None and passlog[0] == 1:
+                passlog[1].write_text(f'# fake stats for {self.input_file}\n')
+            return 0
+        finally:
+            for f in self._files:
+                f.close()
+            if self.progress is not None and self.progress is not sys.stdout:
+                self.progress.close()
+
+
+def _probe_json(input_file: str, profile: dict) -> dict:
+    duration = float(profile['duration'])
+    streams = [{
+        'index': 0,
+        'codec_type': 'video',
+        'codec_name': profile['video_codec'],
+        'width': profile['width'],
+        'height': profile['height'],
+        'pix_fmt': profile['pixel_format'],
+        'avg_frame_rate': f"{profile['fps']}/1",
+        'r_frame_rate': f"{profile['fps']}/1",
+        'duration': f'{duration:.6f}',
+    }]
+    if profile['audio_codec']:
+        streams.append({
+            'index': 1,
+            'codec_type': 'audio',
+            'codec_name': profile['audio_codec'],
+            'sample_rate': '48000',
+            'channels': 2,
+            'duration': f'{duration:.6f}',
+        })
+    size = Path(input_file).stat().st_size
+    return {
+        'streams': streams,
+        'format': {
+            'filename': input_file,
+            'format_name': 'mov,mp4,m4a,3gp,3g2,mj2',
+            'duration': f'{duration:.6f}',
+            'size': str(size),
+            'bit_rate': str(int(size * 8 / duration)) if duration > 0 else '0',
+        },
+    }
+
+
+def _probe_packets(profile: dict) -> str:
+    fps = profile['fps']
+    every = max(1, round(float(profile['keyframe_interval']) * fps))
+    lines = []
+    for frame in range(int(float(profile['duration']) * fps)):
+        flags = 'K__' if frame % every == 0 else '___'
+        lines.append(f'{frame / fps:.6f},{flags}')
+    return '\n'.join(lines) + '\n'
+
+
+def main_ffprobe(argv: List[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    positional = [
+        arg for i, arg in enumerate(args)
+        if (arg in PIPES or not arg.startswith('-'))
+        and (i == 0 or args[i - 1] not in PROBE_VALUE_FLAGS or args[i - 1] == '-i')
+    ]
+    if not positional:
+        print('You have to specify one input file.', file=sys.stderr)
+        return 1
+
+    input_file = positional[-1]
+    profile = load_profile(input_file)
+    if not Path(input_file).exists():
+        print(f'{input_file}: No such file or directory', file=sys.stderr)
+        return 1
+    if int(profile['probe_exit_code']):
+        print(f'{input_file}: Invalid data found when processing input', file=sys.stderr)
+        return int(profile['probe_exit_code'])
+
+    entries = args[args.index('-show_entries') + 1] if '-show_entries' in args else ''
+    if entries.startswith('packet'):
+        sys.stdout.write(_probe_packets(profile))
+    else:
+        json.dump(_probe_json(input_file, profile), sys.stdout, indent=2)
+    return 0
+
+
+def main_ffmpeg(argv: List[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if '-version' in args:
+        print('ffmpeg version fake-pympeg')
+        return 0
+    return Encoder(args).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main_ffprobe() if Path(sys.argv[0]).name.startswith('ffprobe') else main_ffmpeg())
@@ -0,0 +1,215 @@
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import List
+from .constants import VIDEO_PRESETS
+from .metrics import JobMetrics
+from .progress import PROGRESS_ARGS
+from .runner import Runner
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# Fração do arquivo gasta com o container (cabeçalhos, índices, intercalação).
+DEFAULT_MUX_OVERHEAD = 0.02
+# Bitrate que o encoder de áudio padrão do ffmpeg (aac) usa sem -b:a.
+DEFAULT_AUDIO_BITRATE = 128_000
+MIN_VIDEO_BITRATE = 16_000
+
+SIZE_UNITS = {
+    'k': 1000, 'm': 1000 ** 2, 'g': 1000 ** 3,
+    'kb': 1000, 'mb': 1000 ** 2, 'gb': 1000 ** 3,
+    'kib': 1024, 'mib': 1024 ** 2, 'gib': 1024 ** 3,
+}
+
+# Opções que o modo de tamanho alvo controla sozinho.
+RATE_CONTROL_FLAGS = ('-b:v', '-crf', '-qscale:v', '-pass', '-passlogfile')
+X265_CODECS = ('libx265', 'hevc')
+
+
+def parse_file_size(value: int | str) -> int:
+    if isinstance(value, int):
+        if value <= 0:
+            raise ValueError('O tamanho alvo deve ser positivo.')
+        return value
+
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([kmg](?:i?b)?)?', value.strip().lower())
+    if match is None:
+        raise ValueError(f"Tamanho inválido: '{value}'")
+    number, unit = match.groups()
+    size = int(float(number) * (SIZE_UNITS[unit] if unit else 1))
+    if size <= 0:
+        raise ValueError(f"Tamanho inválido: '{value}'")
+    return size
+
+
+def target_video_bitrate(
+    target_size: int,
+    duration: float,
+    audio_bitrate: int = 0,
+    overhead: float = DEFAULT_MUX_OVERHEAD
+) -> int:
+
+    if duration <= 0:
+        raise ValueError('A duração deve ser positiva.')
+    total = target_size * 8 * (1 - overhead) / duration
+    video = int(total - audio_bitrate)
+    if video < MIN_VIDEO_BITRATE:
+        raise ValueError(
+            f'Tamanho alvo pequeno demais: sobram {max(video, 0)} bps para o vídeo '
+            f'em {duration:.1f}s de mídia.'
+        )
+    return video
+
+
+def _strip(args: List[str], flags: tuple[str, ...]) -> List[str]:
+    stripped = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in flags:
+            skip = True
+        else:
+            stripped.append(arg)
+    return stripped
+
+
+def _value(args: List[str], flag: str) -> str | None:
+    if flag not in args:
+        return None
+    return args[args.index(flag) + 1]
+
+
+class TwoPassEncoder:
+
+    def __init__(
+        self,
+        runner: Runner,
+        target_size: int | str,
+        first_pass_preset: str | None = None,
+        overhead: float = DEFAULT_MUX_OVERHEAD
+    ) -> None:
+
+        if first_pass_preset is not None and first_pass_preset not in VIDEO_PRESETS:
+            raise ValueError(f'Preset inválido: {first_pass_preset}')
+        if not 0 <= overhead < 1:
+            raise ValueError('overhead deve estar em [0, 1)')
+
+        self.runner = runner
+        self.target_size = parse_file_size(target_size)
+        self.first_pass_preset = first_pass_preset
+        self.overhead = overhead
+
+    def settings(self) -> dict:
+        # Entra na identidade do job (journal e cache) ao lado do comando.
+        return {
+            'target_size': self.target_size,
+            'mux_overhead': self.overhead,
+            'first_pass_preset': self.first_pass_preset,
+        }
+
+    @staticmethod
+    def passlog_path(output_file: Path) -> Path:
+        # Um diretório por saída: jobs em paralelo não se sobrescrevem, e os
+        # comandos já são conhecidos antes de rodar (para o hook on_start).
+        return output_file.with_name(f'.pympeg-pass-{output_file.stem}') / 'passlog'
+
+    def audio_bitrate(self, input_file: Path) -> int:
+        options = self.runner._output_options
+        if '-an' in options:
+            return 0
+        bitrate = _value(options, '-b:a')
+        if bitrate is not None:
+            return int(bitrate)
+
+        info = self.runner.media_info(input_file)
+        if not info.has_audio:
+            return 0
+        if _value(options, '-c:a') == 'copy':
+            return info.audio.bit_rate or DEFAULT_AUDIO_BITRATE
+        return DEFAULT_AUDIO_BITRATE
+
+    def video_bitrate(self, input_file: Path) -> int:
+        duration = self.runner._expected_duration(input_file)
+        if not duration:
+            raise ValueError(f'Não foi possível obter a duração de {input_file.name}.')
+        return target_video_bitrate(
+            self.target_size, duration, self.audio_bitrate(input_file), self.overhead
+        )
+
+    def pass_commands(
+        self,
+        input_file: Path,
+        output_file: Path,
+        passlog: Path,
+        bitrate: int
+    ) -> tuple[List[str], List[str]]:
+
+        runner = self.runner
+        options = _strip(runner._output_options, RATE_CONTROL_FLAGS)
+        threads = runner._thread_args(runner._output_options, runner._job_threads.get(input_file))
+        head = [runner.ffmpeg, *runner._global_options, *runner._input_options]
+        head.extend(['-i', str(input_file)])
+
+        commands = []
+        for number in (1, 2):
+            args = list(options)
+            if number == 1:
+                args = _strip(args, ('-f',))
+                if self.first_pass_preset is not None:
+                    args = _strip(args, ('-preset',)) + ['-preset', self.first_pass_preset]
+
+            if _value(args, '-c:v') in X265_CODECS:
+                # O libx265 ignora -pass/-passlogfile; o controle vai pelo -x265-params.
+                stats = f'pass={number}:stats={passlog}.log'
+                params = _value(args, '-x265-params')
+                args = _strip(args, ('-x265-params',))
+                pass_args = ['-x265-params', f'{params}:{stats}' if params else stats]
+            else:
+                pass_args = ['-pass', str(number), '-passlogfile', str(passlog)]
+
+            cmd = [*head, *args, *threads, '-b:v', str(bitrate), *pass_args]
+            if number == 1:
+                # Primeira passada só coleta estatísticas: sem áudio, sem arquivo.
+                cmd.extend(['-an', '-f', 'null', '-'])
+            else:
+                cmd.append(str(output_file))
+            commands.append(cmd)
+        return commands[0], commands[1]
+
+    def commands(self, input_file: Path, output_file: Path) -> tuple[List[str], List[str]]:
+        return self.pass_commands(
+            input_file, output_file, self.passlog_path(output_file), self.video_bitrate(input_file)
+        )
+
+    def run(self, input_file: Path, output_file: Path) -> JobMetrics:
+        runner = self.runner
+        if runner._extra_outputs:
+            raise ValueError('O modo de tamanho alvo não suporta múltiplas saídas.')
+
+        bitrate = self.video_bitrate(input_file)
+        logger.info(f'{input_file.name}: alvo de {self.target_size} bytes, vídeo a {bitrate} bps.')
+
+        passlog = self.passlog_path(output_file)
+        passlog.parent.mkdir(exist_ok=True)
+        try:
+            first, second = self.pass_commands(input_file, output_file, passlog, bitrate)
+            metrics = runner._execute(first, input_file, output_file)
+
+            track = runner._tracks_progress()
+            if track:
+                second[1:1] = PROGRESS_ARGS
+            final = runner._execute(second, input_file, output_file, track_progress=track)
+        finally:
+            shutil.rmtree(passlog.parent, ignore_errors=True)
+
+        return JobMetrics(
+            metrics.wall_time + final.wall_time,
+            metrics.user_time + final.user_time,
+            metrics.system_time + final.system_time,
+            max(metrics.max_rss, final.max_rss),
+        )
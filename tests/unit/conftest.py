@@ -0,0 +1,38 @@
+import pytest
+from pympeg import Runner
+from pympeg.testing import install_fakes
+
+
+# ===========================================================================
+# FIXTURES: FFMPEG FALSO
+# ===========================================================================
+@pytest.fixture
+def fake_profile():
+    # Padrões do ffmpeg falso; um módulo sobrescreve esta fixture para trocá-los.
+    return {'duration': 2.0, 'speed': 200.0}
+
+
+@pytest.fixture
+def fakes(tmp_path, fake_profile):
+    def install(**profile):
+        return install_fakes(tmp_path / 'bin', {**fake_profile, **profile})
+    return install
+
+
+@pytest.fixture
+def videos(tmp_path):
+    source = tmp_path / 'in'
+    source.mkdir()
+    for name in ('a.mp4', 'b.mp4', 'ruim.mp4'):
+        (source / name).write_bytes(b'video')
+    return source
+
+
+@pytest.fixture
+def runner_for(fakes):
+    def build(input_path, output_path, **profile):
+        ffmpeg, ffprobe = fakes(**profile)
+        runner = Runner(input_path, output_path)
+        runner.ffmpeg, runner.ffprobe = str(ffmpeg), str(ffprobe)
+        return runner
+    return build
@@ -0,0 +1,139 @@
+import pickle
+import pytest
+from pympeg import GlobalOptions, OutputAudioOptions, OutputVideoOptions, Runner
+from pympeg.interfaces import FrozenOptions
+
+
+@pytest.fixture
+def frozen():
+    return OutputVideoOptions.Frozen(
+        codec='libx264', crf=23, bitrate='2.5m', metadata={'title': 'aula'}
+    )
+
+
+# ===========================================================================
+# TESTES: VARIANTE IMUTÁVEL
+# ===========================================================================
+def test_every_options_class_has_a_frozen_variant():
+    for cls in (GlobalOptions, OutputAudioOptions, OutputVideoOptions):
+        assert issubclass(cls.Frozen, FrozenOptions)
+        assert cls.Frozen.__qualname__ == f'{cls.__qualname__}.Frozen'
+
+
+def test_frozen_is_slotted(frozen):
+    assert not hasattr(frozen, '__dict__')
+
+
+def test_frozen_stores_only_set_options(frozen):
+    assert len(frozen._set) == 4
+    assert frozen.preset is None
+    assert frozen.replace(crf=28)._layout is frozen._layout
+
+
+def test_frozen_validates_like_mutable(frozen):
+    assert frozen.bitrate == 2500000
+    with pytest.raises(ValueError):
+        OutputVideoOptions.Frozen(crf=99)
+    with pytest.raises(AttributeError, match='Opção inválida'):
+        OutputVideoOptions.Frozen(invalid=1)
+
+
+def test_frozen_rejects_mutation(frozen):
+    with pytest.raises(AttributeError, match='immutable'):
+        frozen.crf = 28
+    with pytest.raises(AttributeError):
+        del frozen.crf
+    with pytest.raises(TypeError):
+        frozen.metadata['title'] = 'outra'
+
+
+def test_frozen_generates_same_args_as_mutable(frozen):
+    assert frozen.generate_command_args() == frozen.thaw().generate_command_args()
+    assert frozen.generate_command_args() == [
+        '-c:v', 'libx264', '-b:v', '2500000', '-crf', '23', '-metadata', 'title=aula'
+    ]
+
+
+def test_freeze_and_thaw_round_trip():
+    opts = OutputVideoOptions(codec='libx264', crf=23)
+    assert opts.freeze() == OutputVideoOptions.Frozen(codec='libx264', crf=23)
+    assert opts.freeze().thaw().generate_command_args() == opts.generate_command_args()
+
+
+def test_freeze_copies_and_freezes_metadata(frozen):
+    opts = OutputVideoOptions(codec='libx264', crf=23, bitrate='2.5m', metadata={'title': 'aula'})
+    copy = opts.freeze()
+    opts.metadata['title'] = 'outra'
+
+    assert copy.metadata == {'title': 'aula'}
+    assert copy == frozen
+    assert hash(copy) == hash(frozen)
+    with pytest.raises(TypeError):
+        copy.metadata['title'] = 'x'
+
+
+# ===========================================================================
+# TESTES: HASH E IGUALDADE
+# ===========================================================================
+def test_equal_values_hash_equal(frozen):
+    other = OutputVideoOptions.Frozen(
+        metadata={'title': 'aula'}, crf=23, bitrate=2500000, codec='libx264'
+    )
+    assert frozen == other
+    assert hash(frozen) == hash(other)
+    assert len({frozen, other}) == 1
+
+
+def test_metadata_order_does_not_change_hash():
+    first = OutputAudioOptions(metadata={'a': '1', 'b': '2'}).freeze()
+    second = OutputAudioOptions(metadata={'b': '2', 'a': '1'}).freeze()
+    assert first == second
+    assert hash(first) == hash(second)
+
+
+def test_different_classes_are_not_equal():
+    assert OutputVideoOptions.Frozen() != OutputAudioOptions.Frozen()
+
+
+# ===========================================================================
+# TESTES: REPLACE
+# ===========================================================================
+def test_replace_returns_new_instance(frozen):
+    changed = frozen.replace(crf=28, preset='fast')
+    assert changed.crf == 28
+    assert changed.preset == 'fast'
+    assert changed.codec == 'libx264'
+    assert frozen.crf == 23
+
+
+def test_replace_with_none_clears_option(frozen):
+    assert frozen.replace(crf=None).crf is None
+
+
+def test_replace_validates_only_changes(frozen):
+    with pytest.raises(ValueError):
+        frozen.replace(crf=-1)
+    with pytest.raises(AttributeError, match='Opção inválida'):
+        frozen.replace(invalid=1)
+
+
+# ===========================================================================
+# TESTES: PICKLE
+# ===========================================================================
+def test_pickle_round_trip(frozen):
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert restored == frozen
+    assert hash(restored) == hash(frozen)
+
+
+def test_pickle_state_is_compact_tuple(frozen):
+    state = frozen.__getstate__()
+    assert isinstance(state, tuple)
+    assert state[-1] == {'title': 'aula'}
+    assert OutputVideoOptions.Frozen().__getstate__() == ()
+
+
+def test_runner_accepts_frozen_options(frozen):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_output_options(frozen)
+    assert runner._output_options == frozen.generate_command_args()
@@ -0,0 +1,51 @@
+from pympeg import OutputVideoOptions
+from pympeg.interfaces import Options
+from pympeg.descriptors import BaseOption, BoolOption, IntOption
+
+
+class BaseTestOptions(Options):
+    first = BaseOption(flag='-first')
+    second = IntOption(flag='-second', min_val=0)
+
+
+class ChildTestOptions(BaseTestOptions):
+    third = BoolOption(true_flag='-third')
+    first = BaseOption(flag='-override')
+
+
+class HiddenTestOptions(BaseTestOptions):
+    second = None
+
+
+# ===========================================================================
+# TESTES: SCHEMA COMPILADO
+# ===========================================================================
+def test_schema_is_compiled_at_class_creation():
+    assert [name for name, _ in OutputVideoOptions._schema][:3] == ['format', 'codec', 'bitrate']
+    assert all(isinstance(option, BaseOption) for _, option in OutputVideoOptions._schema)
+
+
+def test_schema_includes_inherited_options():
+    opts = ChildTestOptions(first='a', second=2, third=True)
+    assert opts.generate_command_args() == ['-override', 'a', '-second', '2', '-third']
+
+
+def test_subclass_override_keeps_base_position():
+    assert [name for name, _ in ChildTestOptions._schema] == ['first', 'second', 'third']
+    assert ChildTestOptions._schema[0][1].flag == '-override'
+
+
+def test_plain_attribute_hides_inherited_option():
+    assert [name for name, _ in HiddenTestOptions._schema] == ['first']
+
+
+def test_base_schema_is_not_changed_by_subclass():
+    assert [name for name, _ in BaseTestOptions._schema] == ['first', 'second']
+    opts = BaseTestOptions(first='a')
+    assert opts.generate_command_args() == ['-first', 'a']
+
+
+def test_cleared_option_is_skipped():
+    opts = OutputVideoOptions(crf=23, preset='fast')
+    opts.crf = None
+    assert opts.generate_command_args() == ['-preset', 'fast']
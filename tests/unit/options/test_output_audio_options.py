@@ -36,6 +36,9 @@ VALID_AUDIO_OUT_OPTIONS = [
 
     ('metadata',     {'title': 'Song'}, {'title': 'Song'}, ['-metadata', 'title=Song']),
     ('metadata',     {'a': '1', 'b': '2'}, {'a': '1', 'b': '2'}, ['-metadata', 'a=1', '-metadata', 'b=2']),
+
+    ('no_video',     True,            True,            ['-vn']),
+    ('no_video',     False,           False,           []),
 ]
 
 # Structure: (atributo, valor_invalido, tipo_excecao)
@@ -61,6 +64,8 @@ INVALID_AUDIO_OUT_OPTIONS = [
     
     ('metadata',     'not a dict',    TypeError),
     ('metadata',     123,             TypeError),
+
+    ('no_video',     'yes',           TypeError),
 ]
 
 
@@ -63,6 +63,10 @@ VALID_VIDEO_OUT_OPTIONS = [
     # tune
     ('tune',         'film',          'film',          ['-tune', 'film']),
     ('tune',         'animation',     'animation',     ['-tune', 'animation']),
+
+    # threads
+    ('threads',      0,               0,               ['-threads', '0']),
+    ('threads',      8,               8,               ['-threads', '8']),
 ]
 
 # Estrutura: (atributo, valor_invalido, tipo_excecao)
@@ -84,6 +88,8 @@ INVALID_VIDEO_OUT_OPTIONS = [
     ('metadata',     'not a dict',    TypeError),
     ('movflags',     'invalid',       ValueError),
     ('tune',         'invalid',       ValueError),
+    ('threads',      -1,              ValueError),
+    ('threads',      '4',             TypeError),
 ]
 
 
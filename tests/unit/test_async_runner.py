@@ -0,0 +1,180 @@
+import asyncio
+import sys
+import pytest
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from pympeg import AsyncRunner, Builder, JobJournal, MemoryBudget, OutputCache, Runner
+from pympeg.options import GlobalOptions, InputVideoOptions, OutputVideoOptions
+
+
+def _python_command(code):
+    def build(input_file, output_file):
+        return [sys.executable, '-c', code, str(input_file), str(output_file)]
+    return build
+
+
+# ===========================================================================
+# COMANDO
+# ===========================================================================
+def test_from_runner_produces_same_command():
+    runner = Runner('in.mp4', 'out.mkv', max_workers=2, threads_per_job=3)
+    runner.add_global_options(GlobalOptions(overwrite=True))
+    runner.add_input_options(InputVideoOptions(start_time=10))
+    runner.add_output_options(OutputVideoOptions(codec='libx264'))
+
+    async_runner = AsyncRunner.from_runner(runner)
+
+    args = (Path('a.mp4'), Path('b.mp4'))
+    assert async_runner._build_command(*args) == runner._build_command(*args)
+    assert async_runner.max_workers == 2
+
+
+@pytest.mark.parametrize('configure', [
+    lambda runner, tmp: setattr(runner, 'journal', JobJournal(tmp / 'journal.jsonl')),
+    lambda runner, tmp: setattr(runner, 'output_cache', OutputCache(tmp / 'outputs')),
+    lambda runner, tmp: setattr(runner, 'memory_budget', MemoryBudget(1024 ** 3)),
+    lambda runner, tmp: setattr(runner, 'memory_limit', 1024 ** 3),
+    lambda runner, tmp: setattr(runner, 'oom_retries', 1),
+], ids=['journal', 'output_cache', 'memory_budget', 'memory_limit', 'oom_retries'])
+def test_unsupported_features_are_rejected(configure, tmp_path):
+    runner = Runner('in.mp4', 'out.mp4')
+    configure(runner, tmp_path)
+    with pytest.raises(ValueError):
+        AsyncRunner.from_runner(runner)
+
+    async_runner = AsyncRunner('in.mp4', 'out.mp4')
+    configure(async_runner, tmp_path)
+    with pytest.raises(ValueError):
+        asyncio.run(async_runner.gather([('in.mp4', 'out.mp4')]))
+    if runner.output_cache is not None:
+        runner.output_cache.close()
+        async_runner.output_cache.close()
+
+
+# ===========================================================================
+# EXECUÇÃO
+# ===========================================================================
+def test_run_file_success(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    runner._build_command = _python_command(
+        'import sys; open(sys.argv[2], "w").write("ok")'
+    )
+    out = tmp_path / 'out.mp4'
+
+    asyncio.run(runner.run_file(tmp_path / 'in.mp4', out))
+
+    assert out.read_text() == 'ok'
+
+
+def test_run_file_raises_on_failure(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    runner._build_command = _python_command('raise SystemExit(3)')
+
+    with pytest.raises(CalledProcessError) as excinfo:
+        asyncio.run(runner.run_file(tmp_path / 'in.mp4', tmp_path / 'out.mp4'))
+    assert excinfo.value.returncode == 3
+
+
+def test_cancel_terminates_child_and_removes_partial_output(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    runner._build_command = _python_command(
+        'import sys, time; open(sys.argv[2], "w").write("partial"); '
+        'time.sleep(30)'
+    )
+    out = tmp_path / 'out.mp4'
+
+    async def scenario():
+        task = asyncio.create_task(runner.run_file(tmp_path / 'in.mp4', out))
+        while not out.exists():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+    assert not out.exists()
+
+
+def test_failing_progress_callback_terminates_child(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    runner._progress_command = _python_command(
+        'import sys, time; open(sys.argv[2], "w").write("partial"); '
+        'sys.stdout.write("frame=10\\nprogress=continue\\n"); sys.stdout.flush(); '
+        'time.sleep(30)'
+    )
+    runner._expected_duration = lambda input_file: None
+    out = tmp_path / 'out.mp4'
+
+    def fail(progress):
+        raise RuntimeError('callback quebrado')
+
+    runner.on_progress = fail
+    processes = []
+    spawn = asyncio.create_subprocess_exec
+
+    async def spy(*args, **kwargs):
+        processes.append(await spawn(*args, **kwargs))
+        return processes[-1]
+
+    with patch('pympeg.async_runner.asyncio.create_subprocess_exec', spy):
+        with pytest.raises(RuntimeError):
+            asyncio.run(asyncio.wait_for(runner.run_file(tmp_path / 'in.mp4', out), timeout=10))
+
+    assert processes[0].returncode is not None
+    assert not out.exists()
+
+
+def test_run_file_reports_progress(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    runner._progress_command = _python_command(
+        'import sys; sys.stdout.write("frame=10\\nprogress=continue\\n'
+        'frame=20\\nprogress=end\\n")'
+    )
+    runner._expected_duration = lambda input_file: None
+    events = []
+    runner.on_progress = events.append
+
+    asyncio.run(runner.run_file(tmp_path / 'in.mp4', tmp_path / 'out.mp4'))
+
+    assert [(e.frame, e.done) for e in events] == [(10, False), (20, True)]
+
+
+# ===========================================================================
+# GATHER
+# ===========================================================================
+def test_gather_limits_concurrency_and_keeps_order(tmp_path):
+    runner = AsyncRunner('in', 'out')
+    running = 0
+    peak = 0
+
+    async def fake_run_file(input_file, output_file):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if input_file.name == 'b.mp4':
+            raise RuntimeError('boom')
+
+    runner.run_file = fake_run_file
+    jobs = [(tmp_path / n, tmp_path / 'o' / n) for n in ['a.mp4', 'b.mp4', 'c.mp4', 'd.mp4']]
+
+    results = asyncio.run(runner.gather(jobs, limit=2))
+
+    assert peak == 2
+    assert [r.input_file.name for r in results] == ['a.mp4', 'b.mp4', 'c.mp4', 'd.mp4']
+    assert [r.ok for r in results] == [True, False, True, True]
+
+
+def test_builder_run_async_uses_async_runner():
+    builder = Builder('in.mp4', 'out.mp4')
+
+    async def fake_run(self):
+        return self
+
+    with patch.object(AsyncRunner, 'run', fake_run):
+        async_runner = asyncio.run(builder.run_async())
+
+    assert isinstance(async_runner, AsyncRunner)
+    assert async_runner.input_path == Path('in.mp4')
@@ -0,0 +1,86 @@
+import sys
+import pytest
+from subprocess import CalledProcessError
+from pympeg.audio import AudioReader
+from pympeg.options import InputAudioOptions
+
+np = pytest.importorskip('numpy')
+
+
+def _pcm(samples, dtype, exit_code=0):
+    code = (
+        'import sys\n'
+        f'sys.stdout.buffer.write({samples.astype(dtype).tobytes()!r})\n'
+        f'raise SystemExit({exit_code})\n'
+    )
+    return [sys.executable, '-c', code]
+
+
+# ===========================================================================
+# COMANDO
+# ===========================================================================
+def test_command_decodes_to_pcm_pipe():
+    reader = AudioReader(
+        'aula.mp4', sample_rate='16k', n_channels=1, sample_format='f32le',
+        input_options=InputAudioOptions(start_time=60)
+    )
+    assert reader.command() == [
+        'ffmpeg', '-ss', '60.000', '-i', 'aula.mp4',
+        '-f', 'f32le', '-c:a', 'pcm_f32le', '-ar', '16000', '-ac', '1', '-vn',
+        'pipe:1'
+    ]
+    assert reader.sample_rate == 16000
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'sample_format': 'mp3'},
+    {'sample_rate': -1},
+    {'n_channels': 0},
+    {'chunk_frames': 0},
+])
+def test_invalid_arguments(kwargs):
+    params = {'sample_rate': 16000, **kwargs}
+    with pytest.raises((ValueError, TypeError)):
+        AudioReader('aula.mp4', **params)
+
+
+# ===========================================================================
+# LEITURA
+# ===========================================================================
+def test_yields_fixed_size_chunks_with_short_tail():
+    samples = np.arange(10 * 2).reshape(10, 2)
+    reader = AudioReader('aula.mp4', sample_rate=8000, n_channels=2, chunk_frames=4)
+    reader.command = lambda: _pcm(samples, '<i2')
+
+    chunks = list(reader)
+
+    assert [c.shape for c in chunks] == [(4, 2), (4, 2), (2, 2)]
+    assert chunks[0].dtype == np.dtype('<i2')
+    np.testing.assert_array_equal(np.concatenate(chunks), samples)
+
+
+def test_float_samples_and_buffer_reuse():
+    samples = np.linspace(-1, 1, 12, dtype=np.float32).reshape(12, 1)
+    reader = AudioReader(
+        'aula.mp4', sample_rate=8000, sample_format='f32le',
+        chunk_frames=3, reuse_buffer=True
+    )
+    reader.command = lambda: _pcm(samples, '<f4')
+
+    seen = []
+    chunk_ids = []
+    for chunk in reader:
+        chunk_ids.append(id(chunk))
+        seen.append(chunk.copy())
+
+    assert len(seen) == 4
+    assert len(set(chunk_ids)) == 1
+    np.testing.assert_array_equal(np.concatenate(seen), samples)
+
+
+def test_failure_raises():
+    reader = AudioReader('aula.mp4', sample_rate=8000)
+    reader.command = lambda: _pcm(np.zeros(4), '<i2', exit_code=1)
+
+    with pytest.raises(CalledProcessError):
+        list(reader)
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import patch
 from pympeg import (
     Builder, GlobalOptions, InputVideoOptions, InputAudioOptions,
-    OutputVideoOptions
+    OutputVideoOptions, OutputAudioOptions
 )
 
 
@@ -93,6 +93,82 @@ def test_with_output_options_invalid_type(builder):
     assert "Expected output options" in str(excinfo.value)
 
 
+def test_with_output_adds_extra_output(builder, mock_runner):
+    v_opts = OutputVideoOptions(size='hd720')
+    a_opts = OutputAudioOptions(codec='aac')
+    assert builder.with_output('720.mp4', v_opts, a_opts) is builder
+    mock_runner.add_output.assert_called_once_with('720.mp4', v_opts, a_opts)
+
+
+def test_with_output_invalid_type(builder):
+    with pytest.raises(TypeError) as excinfo:
+        builder.with_output('720.mp4', InputVideoOptions())
+    assert "Expected output options" in str(excinfo.value)
+
+
+# ===========================================================================
+# TESTES: PARALELISMO
+# ===========================================================================
+def test_with_max_workers_configures_runner(builder, mock_runner):
+    assert builder.with_max_workers(4, threads_per_job=2) is builder
+    assert mock_runner.max_workers == 4
+    assert mock_runner.threads_per_job == 2
+
+
+def test_with_max_workers_invalid(builder):
+    with pytest.raises(ValueError):
+        builder.with_max_workers(0)
+
+
+def test_with_schedule(builder, mock_runner):
+    assert builder.with_schedule('longest_first') is builder
+    assert mock_runner.schedule == 'longest_first'
+
+    with pytest.raises(ValueError):
+        builder.with_schedule('random')
+
+
+def test_run_chunked_passes_max_workers(builder, mock_runner):
+    with patch('pympeg.builder.ChunkedEncoder') as MockEncoder:
+        builder.run_chunked(chunks=8, max_workers=4)
+    MockEncoder.assert_called_once_with(mock_runner, chunks=8, max_workers=4)
+    MockEncoder.return_value.run.assert_called_once_with(
+        mock_runner.input_path, mock_runner.output_path
+    )
+
+
+def test_with_journal_accepts_path(builder, mock_runner, tmp_path):
+    from pympeg import JobJournal
+    assert builder.with_journal(tmp_path / 'journal.jsonl') is builder
+    assert isinstance(mock_runner.journal, JobJournal)
+
+
+def test_with_output_cache_accepts_path(builder, mock_runner, tmp_path):
+    from pympeg import OutputCache
+    assert builder.with_output_cache(tmp_path / 'outputs') is builder
+    assert isinstance(mock_runner.output_cache, OutputCache)
+    mock_runner.output_cache.close()
+
+
+# ===========================================================================
+# TESTES: PROGRESSO
+# ===========================================================================
+def test_with_progress_sets_callback(builder, mock_runner):
+    callback = lambda progress: None
+    assert builder.with_progress(callback) is builder
+    assert mock_runner.on_progress is callback
+
+
+def test_with_progress_invalid_type(builder):
+    with pytest.raises(TypeError):
+        builder.with_progress('not callable')
+
+
+def test_media_info_uses_runner_cache(builder, mock_runner):
+    builder.media_info()
+    mock_runner.media_info.assert_called_once_with(mock_runner.input_path)
+
+
 # ===========================================================================
 # TESTE DE INTEGRAÇÃO (FLUXO COMPLETO MOCKADO)
 # ===========================================================================
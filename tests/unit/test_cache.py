@@ -0,0 +1,118 @@
+import os
+import pytest
+from unittest.mock import patch
+from pympeg.cache import ProbeCache, default_cache_dir, file_key
+
+
+FFPROBE_JSON = {
+    'streams': [{'index': 0, 'codec_type': 'video', 'avg_frame_rate': '25/1'}],
+    'format': {'duration': '12.5'}
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ProbeCache(tmp_path / 'cache' / 'probe.sqlite', max_entries=10) as cache:
+        yield cache
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / 'aula.mp4'
+    path.write_bytes(b'video')
+    return path
+
+
+# ===========================================================================
+# CHAVE
+# ===========================================================================
+def test_file_key_changes_with_content(video):
+    before = file_key(video)
+    video.write_bytes(b'another video')
+    os.utime(video, ns=(before[2] + 10**9, before[2] + 10**9))
+
+    after = file_key(video)
+    assert before[0] == after[0] == str(video.resolve())
+    assert before != after
+
+
+def test_default_cache_dir_honours_xdg(monkeypatch, tmp_path):
+    monkeypatch.setattr('sys.platform', 'linux')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert default_cache_dir() == tmp_path / 'pympeg'
+
+
+# ===========================================================================
+# CACHE
+# ===========================================================================
+@patch('pympeg.cache.probe_json', return_value=FFPROBE_JSON)
+def test_probe_is_cached_across_instances(mock_probe, cache, video):
+    info = cache.probe(video)
+    assert info.duration == 12.5
+    assert cache.probe(video).fps == 25
+
+    with ProbeCache(cache.path) as other:
+        assert other.probe(video).duration == 12.5
+
+    mock_probe.assert_called_once()
+
+
+@patch('pympeg.cache.probe_json', return_value=FFPROBE_JSON)
+def test_modified_file_is_probed_again(mock_probe, cache, video):
+    cache.probe(video)
+    video.write_bytes(b're-encoded video')
+    cache.probe(video)
+    assert mock_probe.call_count == 2
+
+
+def test_analysis_results_are_namespaced(cache, video):
+    loudness = cache.cached(video, 'loudness', lambda p: {'lufs': -16.2})
+    assert loudness == {'lufs': -16.2}
+    assert cache.get(video, 'loudness') == {'lufs': -16.2}
+    assert cache.get(video, 'probe') is None
+
+
+def test_lru_eviction_keeps_recently_used(cache, tmp_path):
+    files = []
+    for i in range(11):
+        path = tmp_path / f'{i}.mp4'
+        path.write_bytes(b'x')
+        files.append(path)
+
+    for path in files[:10]:
+        cache.put(path, {'n': path.name})
+    cache._memo.clear()
+    assert cache.get(files[0]) == {'n': '0.mp4'}
+    cache.put(files[10], {'n': '10.mp4'})
+    cache._memo.clear()
+
+    assert len(cache) == 9
+    assert cache.get(files[0]) is not None
+    assert cache.get(files[10]) is not None
+    assert cache.get(files[1]) is None
+
+
+def test_memo_is_bounded(tmp_path, video):
+    with ProbeCache(tmp_path / 'probe.sqlite', memo_size=1) as cache:
+        other = tmp_path / 'other.mp4'
+        other.write_bytes(b'y')
+        cache.put(video, 1)
+        cache.put(other, 2)
+        assert len(cache._memo) == 1
+
+
+def test_clear(cache, video):
+    cache.put(video, {'a': 1})
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get(video) is None
+
+
+@patch('pympeg.cache.probe_json', return_value=FFPROBE_JSON)
+def test_runner_uses_probe_cache(mock_probe, cache, video):
+    from pympeg.runner import Runner
+    runner = Runner(video, 'out.mp4')
+    runner.probe_cache = cache
+
+    assert runner._probe_duration(video) == 12.5
+    assert cache.get(video) == FFPROBE_JSON
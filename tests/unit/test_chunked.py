@@ -0,0 +1,141 @@
+import pytest
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from pympeg.chunked import (
+    ChunkedEncoder, probe_keyframes, segments, split_points
+)
+from pympeg.probe import MediaInfo, StreamInfo
+from pympeg.runner import Runner
+from pympeg.options import GlobalOptions, InputVideoOptions, OutputVideoOptions
+
+
+@pytest.fixture
+def runner():
+    runner = Runner('in.mp4', 'out.mp4', max_workers=4)
+    runner.add_global_options(GlobalOptions(overwrite=True))
+    runner.add_output_options(OutputVideoOptions(codec='libx265', preset='slow'))
+    return runner
+
+
+# ===========================================================================
+# PLANEJAMENTO
+# ===========================================================================
+@patch('pympeg.chunked.subprocess.check_output')
+def test_probe_keyframes_parses_packet_flags(mock_output):
+    mock_output.return_value = '0.000000,K__\n0.033000,___\n2.002000,K__\nN/A,K__\n'
+    assert probe_keyframes(Path('in.mp4')) == [0.0, 2.002]
+
+
+def test_split_points_snap_to_nearest_keyframe():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    assert split_points(keyframes, duration=12.0, chunks=4) == [2.0, 6.0, 8.0]
+
+
+def test_split_points_deduplicate_sparse_keyframes():
+    assert split_points([0.0, 5.0], duration=12.0, chunks=4) == [5.0]
+
+
+def test_segments_cover_whole_file():
+    assert segments([2.0, 6.0]) == [(0.0, 2.0), (2.0, 4.0), (6.0, None)]
+
+
+def test_rejects_input_seeking():
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_input_options(InputVideoOptions(start_time=5))
+    with pytest.raises(ValueError):
+        ChunkedEncoder(runner)
+
+
+def test_single_worker_runner_defaults_to_cpu_count():
+    with patch('pympeg.chunked.os.cpu_count', return_value=8):
+        encoder = ChunkedEncoder(Runner('in.mp4', 'out.mp4'))
+    assert (encoder.max_workers, encoder.chunks) == (8, 8)
+
+
+def test_explicit_workers_and_chunks(runner):
+    encoder = ChunkedEncoder(runner, chunks=6, max_workers=2)
+    assert (encoder.max_workers, encoder.chunks) == (2, 6)
+    assert ChunkedEncoder(runner).max_workers == 4
+
+
+def test_rejects_invalid_workers(runner):
+    with pytest.raises(ValueError):
+        ChunkedEncoder(runner, max_workers=0)
+
+
+@patch.object(Runner, '_probe_duration', return_value=None)
+def test_plan_without_duration_is_single_chunk(_mock, runner):
+    assert ChunkedEncoder(runner).plan(Path('in.mp4')) == [(0.0, None)]
+
+
+# ===========================================================================
+# COMANDOS
+# ===========================================================================
+def test_chunk_command_seeks_and_drops_audio(runner):
+    with patch('pympeg.runner.os.cpu_count', return_value=32):
+        cmd = ChunkedEncoder(runner)._chunk_command(
+            Path('in.mp4'), (2.0, 4.0), Path('chunk.mp4')
+        )
+
+    assert cmd[:6] == ['ffmpeg', '-y', '-ss', '2.000000', '-t', '4.000000']
+    assert cmd[6:8] == ['-i', 'in.mp4']
+    assert cmd[-4:] == ['-threads', '8', '-an', 'chunk.mp4']
+    assert '-preset' in cmd
+
+
+def test_concat_command_maps_separate_audio(runner):
+    cmd = ChunkedEncoder(runner)._concat_command(
+        Path('list.txt'), Path('audio.mp4'), Path('out.mp4')
+    )
+    assert cmd == [
+        'ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', 'list.txt',
+        '-i', 'audio.mp4', '-map', '0:v', '-map', '1:a', '-c', 'copy', 'out.mp4'
+    ]
+
+
+# ===========================================================================
+# EXECUÇÃO
+# ===========================================================================
+def _media(path, duration, audio):
+    streams = [StreamInfo(0, 'video', 'h264')]
+    if audio:
+        streams.append(StreamInfo(1, 'audio', 'aac'))
+    return MediaInfo(path, duration=duration, streams=tuple(streams))
+
+
+@patch('pympeg.chunked.probe_keyframes', return_value=[0.0, 3.0, 6.0, 9.0])
+@patch('pympeg.chunked.subprocess.run')
+def test_run_encodes_chunks_then_concats(mock_run, _k, runner, tmp_path):
+    runner._media_info[tmp_path / 'in.mp4'] = _media(tmp_path / 'in.mp4', 12.0, audio=True)
+    concat_lists = []
+
+    def fake_run(cmd, **kwargs):
+        if 'concat' in cmd:
+            concat_lists.append(Path(cmd[cmd.index('concat') + 4]).read_text())
+
+    mock_run.side_effect = fake_run
+    ChunkedEncoder(runner).run(tmp_path / 'in.mp4', tmp_path / 'out.mp4')
+
+    commands = [c.args[0] for c in mock_run.call_args_list]
+    assert len(commands) == 6
+    assert sum('-an' in cmd for cmd in commands) == 4
+    assert sum('-vn' in cmd for cmd in commands) == 1
+    assert 'concat' in commands[-1]
+    assert concat_lists == [
+        "file 'chunk_0000.mp4'\nfile 'chunk_0001.mp4'\n"
+        "file 'chunk_0002.mp4'\nfile 'chunk_0003.mp4'\n"
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == []
+
+
+@patch('pympeg.chunked.probe_keyframes', return_value=[0.0, 6.0])
+@patch('pympeg.chunked.subprocess.run')
+def test_run_fails_fast_on_chunk_error(mock_run, _k, runner, tmp_path):
+    runner._media_info[tmp_path / 'in.mp4'] = _media(tmp_path / 'in.mp4', 12.0, audio=False)
+    mock_run.side_effect = CalledProcessError(1, ['ffmpeg'])
+
+    with pytest.raises(CalledProcessError):
+        ChunkedEncoder(runner).run(tmp_path / 'in.mp4', tmp_path / 'out.mp4')
+
+    assert not any('concat' in c.args[0] for c in mock_run.call_args_list)
@@ -0,0 +1,103 @@
+import asyncio
+import subprocess
+import pytest
+from pathlib import Path
+from pympeg import AsyncRunner, Builder, ChunkedEncoder, Runner
+from pympeg.binaries import FFMPEG_ENV, ffmpeg_binary
+from pympeg.testing.fake_ffmpeg import parse_args
+
+
+# ===========================================================================
+# TESTES: BINÁRIOS CONFIGURÁVEIS
+# ===========================================================================
+def test_binary_defaults_follow_environment(monkeypatch):
+    monkeypatch.setenv(FFMPEG_ENV, '/opt/ffmpeg/bin/ffmpeg')
+    assert ffmpeg_binary() == '/opt/ffmpeg/bin/ffmpeg'
+    assert Runner('in.mp4', 'out.mp4')._build_command(Path('in.mp4'), Path('out.mp4'))[0] == (
+        '/opt/ffmpeg/bin/ffmpeg'
+    )
+
+
+def test_builder_with_binaries(tmp_path):
+    builder = Builder('in.mp4', 'out.mp4').with_binaries(tmp_path / 'ffmpeg', 'ffprobe-6')
+    assert builder._runner.ffmpeg == str(tmp_path / 'ffmpeg')
+    assert builder._runner.ffprobe == 'ffprobe-6'
+
+
+# ===========================================================================
+# TESTES: FAKE FFMPEG
+# ===========================================================================
+def test_parse_args_splits_inputs_and_outputs():
+    inputs, outputs, values, flags = parse_args(
+        ['-y', '-ss', '5', '-i', 'in.mp4', '-c:v', 'libx264', '-vn', 'out.mp4', '-f', 'null', '-']
+    )
+    assert inputs == ['in.mp4']
+    assert outputs == ['out.mp4', '-']
+    assert values == {'-ss': '5', '-c:v': 'libx264', '-f': 'null'}
+    assert flags == {'-y', '-vn'}
+
+
+def test_fake_ffprobe_feeds_media_info(fakes, videos, tmp_path, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', duration=42.5, width=1280, height=720)
+    info = runner.media_info(videos / 'a.mp4')
+    assert info.duration == 42.5
+    assert info.resolution == (1280, 720)
+    assert info.has_audio
+
+
+def test_fake_ffmpeg_reports_progress(fakes, videos, tmp_path, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', output_size=1000)
+    updates = []
+    runner.on_progress = updates.append
+    runner.run()
+
+    assert updates[-1].done
+    assert updates[-1].percent == pytest.approx(100.0)
+    assert [u.percent for u in updates] == sorted(u.percent for u in updates)
+    assert (tmp_path / 'a.mp4').stat().st_size == 1000
+
+
+def test_batch_with_scripted_failure(fakes, videos, tmp_path, runner_for):
+    runner = runner_for(
+        videos, tmp_path / 'out',
+        files={'ruim*': {'exit_code': 1, 'fail_at': 0.5}}
+    )
+    runner.max_workers = 3
+    results = runner.run()
+
+    assert [r.input_file.name for r in results if not r.ok] == ['ruim.mp4']
+    assert isinstance(results[-1].error, subprocess.CalledProcessError)
+    assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == ['a.mp4', 'b.mp4', 'ruim.mp4']
+
+
+def test_fail_times_fails_only_first_attempts(fakes, videos, tmp_path):
+    ffmpeg, _ = fakes(exit_code=2, fail_times=1)
+    cmd = [str(ffmpeg), '-i', str(videos / 'a.mp4'), str(tmp_path / 'a.mp4')]
+    assert subprocess.run(cmd, capture_output=True).returncode == 2
+    assert subprocess.run(cmd, capture_output=True).returncode == 0
+
+
+def test_missing_input_fails_like_ffmpeg(fakes, tmp_path, runner_for):
+    runner = runner_for(tmp_path / 'nada.mp4', tmp_path / 'out.mp4')
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.run_file(tmp_path / 'nada.mp4', tmp_path / 'out.mp4')
+
+
+def test_hanging_encode_is_cancelled(fakes, videos, tmp_path, runner_for):
+    runner = AsyncRunner.from_runner(
+        runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', hang=True, hang_at=0.5)
+    )
+    output = tmp_path / 'a.mp4'
+
+    async def main():
+        await asyncio.wait_for(runner.run_file(videos / 'a.mp4', output), timeout=0.5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+    assert not output.exists()
+
+
+def test_chunked_encode_end_to_end(fakes, videos, tmp_path, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', duration=8.0)
+    ChunkedEncoder(runner, chunks=2, max_workers=2).run(videos / 'a.mp4', tmp_path / 'a.mp4')
+    assert (tmp_path / 'a.mp4').exists()
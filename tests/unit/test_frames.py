@@ -0,0 +1,194 @@
+import sys
+import pytest
+from subprocess import CalledProcessError
+from pympeg.frames import FrameReader, FrameWriter, parse_size
+from pympeg.options import InputVideoOptions, OutputVideoOptions
+
+np = pytest.importorskip('numpy')
+
+
+def _raw_frames(count, width, height, channels, exit_code=0, trailing=0):
+    code = (
+        'import sys\n'
+        f'for i in range({count}):\n'
+        f'    sys.stdout.buffer.write(bytes([i]) * {width * height * channels})\n'
+        f'sys.stdout.buffer.write(b"x" * {trailing})\n'
+        f'raise SystemExit({exit_code})\n'
+    )
+    return [sys.executable, '-c', code]
+
+
+def _reader(frames=5, size='4x2', pixel_format='rgb24', **kwargs):
+    reader = FrameReader('in.mp4', size=size, pixel_format=pixel_format, **kwargs)
+    width, height = parse_size(size)
+    reader.command = lambda: _raw_frames(frames, width, height, reader.channels)
+    return reader
+
+
+# ===========================================================================
+# COMANDO
+# ===========================================================================
+def test_command_reuses_input_and_output_options():
+    reader = FrameReader(
+        'in.mp4', size='hd720', pixel_format='gray',
+        input_options=InputVideoOptions(start_time=10, duration=5)
+    )
+    assert reader.command() == [
+        'ffmpeg', '-ss', '10.000', '-t', '5.000', '-i', 'in.mp4',
+        '-f', 'rawvideo', '-s', 'hd720', '-pix_fmt', 'gray', 'pipe:1'
+    ]
+    assert reader.width_height == (1280, 720)
+    assert reader.channels == 1
+
+
+@pytest.mark.parametrize('kwargs, exception', [
+    ({'pixel_format': 'yuv420p'}, ValueError),
+    ({'size': 'batata'}, ValueError),
+    ({'batch_size': 0}, ValueError),
+])
+def test_invalid_arguments(kwargs, exception):
+    with pytest.raises(exception):
+        FrameReader('in.mp4', **kwargs)
+
+
+@pytest.mark.parametrize('size, expected', [
+    ('640x360', (640, 360)),
+    ('hd1080', (1920, 1080)),
+])
+def test_parse_size(size, expected):
+    assert parse_size(size) == expected
+
+
+# ===========================================================================
+# LEITURA
+# ===========================================================================
+def test_yields_one_array_per_frame():
+    frames = list(_reader(frames=3))
+
+    assert len(frames) == 3
+    assert frames[0].shape == (2, 4, 3)
+    assert frames[0].dtype == np.uint8
+    assert [int(f[0, 0, 0]) for f in frames] == [0, 1, 2]
+
+
+def test_reuse_buffer_returns_same_array():
+    reader = _reader(frames=3, reuse_buffer=True)
+    ids = {id(frame) for frame in reader}
+    assert len(ids) == 1
+
+
+def test_batches_with_partial_last_batch():
+    batches = list(_reader(frames=5, size='4x2', pixel_format='gray', batch_size=2))
+
+    assert [b.shape for b in batches] == [(2, 2, 4, 1), (2, 2, 4, 1), (1, 2, 4, 1)]
+    assert int(batches[-1][0, 0, 0, 0]) == 4
+
+
+def test_trailing_partial_frame_is_dropped():
+    reader = FrameReader('in.mp4', size='2x2', pixel_format='gray')
+    reader.command = lambda: _raw_frames(2, 2, 2, 1, trailing=3)
+    assert len(list(reader)) == 2
+
+
+def test_failure_raises_after_frames():
+    reader = FrameReader('in.mp4', size='2x2', pixel_format='gray')
+    reader.command = lambda: _raw_frames(1, 2, 2, 1, exit_code=1)
+
+    with pytest.raises(CalledProcessError):
+        list(reader)
+
+
+def test_early_stop_kills_process():
+    reader = FrameReader('in.mp4', size='2x2', pixel_format='gray')
+    reader.command = lambda: _raw_frames(10_000, 2, 2, 1)
+
+    with reader:
+        first = next(iter(reader))
+    assert first.shape == (2, 2, 1)
+    assert reader._process is None
+
+
+# ===========================================================================
+# ESCRITA
+# ===========================================================================
+SINK = (
+    'import sys\n'
+    'data = sys.stdin.buffer.read()\n'
+    'open(sys.argv[1], "wb").write(data)\n'
+)
+
+
+def _writer(tmp_path, code=SINK, **kwargs):
+    out = tmp_path / 'out.raw'
+    writer = FrameWriter(tmp_path / 'out.mp4', '4x2', **kwargs)
+    writer.command = lambda: [sys.executable, '-c', code, str(out)]
+    return writer, out
+
+
+def test_writer_command_uses_rawvideo_input(tmp_path):
+    writer = FrameWriter(
+        'out.mp4', 'hd720', OutputVideoOptions(codec='libx264', crf=20),
+        pixel_format='gray', fps=30
+    )
+    assert writer.command() == [
+        'ffmpeg', '-f', 'rawvideo', '-r', '30', '-s', 'hd720',
+        '-pix_fmt', 'gray', '-i', 'pipe:0',
+        '-c:v', 'libx264', '-crf', '20', 'out.mp4'
+    ]
+    assert writer.frame_shape == (720, 1280, 1)
+
+
+def test_writer_accepts_single_frames_and_batches(tmp_path):
+    writer, out = _writer(tmp_path)
+    frame = np.full((2, 4, 3), 7, dtype=np.uint8)
+    batch = np.arange(2 * 2 * 4 * 3, dtype=np.uint8).reshape(2, 2, 4, 3)
+
+    with writer:
+        writer.write(frame)
+        writer.write(batch)
+        writer.write(batch[:, :, ::-1])
+
+    assert writer.frames_written == 5
+    data = out.read_bytes()
+    assert data[:24] == bytes([7]) * 24
+    assert data[24:72] == batch.tobytes()
+    assert data[72:] == np.ascontiguousarray(batch[:, :, ::-1]).tobytes()
+
+
+def test_writer_accepts_gray_without_channel_axis(tmp_path):
+    writer, out = _writer(tmp_path, pixel_format='gray')
+    with writer:
+        writer.write(np.zeros((3, 2, 4), dtype=np.uint8))
+    assert writer.frames_written == 3
+    assert len(out.read_bytes()) == 24
+
+
+@pytest.mark.parametrize('frames, exception', [
+    (np.zeros((2, 4, 3), dtype=np.float32), TypeError),
+    (np.zeros((4, 2, 3), dtype=np.uint8), ValueError),
+    (np.zeros((2, 4), dtype=np.uint8), ValueError),
+])
+def test_writer_rejects_invalid_frames(tmp_path, frames, exception):
+    writer, _ = _writer(tmp_path)
+    with pytest.raises(exception):
+        writer.write(frames)
+    assert writer._process is None
+
+
+def test_writer_raises_when_encoder_fails(tmp_path):
+    writer, _ = _writer(tmp_path, code='raise SystemExit(1)')
+    frame = np.zeros((2, 4, 3), dtype=np.uint8)
+
+    with pytest.raises(CalledProcessError):
+        with writer:
+            for _ in range(100_000):
+                writer.write(frame)
+
+
+def test_writer_aborts_on_exception(tmp_path):
+    writer, _ = _writer(tmp_path, code='import time; time.sleep(30)')
+
+    with pytest.raises(RuntimeError):
+        with writer:
+            raise RuntimeError('render failed')
+    assert writer._process is None
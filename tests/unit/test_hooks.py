@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from pympeg import AsyncRunner, Builder, HookRegistry
+from pympeg.hooks import ErrorEvent, FinishEvent, PlanEvent, ProgressEvent, StartEvent
+
+
+class Recorder:
+
+    def __init__(self):
+        self.events = []
+
+    def on_plan(self, event):
+        self.events.append(('plan', event))
+
+    def on_start(self, event):
+        self.events.append(('start', event))
+
+    def on_progress(self, event):
+        self.events.append(('progress', event))
+
+    def on_stderr_line(self, event):
+        self.events.append(('stderr', event))
+
+    def on_finish(self, event):
+        self.events.append(('finish', event))
+
+    def on_error(self, event):
+        self.events.append(('error', event))
+
+    def kinds(self, kind):
+        return [event for name, event in self.events if name == kind]
+
+
+# ===========================================================================
+# TESTES: REGISTRO
+# ===========================================================================
+def test_empty_registry_is_falsy():
+    hooks = HookRegistry()
+    assert not hooks
+    assert hooks.on_progress == ()
+
+
+def test_register_and_unregister():
+    hooks = HookRegistry()
+    calls = []
+    hooks.register('on_finish', calls.append)
+    assert hooks
+
+    hooks.emit('on_finish', 'x')
+    hooks.unregister('on_finish', calls.append)
+    hooks.emit('on_finish', 'y')
+    assert calls == ['x']
+
+
+def test_register_rejects_unknown_event():
+    with pytest.raises(ValueError):
+        HookRegistry().register('on_whatever', print)
+
+
+def test_add_plugin_registers_only_defined_hooks():
+    class Plugin:
+        def on_start(self, event):
+            pass
+
+    hooks = HookRegistry()
+    plugin = hooks.add(Plugin())
+    assert len(hooks.on_start) == 1
+    assert not hooks.on_finish
+
+    hooks.remove(plugin)
+    assert not hooks
+
+
+def test_failing_hook_does_not_stop_others():
+    hooks = HookRegistry()
+    calls = []
+    hooks.register('on_plan', lambda event: 1 / 0)
+    hooks.register('on_plan', calls.append)
+    hooks.emit('on_plan', 'x')
+    assert calls == ['x']
+
+
+# ===========================================================================
+# TESTES: RUNNER
+# ===========================================================================
+def test_batch_fires_lifecycle_hooks(tmp_path, videos, runner_for):
+    runner = runner_for(
+        videos, tmp_path / 'out',
+        files={'ruim*': {'exit_code': 1, 'fail_at': 0.5}}
+    )
+    recorder = runner.hooks.add(Recorder())
+    runner.run()
+
+    plan, = recorder.kinds('plan')
+    assert isinstance(plan, PlanEvent)
+    assert [i.name for i, _ in plan.jobs] == ['a.mp4', 'b.mp4', 'ruim.mp4']
+
+    starts = recorder.kinds('start')
+    assert [(s.index, s.total) for s in starts] == [(1, 3), (2, 3), (3, 3)]
+    assert starts[0].command[0] == runner.ffmpeg
+
+    assert [f.result.input_file.name for f in recorder.kinds('finish')] == ['a.mp4', 'b.mp4']
+    error, = recorder.kinds('error')
+    assert error.input_file.name == 'ruim.mp4'
+    assert error.attempt == 1
+
+    progress = recorder.kinds('progress')
+    assert isinstance(progress[0], ProgressEvent)
+    assert any(event.progress.done for event in progress)
+    assert any('frame=' in event.line for event in recorder.kinds('stderr'))
+
+
+def test_progress_hook_without_callback(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    updates = []
+    runner.hooks.register('on_progress', updates.append)
+    runner.run()
+    assert updates[-1].progress.percent == pytest.approx(100.0)
+
+
+def test_error_hook_can_request_retry(tmp_path, videos, runner_for):
+    runner = runner_for(
+        videos / 'a.mp4', tmp_path / 'a.mp4', exit_code=1, fail_times=1,
+        state_dir=str(tmp_path)
+    )
+
+    def retry_once(event: ErrorEvent):
+        event.retry = event.attempt < 2
+
+    finished = []
+    runner.hooks.register('on_error', retry_once)
+    runner.hooks.register('on_finish', finished.append)
+    result = runner.run()
+
+    assert result.ok
+    assert isinstance(finished[0], FinishEvent)
+    assert finished[0].attempt == 2
+
+
+def test_async_runner_shares_hooks(tmp_path, videos, runner_for):
+    runner = runner_for(videos, tmp_path / 'out')
+    recorder = runner.hooks.add(Recorder())
+    asyncio.run(AsyncRunner.from_runner(runner).run())
+
+    assert len(recorder.kinds('plan')) == 1
+    assert sorted(s.input_file.name for s in recorder.kinds('start')) == [
+        'a.mp4', 'b.mp4', 'ruim.mp4'
+    ]
+    assert isinstance(recorder.kinds('start')[0], StartEvent)
+    assert len(recorder.kinds('finish')) == 3
+    assert recorder.kinds('progress')
+    assert any('frame=' in event.line for event in recorder.kinds('stderr'))
+
+
+# ===========================================================================
+# TESTES: BUILDER
+# ===========================================================================
+def test_builder_with_hooks():
+    recorder = Recorder()
+    builder = Builder('in.mp4', 'out.mp4').with_hooks(recorder).with_hook('on_plan', print)
+    hooks = builder._runner.hooks
+    assert len(hooks.on_plan) == 2
+    assert hooks.on_finish == (recorder.on_finish,)
+
+
+def test_builder_with_hook_invalid():
+    with pytest.raises(ValueError):
+        Builder('in.mp4', 'out.mp4').with_hook('on_banana', print)
+    with pytest.raises(TypeError):
+        Builder('in.mp4', 'out.mp4').with_hooks(object())
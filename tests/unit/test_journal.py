@@ -0,0 +1,153 @@
+import json
+import pytest
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from pympeg.journal import JobJournal, is_partial, partial_path
+from pympeg.metrics import ProcessUsage
+from pympeg.options import GlobalOptions
+from pympeg.runner import Runner
+
+
+def _fake_ffmpeg(payload=b'encoded', fail_on=None):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        if fail_on and cmd[cmd.index('-i') + 1].endswith(fail_on):
+            Path(cmd[-1]).write_bytes(b'trunc')
+            raise CalledProcessError(1, cmd)
+        Path(cmd[-1]).write_bytes(payload)
+        return ProcessUsage(0)
+
+    fake_run.calls = calls
+    return fake_run
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in ['a.mp4', 'b.mp4']:
+        (src / name).write_bytes(b'raw ' + name.encode())
+    return src
+
+
+# ===========================================================================
+# JOURNAL
+# ===========================================================================
+def test_partial_path_keeps_extension():
+    temp = partial_path(Path('/videos/aula.mp4'))
+    assert temp == Path('/videos/.aula.partial.mp4')
+    assert is_partial(temp)
+    assert not is_partial(Path('/videos/aula.mp4'))
+
+
+def test_record_and_reload(tmp_path, source):
+    journal_path = tmp_path / 'journal.jsonl'
+    input_file = source / 'a.mp4'
+    output_file = tmp_path / 'a.mp4'
+    output_file.write_bytes(b'12345')
+
+    JobJournal(journal_path).record(input_file, output_file, ['ffmpeg'], 'done', output_size=5)
+
+    journal = JobJournal(journal_path)
+    assert journal.is_complete(input_file, output_file, ['ffmpeg'])
+    assert not journal.is_complete(input_file, output_file, ['ffmpeg', '-crf', '30'])
+
+
+def test_volatile_flags_do_not_invalidate_entry(tmp_path, source):
+    journal = JobJournal(tmp_path / 'journal.jsonl')
+    input_file = source / 'a.mp4'
+    output_file = tmp_path / 'a.mp4'
+    output_file.write_bytes(b'12345')
+    journal.record(
+        input_file, output_file, ['ffmpeg', '-crf', '30', '-threads', '8', 'a.mp4'], 'done',
+        output_size=5
+    )
+
+    assert journal.is_complete(
+        input_file, output_file, ['ffmpeg', '-y', '-crf', '30', '-threads', '2', 'a.mp4']
+    )
+
+
+def test_changed_input_or_truncated_output_is_not_complete(tmp_path, source):
+    journal = JobJournal(tmp_path / 'journal.jsonl')
+    input_file = source / 'a.mp4'
+    output_file = tmp_path / 'a.mp4'
+    output_file.write_bytes(b'12345')
+    journal.record(input_file, output_file, ['ffmpeg'], 'done', output_size=5)
+
+    output_file.write_bytes(b'12')
+    assert not journal.is_complete(input_file, output_file, ['ffmpeg'])
+
+    output_file.write_bytes(b'12345')
+    input_file.write_bytes(b'another source')
+    assert not journal.is_complete(input_file, output_file, ['ffmpeg'])
+
+
+def test_truncated_last_line_is_ignored(tmp_path, source):
+    journal_path = tmp_path / 'journal.jsonl'
+    journal = JobJournal(journal_path)
+    journal.record(source / 'a.mp4', tmp_path / 'a.mp4', ['ffmpeg'], 'started')
+    with open(journal_path, 'a') as f:
+        f.write('{"input": "trunc')
+
+    entry = JobJournal(journal_path).get(source / 'a.mp4', tmp_path / 'a.mp4')
+    assert entry['status'] == 'started'
+
+
+# ===========================================================================
+# RUNNER
+# ===========================================================================
+def test_batch_resumes_skipping_completed_jobs(tmp_path, source):
+    journal_path = tmp_path / 'journal.jsonl'
+    out = tmp_path / 'out'
+
+    first = _fake_ffmpeg(fail_on='b.mp4')
+    runner = Runner(source, out)
+    runner.journal = JobJournal(journal_path)
+    with patch('pympeg.runner.run_measured', side_effect=first):
+        results = runner.run_batch()
+
+    assert [r.ok for r in results] == [True, False]
+    assert (out / 'a.mp4').read_bytes() == b'encoded'
+    assert not (out / 'b.mp4').exists()
+    assert not partial_path(out / 'b.mp4').exists()
+    assert first.calls[0][-1] == str(partial_path(out / 'a.mp4'))
+
+    second = _fake_ffmpeg()
+    runner.journal = JobJournal(journal_path)
+    with patch('pympeg.runner.run_measured', side_effect=second):
+        results = runner.run_batch()
+
+    assert [(r.ok, r.skipped) for r in results] == [(True, True), (True, False)]
+    assert len(second.calls) == 1
+    assert (out / 'b.mp4').read_bytes() == b'encoded'
+
+    statuses = [json.loads(line)['status'] for line in journal_path.read_text().splitlines()]
+    assert statuses == ['started', 'done', 'started', 'failed', 'started', 'done']
+
+
+def test_collect_files_ignores_partial_outputs(source):
+    partial_path(source / 'c.mp4').touch()
+    runner = Runner(source, source)
+    assert [f.name for f in runner._collect_files()] == ['a.mp4', 'b.mp4']
+
+
+def test_no_overwrite_keeps_existing_output(tmp_path, source):
+    out = tmp_path / 'out'
+    out.mkdir()
+    (out / 'b.mp4').write_bytes(b'KEEP')
+
+    fake = _fake_ffmpeg()
+    runner = Runner(source, out)
+    runner.add_global_options(GlobalOptions(overwrite=False))
+    runner.journal = JobJournal(tmp_path / 'journal.jsonl')
+    with patch('pympeg.runner.run_measured', side_effect=fake):
+        results = runner.run_batch()
+
+    assert results[0].ok
+    assert isinstance(results[1].error, FileExistsError)
+    assert (out / 'b.mp4').read_bytes() == b'KEEP'
+    assert len(fake.calls) == 1
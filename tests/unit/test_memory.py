@@ -0,0 +1,176 @@
+import sys
+import threading
+import time
+import pytest
+from pympeg import Builder, JobJournal, MemoryBudget
+from pympeg.memory import (
+    BASE_MEMORY, estimate_encoder_memory, estimate_job_memory, is_out_of_memory
+)
+from pympeg.metrics import run_measured
+
+
+@pytest.fixture
+def fake_profile():
+    # Jobs de ~0,1s: lentos o bastante para que uma sobreposição apareça.
+    return {'duration': 2.0, 'speed': 20.0}
+
+
+# ===========================================================================
+# TESTES: ESTIMATIVA
+# ===========================================================================
+def test_estimate_grows_with_resolution_codec_and_preset():
+    hd = estimate_encoder_memory((1920, 1080), 'libx264', 'medium', threads=8)
+    uhd = estimate_encoder_memory((3840, 2160), 'libx264', 'medium', threads=8)
+    x265 = estimate_encoder_memory((3840, 2160), 'libx265', 'medium', threads=8)
+    slow = estimate_encoder_memory((3840, 2160), 'libx265', 'slow', threads=8)
+    assert hd < uhd < x265 < slow
+
+
+def test_estimate_grows_with_threads():
+    assert estimate_encoder_memory((1920, 1080), threads=2) < estimate_encoder_memory(
+        (1920, 1080), threads=16
+    )
+
+
+def test_stream_copy_costs_only_base():
+    assert estimate_job_memory(None, [['-c:v', 'copy']]) == BASE_MEMORY
+
+
+def test_output_size_overrides_source_resolution():
+    full = estimate_job_memory(None, [['-c:v', 'libx264']], threads=4)
+    scaled = estimate_job_memory(None, [['-c:v', 'libx264', '-s', 'hd720']], threads=4)
+    assert scaled < full
+
+
+def test_output_size_uses_shared_size_names():
+    named = estimate_job_memory(None, [['-c:v', 'libx264', '-s', 'uhd2160']], threads=4)
+    explicit = estimate_job_memory(None, [['-c:v', 'libx264', '-s', '3840x2160']], threads=4)
+    assert named == explicit
+
+
+def test_unknown_output_size_falls_back_to_source():
+    full = estimate_job_memory(None, [['-c:v', 'libx264']], threads=4)
+    unknown = estimate_job_memory(None, [['-c:v', 'libx264', '-s', 'huge']], threads=4)
+    assert unknown == full
+
+
+def test_is_out_of_memory():
+    assert is_out_of_memory(-9)
+    assert is_out_of_memory(137)
+    assert not is_out_of_memory(1)
+
+
+# ===========================================================================
+# TESTES: ORÇAMENTO
+# ===========================================================================
+def test_budget_blocks_until_release():
+    budget = MemoryBudget(100)
+    budget.acquire(60)
+    admitted = threading.Event()
+
+    def second():
+        with budget.reserve(60):
+            admitted.set()
+
+    worker = threading.Thread(target=second)
+    worker.start()
+    assert not admitted.wait(0.1)
+
+    budget.release(60)
+    assert admitted.wait(1)
+    worker.join()
+    assert budget.used == 0
+
+
+def test_oversized_job_runs_alone():
+    budget = MemoryBudget(100)
+    with budget.reserve(500):
+        assert budget.used == 500
+
+
+def test_budget_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
+
+
+# ===========================================================================
+# TESTES: RUNNER
+# ===========================================================================
+def test_budget_serializes_heavy_jobs(tmp_path, videos, runner_for):
+    runner = runner_for(videos, tmp_path / 'out')
+    runner.max_workers = 3
+    runner.memory_budget = MemoryBudget(int(runner.estimate_memory(videos / 'a.mp4') * 1.5))
+
+    spans = {}
+    runner.hooks.register('on_start', lambda e: spans.setdefault(e.input_file, [time.monotonic()]))
+    runner.hooks.register('on_finish', lambda e: spans[e.result.input_file].append(time.monotonic()))
+    results = runner.run()
+
+    assert all(result.ok for result in results)
+    intervals = sorted(spans.values())
+    for (_, end), (start, _) in zip(intervals, intervals[1:]):
+        assert start >= end
+    assert runner.memory_budget.used == 0
+
+
+def test_oom_killed_job_retries_with_fewer_threads(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', oom_threads=2)
+    runner.threads_per_job = 8
+    runner.oom_retries = 3
+
+    commands = []
+    runner.hooks.register('on_start', lambda e: commands.append(e.command))
+    result = runner.run()
+
+    assert result.ok
+    threads = [cmd[cmd.index('-threads') + 1] for cmd in commands]
+    assert threads == ['8', '4', '2']
+    assert not runner._job_threads
+
+
+def test_job_retried_after_oom_is_skipped_on_resume(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', oom_threads=2)
+    runner.threads_per_job = 4
+    runner.oom_retries = 2
+    runner.journal = JobJournal(tmp_path / 'journal.jsonl')
+    assert runner.run().ok
+
+    args = runner.journal.get(videos / 'a.mp4', tmp_path / 'a.mp4')['args']
+    assert args[args.index('-threads') + 1] == '4'
+
+    runner.journal = JobJournal(tmp_path / 'journal.jsonl')
+    assert runner.run().skipped
+
+
+def test_oom_without_retries_fails(tmp_path, videos, runner_for):
+    runner = runner_for(videos, tmp_path / 'out', oom_threads=2)
+    runner.threads_per_job = 8
+    results = runner.run()
+    assert all(result.error.returncode == -9 for result in results)
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='prlimit só existe no Linux')
+def test_memory_limit_applies_rlimit_to_child():
+    lines = []
+    run_measured(
+        [sys.executable, '-c', 'import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])'],
+        on_line=lines.append,
+        memory_limit=2 * 1024 ** 3
+    )
+    assert int(lines[0]) == 2 * 1024 ** 3
+
+
+# ===========================================================================
+# TESTES: BUILDER
+# ===========================================================================
+def test_builder_with_memory_budget():
+    builder = Builder('in', 'out').with_memory_budget(8 * 1024 ** 3, per_job_limit=1024 ** 3)
+    runner = builder._runner
+    assert runner.memory_budget.limit == 8 * 1024 ** 3
+    assert runner.memory_limit == 1024 ** 3
+    assert runner.oom_retries == 1
+
+
+def test_builder_with_memory_budget_invalid():
+    with pytest.raises(ValueError):
+        Builder('in', 'out').with_memory_budget(1024, oom_retries=-1)
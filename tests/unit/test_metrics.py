@@ -0,0 +1,154 @@
+import json
+import sys
+import pytest
+from pathlib import Path
+from subprocess import CalledProcessError
+from pympeg import Runner
+from pympeg.metrics import (
+    BatchResults, BatchSummary, JobMetrics, ProcessUsage, run_measured
+)
+from pympeg.results import JobResult
+from pympeg.testing import install_fakes
+
+
+def python_child(code):
+    return [sys.executable, '-c', code]
+
+
+# ===========================================================================
+# TESTES: PROCESSO FILHO
+# ===========================================================================
+def test_run_measured_reports_child_usage():
+    usage = run_measured(python_child(
+        'data = bytearray(64 * 1024 * 1024)\n'
+        'sum(range(3_000_000))'
+    ))
+    assert usage.returncode == 0
+    assert usage.user_time > 0
+    assert usage.max_rss >= 64 * 1024 * 1024
+
+
+def test_run_measured_raises_on_failure():
+    with pytest.raises(CalledProcessError) as info:
+        run_measured(python_child('raise SystemExit(3)'))
+    assert info.value.returncode == 3
+
+
+def test_run_measured_streams_lines():
+    lines = []
+    run_measured(python_child('print("a"); print("b")'), on_line=lines.append)
+    assert lines == ['a\n', 'b\n']
+
+
+# ===========================================================================
+# TESTES: MÉTRICAS DO JOB
+# ===========================================================================
+def test_job_metrics_derived_values(tmp_path):
+    (tmp_path / 'in.mp4').write_bytes(b'x' * 1000)
+    (tmp_path / 'out.mp4').write_bytes(b'x' * 250)
+
+    metrics = JobMetrics.from_usage(ProcessUsage(0, 1.5, 0.5, 2048), wall_time=4.0)
+    metrics.measure_files(tmp_path / 'in.mp4', [tmp_path / 'out.mp4', tmp_path / 'nada.mp4'])
+    metrics.media_duration = 60.0
+
+    assert metrics.cpu_time == 2.0
+    assert metrics.compression_ratio == 0.25
+    assert metrics.speed == 15.0
+    assert metrics.to_dict()['speed'] == 15.0
+
+
+def test_job_metrics_without_duration_has_no_speed():
+    assert JobMetrics(wall_time=1.0).speed is None
+    assert JobMetrics().compression_ratio is None
+
+
+# ===========================================================================
+# TESTES: RESUMO DO BATCH
+# ===========================================================================
+@pytest.fixture
+def results():
+    return [
+        JobResult(Path('a'), Path('oa'), metrics=JobMetrics(2.0, 1.0, 0.5, 100, 1000, 400, 30.0)),
+        JobResult(Path('b'), Path('ob'), metrics=JobMetrics(3.0, 2.0, 0.5, 300, 1000, 600, 30.0)),
+        JobResult(Path('c'), Path('oc'), skipped=True),
+        JobResult(Path('d'), Path('od'), error=RuntimeError('x')),
+    ]
+
+
+def test_summary_aggregates_results(results):
+    summary = BatchSummary.from_results(results, wall_time=6.0)
+    assert (summary.jobs, summary.succeeded, summary.failed, summary.skipped) == (4, 3, 1, 1)
+    assert summary.cpu_time == 4.0
+    assert summary.max_rss == 300
+    assert summary.compression_ratio == 0.5
+    assert summary.speed == 10.0
+    assert summary.throughput == pytest.approx(4 / 6)
+
+
+def test_summary_exports_json(results):
+    data = json.loads(BatchSummary.from_results(results, wall_time=6.0).to_json())
+    assert data['output_bytes'] == 1000
+    assert data['speed'] == 10.0
+
+
+def test_summary_exports_prometheus(results):
+    text = BatchSummary.from_results(results, wall_time=6.0).to_prometheus(
+        labels={'host': 'render"01'}
+    )
+    assert '# TYPE pympeg_batch_jobs gauge' in text
+    assert 'pympeg_batch_jobs{host="render\\"01",status="failed"} 1' in text
+    assert 'pympeg_batch_cpu_seconds{host="render\\"01",mode="user"} 3.0' in text
+    assert text.endswith('\n')
+
+
+def test_write_prometheus_replaces_file(results, tmp_path):
+    path = tmp_path / 'pympeg.prom'
+    path.write_text('antigo')
+    BatchSummary.from_results(results, wall_time=6.0).write_prometheus(path, prefix='enc')
+    assert path.read_text().startswith('# HELP enc_jobs')
+    assert [p.name for p in tmp_path.iterdir()] == ['pympeg.prom']
+
+
+# ===========================================================================
+# TESTES: RUNNER
+# ===========================================================================
+def test_runner_returns_metrics_and_summary(tmp_path):
+    ffmpeg, ffprobe = install_fakes(tmp_path / 'bin', {
+        'duration': 4.0, 'speed': 100.0, 'output_size': 500,
+        'files': {'ruim*': {'exit_code': 1}},
+    })
+    source = tmp_path / 'in'
+    source.mkdir()
+    for name in ('a.mp4', 'b.mp4', 'ruim.mp4'):
+        (source / name).write_bytes(b'x' * 1000)
+
+    runner = Runner(source, tmp_path / 'out', max_workers=2)
+    runner.ffmpeg, runner.ffprobe = str(ffmpeg), str(ffprobe)
+    runner.on_progress = lambda progress: None
+    results = runner.run()
+
+    assert isinstance(results, BatchResults)
+    metrics = results[0].metrics
+    assert metrics.output_bytes == 500
+    assert metrics.compression_ratio == 0.5
+    assert metrics.media_duration == 4.0
+    assert metrics.speed > 1
+    assert metrics.user_time + metrics.system_time > 0
+    assert metrics.max_rss > 0
+
+    assert results.summary.succeeded == 2
+    assert results.summary.failed == 1
+    assert results.summary.output_bytes == 1000
+
+
+def test_single_file_run_returns_job_result(tmp_path):
+    ffmpeg, _ = install_fakes(tmp_path / 'bin', {'duration': 1.0, 'speed': 100.0})
+    (tmp_path / 'a.mp4').write_bytes(b'video')
+
+    runner = Runner(tmp_path / 'a.mp4', tmp_path / 'b.mp4')
+    runner.ffmpeg = str(ffmpeg)
+    result = runner.run()
+
+    assert result.ok
+    assert result.metrics.wall_time > 0
+    assert result.metrics.media_duration is None
@@ -0,0 +1,224 @@
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from pympeg import GlobalOptions, OutputVideoOptions, Runner
+from pympeg.journal import is_partial
+from pympeg.output_cache import OutputCache, content_hash, normalize_args
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with OutputCache(tmp_path / 'outputs', max_bytes=1024) as cache:
+        yield cache
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / 'aula.mp4'
+    path.write_bytes(b'video')
+    return path
+
+
+def fake_encode(content=b'encoded'):
+    calls = []
+
+    def run_file(input_file, output_file):
+        calls.append(output_file)
+        Path(output_file).write_bytes(content)
+
+    return run_file, calls
+
+
+# ===========================================================================
+# CHAVE
+# ===========================================================================
+def test_normalize_args_drops_volatile_flags():
+    args = ['ffmpeg', '-y', '-threads', '4', '-i', 'in.mp4', '-loglevel', 'error', '-crf', '23']
+    assert normalize_args(args) == ['ffmpeg', '-i', 'in.mp4', '-crf', '23']
+
+
+def test_content_hash_reads_whole_file(tmp_path):
+    a = tmp_path / 'a.bin'
+    b = tmp_path / 'b.bin'
+    a.write_bytes(b'x' * (3 << 20) + b'1')
+    b.write_bytes(b'x' * (3 << 20) + b'2')
+    assert content_hash(a) != content_hash(b)
+
+
+def test_key_ignores_volatile_flags_but_not_encoding_options(cache, video):
+    base = cache.key(video, ['-i', '-', '-crf', '23'])
+    assert cache.key(video, ['-y', '-threads', '2', '-i', '-', '-crf', '23']) == base
+    assert cache.key(video, ['-i', '-', '-crf', '28']) != base
+
+
+def test_key_follows_content_not_path(cache, video, tmp_path):
+    copy = tmp_path / 'copia.mp4'
+    copy.write_bytes(video.read_bytes())
+    assert cache.key(copy, ['-crf', '23']) == cache.key(video, ['-crf', '23'])
+
+
+# ===========================================================================
+# ARMAZENAMENTO
+# ===========================================================================
+def test_store_then_fetch_links_artifact(cache, tmp_path):
+    produced = tmp_path / 'a.mp4'
+    produced.write_bytes(b'encoded')
+    cache.store('ab' * 32, produced)
+
+    target = tmp_path / 'b.mp4'
+    assert cache.fetch('ab' * 32, target)
+    assert target.read_bytes() == b'encoded'
+    assert target.stat().st_nlink >= 2
+
+
+def test_fetch_falls_back_to_copy(tmp_path):
+    with OutputCache(tmp_path / 'outputs', link=False) as cache:
+        produced = tmp_path / 'a.mp4'
+        produced.write_bytes(b'encoded')
+        cache.store('cd' * 32, produced)
+
+        target = tmp_path / 'b.mp4'
+        assert cache.fetch('cd' * 32, target)
+        assert target.stat().st_nlink == 1
+
+
+def test_fetch_miss_returns_false(cache, tmp_path):
+    assert not cache.fetch('ef' * 32, tmp_path / 'out.mp4')
+
+
+def test_evicts_least_recently_used_over_budget(cache, tmp_path):
+    keys = ['1' * 64, '2' * 64, '3' * 64]
+    for key in keys:
+        produced = tmp_path / f'{key[0]}.mp4'
+        produced.write_bytes(b'x' * 400)
+        cache.store(key, produced)
+        time.sleep(0.01)
+
+    assert cache.evictions == 1
+    assert not cache.fetch(keys[0], tmp_path / 'out.mp4')
+    assert cache.fetch(keys[2], tmp_path / 'out.mp4')
+    assert cache.stats()['bytes'] == 800
+
+
+def test_run_counts_hits_and_misses(cache, tmp_path):
+    produce_calls = []
+
+    def produce(path):
+        produce_calls.append(path)
+        path.write_bytes(b'encoded')
+
+    assert not cache.run('aa' * 32, tmp_path / 'a.mp4', produce)
+    assert cache.run('aa' * 32, tmp_path / 'b.mp4', produce)
+    assert len(produce_calls) == 1
+    assert is_partial(produce_calls[0]) and not produce_calls[0].exists()
+    assert (tmp_path / 'a.mp4').read_bytes() == b'encoded'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+# ===========================================================================
+# INTEGRAÇÃO COM O RUNNER
+# ===========================================================================
+def test_runner_skips_encode_on_hit(cache, video, tmp_path):
+    run_file, calls = fake_encode()
+
+    first = Runner(video, tmp_path / 'a.mp4')
+    first.output_cache = cache
+    with patch.object(first, 'run_file', side_effect=run_file):
+        first.run()
+
+    second = Runner(video, tmp_path / 'b.mp4')
+    second.output_cache = cache
+    with patch.object(second, 'run_file', side_effect=run_file):
+        second.run()
+
+    assert len(calls) == 1
+    assert (tmp_path / 'a.mp4').read_bytes() == b'encoded'
+    assert (tmp_path / 'b.mp4').read_bytes() == b'encoded'
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_no_overwrite_keeps_existing_output(cache, video, tmp_path, cached):
+    run_file, calls = fake_encode()
+    if cached:
+        seed = Runner(video, tmp_path / 'a.mp4')
+        seed.output_cache = cache
+        with patch.object(seed, 'run_file', side_effect=run_file):
+            seed.run()
+
+    (tmp_path / 'b.mp4').write_bytes(b'KEEP')
+    runner = Runner(video, tmp_path / 'b.mp4')
+    runner.output_cache = cache
+    runner.add_global_options(GlobalOptions(overwrite=False))
+    with patch.object(runner, 'run_file', side_effect=run_file), pytest.raises(FileExistsError):
+        runner.run()
+
+    assert (tmp_path / 'b.mp4').read_bytes() == b'KEEP'
+    assert len(calls) == int(cached)
+
+
+def test_runner_cache_key_depends_on_options(cache, video, tmp_path):
+    run_file, calls = fake_encode()
+
+    for crf, name in ((23, 'a.mp4'), (28, 'b.mp4')):
+        runner = Runner(video, tmp_path / name)
+        runner.output_cache = cache
+        runner.add_output_options(OutputVideoOptions(crf=crf))
+        with patch.object(runner, 'run_file', side_effect=run_file):
+            runner.run()
+
+    assert len(calls) == 2
+
+
+def test_reencoding_same_output_keeps_cached_artifact(cache, video, tmp_path):
+    output = tmp_path / 'out.mp4'
+
+    def encode(crf):
+        def run_file(input_file, output_file):
+            # Mesmo padrão de escrita do ffmpeg -y: abre com O_TRUNC no lugar.
+            with open(output_file, 'wb') as f:
+                f.write(f'crf={crf}'.encode() * crf)
+
+        runner = Runner(video, output)
+        runner.output_cache = cache
+        runner.add_output_options(OutputVideoOptions(crf=crf))
+        with patch.object(runner, 'run_file', side_effect=run_file) as mock:
+            result = runner.run()
+        return result, mock.call_count
+
+    _, calls = encode(20)
+    assert calls == 1
+    first = output.read_bytes()
+    _, calls = encode(30)
+    assert calls == 1
+    assert output.read_bytes() != first
+
+    result, calls = encode(20)
+    assert calls == 0 and result.cached
+    assert output.read_bytes() == first
+
+
+def test_batch_collapses_identical_jobs(tmp_path):
+    source = tmp_path / 'in'
+    source.mkdir()
+    for name in ('a.mp4', 'b.mp4', 'c.mp4'):
+        (source / name).write_bytes(b'same video')
+
+    calls = []
+
+    def run_file(input_file, output_file):
+        calls.append(output_file)
+        time.sleep(0.05)
+        Path(output_file).write_bytes(b'encoded')
+
+    with OutputCache(tmp_path / 'outputs') as cache:
+        runner = Runner(source, tmp_path / 'out', max_workers=3)
+        runner.output_cache = cache
+        with patch.object(runner, 'run_file', side_effect=run_file):
+            results = runner.run()
+
+    assert len(calls) == 1
+    assert [r.cached for r in results].count(True) == 2
+    assert all((tmp_path / 'out' / name).read_bytes() == b'encoded'
+               for name in ('a.mp4', 'b.mp4', 'c.mp4'))
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import pytest
+import pympeg
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+
+# ===========================================================================
+# TESTES: IMPORT PREGUIÇOSO
+# ===========================================================================
+def test_import_loads_no_submodules():
+    loaded = run_python(
+        'import sys, pympeg\n'
+        'print(*sorted(m for m in sys.modules if m.startswith("pympeg")))\n'
+        'print("subprocess" in sys.modules, "numpy" in sys.modules)'
+    )
+    assert loaded == ['pympeg', 'False', 'False']
+
+
+def test_access_loads_only_needed_module():
+    loaded = run_python(
+        'import sys, pympeg\n'
+        'pympeg.JobResult\n'
+        'print("pympeg.results" in sys.modules, "pympeg.runner" in sys.modules)'
+    )
+    assert loaded == ['True', 'False']
+
+
+@pytest.mark.parametrize('name', pympeg.__all__)
+def test_public_names_resolve(name):
+    value = getattr(pympeg, name)
+    module = sys.modules[f'pympeg.{pympeg._LAZY[name]}']
+    assert value is getattr(module, name)
+
+
+def test_probe_is_the_submodule():
+    import pympeg.probe as module
+    assert module is sys.modules['pympeg.probe']
+    assert pympeg.probe is module
+    assert callable(module.probe_many)
+    assert 'probe' not in pympeg.__all__
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        pympeg.Banana
+
+
+def test_dir_lists_public_names():
+    assert set(pympeg.__all__) <= set(dir(pympeg))
@@ -0,0 +1,107 @@
+import io
+import sys
+import pytest
+from subprocess import CalledProcessError
+from pympeg.pipes import run_piped
+from pympeg.runner import Runner
+from pympeg.options import OutputVideoOptions
+
+
+UPPERCASE = (
+    'import sys\n'
+    'data = sys.stdin.buffer.read()\n'
+    'sys.stdout.buffer.write(data.upper())\n'
+)
+
+HEAD = (
+    'import sys\n'
+    'sys.stdout.buffer.write(sys.stdin.buffer.read(4))\n'
+)
+
+
+def _script(code, exit_code=0):
+    return [sys.executable, '-c', code + f'\nraise SystemExit({exit_code})']
+
+
+# ===========================================================================
+# FONTES
+# ===========================================================================
+@pytest.mark.parametrize('source', [
+    b'abc' * 1000,
+    bytearray(b'abc' * 1000),
+    memoryview(b'abc' * 1000),
+    io.BytesIO(b'abc' * 1000),
+    iter([b'abc'] * 1000),
+    (memoryview(b'abc') for _ in range(1000)),
+])
+def test_run_piped_feeds_every_source_type(source):
+    output = b''.join(run_piped(_script(UPPERCASE), source, chunk_size=256))
+    assert output == b'ABC' * 1000
+
+
+def test_run_piped_passes_real_files_through(tmp_path):
+    path = tmp_path / 'in.bin'
+    path.write_bytes(b'skip' + b'xyz' * 10)
+
+    with open(path, 'rb') as f:
+        f.read(4)
+        output = b''.join(run_piped(_script(UPPERCASE), f))
+
+    assert output == b'XYZ' * 10
+
+
+def test_run_piped_tolerates_early_stdin_close():
+    output = b''.join(run_piped(_script(HEAD), b'x' * (8 << 20)))
+    assert output == b'xxxx'
+
+
+def test_run_piped_raises_on_failure():
+    with pytest.raises(CalledProcessError):
+        b''.join(run_piped(_script(UPPERCASE, exit_code=1), b'abc'))
+
+
+def test_run_piped_propagates_source_errors():
+    def broken_source():
+        yield b'abc'
+        raise RuntimeError('storage offline')
+
+    with pytest.raises(RuntimeError, match='storage offline'):
+        b''.join(run_piped(_script(UPPERCASE), broken_source()))
+
+
+# ===========================================================================
+# RUNNER
+# ===========================================================================
+def test_stream_builds_pipe_endpoints():
+    runner = Runner()
+    runner.add_output_options(OutputVideoOptions(format='webm'))
+    commands = []
+
+    def fake_build(input_file, output_file):
+        commands.append(Runner._build_command(runner, input_file, output_file))
+        return _script(UPPERCASE)
+
+    runner._build_command = fake_build
+    assert b''.join(runner.stream(b'frames')) == b'FRAMES'
+    assert commands == [['ffmpeg', '-i', 'pipe:0', '-f', 'webm', 'pipe:1']]
+
+
+def test_run_pipe_writes_to_file_object():
+    runner = Runner()
+    runner._build_command = lambda i, o: _script(UPPERCASE)
+    output = io.BytesIO()
+
+    runner.run_pipe(iter([b'ab', b'cd']), output)
+
+    assert output.getvalue() == b'ABCD'
+
+
+def test_run_pipe_writes_to_output_path(tmp_path):
+    runner = Runner(output_path=tmp_path / 'out.bin')
+    runner._build_command = lambda i, o: _script(
+        f'import sys; open({str(o)!r}, "wb").write(sys.stdin.buffer.read())'
+    )
+
+    runner.run_pipe(b'payload')
+
+    assert (tmp_path / 'out.bin').read_bytes() == b'payload'
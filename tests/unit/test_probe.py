@@ -0,0 +1,209 @@
+import json
+import threading
+import time
+import pytest
+from fractions import Fraction
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from pympeg.metrics import ProcessUsage
+from pympeg.probe import (
+    MediaInfo, SingleFlight, StreamInfo, parse_rate, probe, probe_duration, probe_many
+)
+
+
+FFPROBE_JSON = {
+    'streams': [
+        {
+            'index': 0, 'codec_type': 'video', 'codec_name': 'h264',
+            'width': 1920, 'height': 1080, 'pix_fmt': 'yuv420p',
+            'avg_frame_rate': '30000/1001', 'r_frame_rate': '30000/1001',
+            'bit_rate': '4500000', 'duration': '600.100000'
+        },
+        {
+            'index': 1, 'codec_type': 'audio', 'codec_name': 'aac',
+            'sample_rate': '48000', 'channels': 2, 'bit_rate': '128000',
+            'avg_frame_rate': '0/0', 'duration': '600.064000'
+        },
+    ],
+    'format': {
+        'format_name': 'mov,mp4,m4a,3gp,3g2,mj2', 'duration': '600.100000',
+        'size': '345678901', 'bit_rate': '4608000'
+    }
+}
+
+
+@pytest.fixture
+def info():
+    return MediaInfo.from_json(Path('aula.mp4'), FFPROBE_JSON)
+
+
+# ===========================================================================
+# MEDIAINFO
+# ===========================================================================
+def test_media_info_fields(info):
+    assert info.duration == 600.1
+    assert info.bit_rate == 4608000
+    assert info.size == 345678901
+    assert info.fps == Fraction(30000, 1001)
+    assert info.resolution == (1920, 1080)
+    assert info.pixel_format == 'yuv420p'
+    assert info.video_codec == 'h264'
+    assert info.audio_codec == 'aac'
+    assert info.has_audio
+    assert info.audio.sample_rate == 48000
+    assert info.audio.fps is None
+
+
+def test_media_info_is_slotted_and_frozen(info):
+    assert not hasattr(info, '__dict__')
+    assert not hasattr(info.video, '__dict__')
+    with pytest.raises(AttributeError):
+        info.duration = 1.0
+
+
+def test_media_info_without_video():
+    info = MediaInfo.from_json(Path('a.mp3'), {
+        'streams': [{'index': 0, 'codec_type': 'audio', 'duration': '3.5'}],
+        'format': {}
+    })
+    assert info.video is None
+    assert info.fps is None
+    assert info.resolution is None
+    assert info.duration == 3.5
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('30000/1001', Fraction(30000, 1001)),
+    ('25/1', Fraction(25)),
+    ('0/0', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_rate(value, expected):
+    assert parse_rate(value) == expected
+
+
+def test_r_frame_rate_fallback():
+    stream = StreamInfo.from_json({'index': 0, 'avg_frame_rate': '0/0', 'r_frame_rate': '24/1'})
+    assert stream.fps == 24
+
+
+# ===========================================================================
+# PROBE
+# ===========================================================================
+@patch('pympeg.probe.subprocess.check_output')
+def test_probe_spawns_single_ffprobe(mock_output):
+    mock_output.return_value = json.dumps(FFPROBE_JSON).encode()
+
+    info = probe('aula.mp4')
+
+    mock_output.assert_called_once()
+    cmd = mock_output.call_args[0][0]
+    assert cmd[0] == 'ffprobe'
+    assert '-show_format' in cmd and '-show_streams' in cmd
+    assert cmd[cmd.index('-print_format') + 1] == 'json'
+    assert info.path == Path('aula.mp4')
+
+
+@patch('pympeg.probe.subprocess.check_output')
+def test_probe_duration_returns_none_on_failure(mock_output):
+    mock_output.side_effect = CalledProcessError(1, ['ffprobe'])
+    assert probe_duration(Path('corrupt.mp4')) is None
+
+
+@patch('pympeg.runner.probe')
+def test_runner_caches_media_info(mock_probe, info):
+    from pympeg.runner import Runner
+    mock_probe.return_value = info
+    runner = Runner('aula.mp4', 'out.mp4')
+
+    assert runner.media_info(Path('aula.mp4')) is info
+    assert runner._probe_duration(Path('aula.mp4')) == 600.1
+    mock_probe.assert_called_once()
+
+
+# ===========================================================================
+# PROBE EM LOTE
+# ===========================================================================
+def test_probe_many_returns_errors_as_values():
+    def fake_probe(path):
+        if path.name == 'bad.mp4':
+            raise CalledProcessError(1, ['ffprobe'])
+        return MediaInfo(path, duration=1.0)
+
+    results = {r.path.name: r for r in probe_many(['a.mp4', 'bad.mp4', 'b.mp4'], probe_func=fake_probe)}
+
+    assert results['a.mp4'].ok and results['a.mp4'].info.duration == 1.0
+    assert not results['bad.mp4'].ok
+    assert isinstance(results['bad.mp4'].error, CalledProcessError)
+    assert results['b.mp4'].ok
+
+
+def test_probe_many_runs_concurrently():
+    barrier = threading.Barrier(4, timeout=5)
+
+    def fake_probe(path):
+        barrier.wait()
+        return MediaInfo(path)
+
+    results = list(probe_many([f'{i}.mp4' for i in range(4)], max_workers=4, probe_func=fake_probe))
+    assert all(r.ok for r in results)
+
+
+def test_probe_many_deduplicates_identical_paths(tmp_path):
+    calls = []
+
+    def fake_probe(path):
+        calls.append(path)
+        return MediaInfo(path)
+
+    video = tmp_path / 'a.mp4'
+    paths = [video, tmp_path / '.' / 'a.mp4', video]
+    results = list(probe_many(paths, probe_func=fake_probe))
+
+    assert len(calls) == 1
+    assert len(results) == 3
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('k', slow)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results == [42, 42]
+    assert len(calls) == 1
+
+
+@patch('pympeg.runner.probe')
+def test_runner_prefetches_durations_for_longest_first(mock_probe, tmp_path):
+    from pympeg.runner import Runner
+    for name in ['a.mp4', 'b.mp4']:
+        (tmp_path / name).touch()
+    mock_probe.side_effect = lambda p, ffprobe=None: MediaInfo(p, duration=1.0 if p.name == 'a.mp4' else 9.0)
+
+    runner = Runner(tmp_path, tmp_path / 'out', schedule='longest_first')
+    with patch('pympeg.runner.run_measured', return_value=ProcessUsage(0)) as mock_run:
+        runner.run_batch()
+
+    assert mock_probe.call_count == 2
+    dispatched = [c.args[0][c.args[0].index('-i') + 1] for c in mock_run.call_args_list]
+    assert [Path(p).name for p in dispatched] == ['b.mp4', 'a.mp4']
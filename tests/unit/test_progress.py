@@ -0,0 +1,127 @@
+import sys
+import pytest
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+from pympeg.progress import ProgressParser, Progress, parse_time
+from pympeg.runner import Runner
+from pympeg.options import InputVideoOptions, OutputVideoOptions
+
+
+PROGRESS_BLOCK = [
+    'frame=120\n',
+    'fps=59.94\n',
+    'stream_0_0_q=28.0\n',
+    'bitrate=1536.4kbits/s\n',
+    'total_size=262144\n',
+    'out_time_us=5000000\n',
+    'out_time_ms=5000000\n',
+    'out_time=00:00:05.000000\n',
+    'dup_frames=0\n',
+    'drop_frames=0\n',
+    'speed=2.5x\n',
+    'progress=continue\n',
+]
+
+
+# ===========================================================================
+# PARSER
+# ===========================================================================
+def test_parser_emits_event_only_at_block_end():
+    parser = ProgressParser(duration=20)
+    events = [parser.feed(line) for line in PROGRESS_BLOCK]
+
+    assert events[:-1] == [None] * (len(PROGRESS_BLOCK) - 1)
+    assert events[-1] == Progress(
+        frame=120, fps=59.94, out_time=5.0, speed=2.5,
+        total_size=262144, bitrate=1536.4, percent=25.0, done=False
+    )
+
+
+def test_parser_handles_missing_values():
+    parser = ProgressParser()
+    for line in ['frame=0\n', 'bitrate=N/A\n', 'speed=N/A\n', 'total_size=N/A\n']:
+        parser.feed(line)
+
+    progress = parser.feed('progress=continue\n')
+    assert progress == Progress(frame=0)
+
+
+def test_parser_end_block_is_complete():
+    parser = ProgressParser(duration=20)
+    parser.feed('out_time=00:00:19.000000\n')
+    progress = parser.feed('progress=end\n')
+
+    assert progress.done is True
+    assert progress.percent == 100.0
+    assert progress.out_time == 19.0
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('12.5', 12.5),
+    ('00:01:00.000', 60.0),
+    ('01:00:01.500000', 3601.5),
+    ('N/A', None),
+])
+def test_parse_time(value, expected):
+    assert parse_time(value) == expected
+
+
+# ===========================================================================
+# RUNNER
+# ===========================================================================
+def _progress_script(blocks, exit_code=0):
+    lines = ''.join(''.join(PROGRESS_BLOCK) for _ in range(blocks))
+    lines += 'progress=end\n'
+    return [sys.executable, '-c',
+            f'import sys; sys.stdout.write({lines!r}); sys.exit({exit_code})']
+
+
+@patch.object(Runner, '_probe_duration', return_value=20.0)
+def test_iter_progress_yields_events(_mock_probe):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner._progress_command = lambda i, o: _progress_script(blocks=2)
+
+    events = list(runner.iter_progress(Path('in.mp4'), Path('out.mp4')))
+
+    assert len(events) == 3
+    assert events[0].percent == 25.0
+    assert events[-1].done
+
+
+@patch.object(Runner, '_probe_duration', return_value=None)
+def test_run_file_delivers_progress_to_callback(_mock_probe):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner._progress_command = lambda i, o: _progress_script(blocks=1)
+    events = []
+    runner.on_progress = events.append
+
+    runner.run_file(Path('in.mp4'), Path('out.mp4'))
+
+    assert [e.done for e in events] == [False, True]
+    assert events[0].percent is None
+
+
+@patch.object(Runner, '_probe_duration', return_value=None)
+def test_iter_progress_raises_on_failure(_mock_probe):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner._progress_command = lambda i, o: _progress_script(blocks=1, exit_code=1)
+
+    with pytest.raises(CalledProcessError):
+        list(runner.iter_progress(Path('in.mp4'), Path('out.mp4')))
+
+
+def test_progress_command_places_progress_as_global_option():
+    runner = Runner('in.mp4', 'out.mp4')
+    cmd = runner._progress_command(Path('in.mp4'), Path('out.mp4'))
+    assert cmd[:3] == ['ffmpeg', '-progress', 'pipe:1']
+
+
+@patch.object(Runner, '_probe_duration', return_value=100.0)
+def test_expected_duration_accounts_for_seek_and_limit(_mock_probe):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_input_options(InputVideoOptions(start_time=30))
+    assert runner._expected_duration(Path('in.mp4')) == 70.0
+
+    runner.add_output_options(OutputVideoOptions(duration=10))
+    assert runner._expected_duration(Path('in.mp4')) == 10.0
@@ -1,11 +1,15 @@
 import pytest
 from unittest.mock import patch, MagicMock
+from pathlib import Path
 from subprocess import CalledProcessError
-from pympeg.runner import Runner
-from pympeg.options import GlobalOptions, InputVideoOptions, OutputVideoOptions
+from pympeg.metrics import ProcessUsage
+from pympeg.runner import Runner, split_thread_budget
+from pympeg.options import (
+    GlobalOptions, InputVideoOptions, OutputAudioOptions, OutputVideoOptions
+)
 
 
-@patch('pympeg.runner.subprocess.run')
+@patch('pympeg.runner.run_measured')
 def test_runner_assembles_full_command_order(mock_subprocess):
     runner = Runner('in.mp4', 'out.mkv')
     
@@ -44,7 +48,7 @@ def test_runner_raises_error_if_input_missing():
         runner.run()
 
 
-@patch('pympeg.runner.subprocess.run')
+@patch('pympeg.runner.run_measured')
 def test_runner_propagates_ffmpeg_errors(mock_subprocess):
     runner = Runner('corrupt.mp4', 'out.mp4')
     
@@ -58,3 +62,153 @@ def test_runner_propagates_ffmpeg_errors(mock_subprocess):
 
     with pytest.raises(CalledProcessError):
         runner.run()
+
+
+# ===========================================================================
+# BATCH PARALELO
+# ===========================================================================
+def _fake_ffmpeg_failing_on(name):
+    def fake_run(cmd, **kwargs):
+        if cmd[cmd.index('-i') + 1].endswith(name):
+            raise CalledProcessError(1, cmd)
+        return ProcessUsage(0)
+    return fake_run
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+@patch('pympeg.runner.run_measured')
+def test_run_batch_collects_ordered_results(mock_subprocess, tmp_path, max_workers):
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in ['a.mp4', 'b.mp4', 'c.mkv']:
+        (src / name).touch()
+
+    mock_subprocess.side_effect = _fake_ffmpeg_failing_on('b.mp4')
+    runner = Runner(src, tmp_path / 'out', max_workers=max_workers)
+
+    results = runner.run_batch()
+
+    assert [r.input_file.name for r in results] == ['a.mp4', 'b.mp4', 'c.mkv']
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, CalledProcessError)
+    assert (tmp_path / 'out').is_dir()
+
+
+def test_runner_rejects_invalid_max_workers():
+    with pytest.raises(ValueError):
+        Runner('in.mp4', 'out.mp4', max_workers=0)
+
+
+@pytest.mark.parametrize('max_workers, cpus, expected', [
+    (1, 32, 32),
+    (4, 32, 8),
+    (3, 32, 10),
+    (64, 32, 1),
+])
+def test_split_thread_budget(max_workers, cpus, expected):
+    assert split_thread_budget(max_workers, cpu_count=cpus) == expected
+
+
+def test_build_command_splits_threads_between_workers():
+    runner = Runner('in', 'out', max_workers=4)
+    with patch('pympeg.runner.os.cpu_count', return_value=32):
+        cmd = runner._build_command(Path('a.mp4'), Path('b.mp4'))
+    assert cmd[-3:] == ['-threads', '8', 'b.mp4']
+
+
+def test_build_command_keeps_explicit_threads():
+    runner = Runner('in', 'out', max_workers=4)
+    runner.add_output_options(OutputVideoOptions(threads=2))
+    cmd = runner._build_command(Path('a.mp4'), Path('b.mp4'))
+    assert cmd.count('-threads') == 1
+    assert cmd[-3:] == ['-threads', '2', 'b.mp4']
+
+
+def test_build_command_single_worker_has_no_thread_args():
+    runner = Runner('in', 'out')
+    cmd = runner._build_command(Path('a.mp4'), Path('b.mp4'))
+    assert '-threads' not in cmd
+
+
+# ===========================================================================
+# MÚLTIPLAS SAÍDAS
+# ===========================================================================
+def test_multiple_outputs_same_size_share_one_decode():
+    runner = Runner('in.mp4', 'hq.mp4')
+    runner.add_output_options(OutputVideoOptions(codec='libx264', crf=18))
+    runner.add_output('lq.mp4', OutputVideoOptions(codec='libx264', crf=30))
+
+    cmd = runner._build_command(Path('in.mp4'), Path('hq.mp4'))
+
+    assert cmd == [
+        'ffmpeg', '-i', 'in.mp4',
+        '-c:v', 'libx264', '-crf', '18', 'hq.mp4',
+        '-c:v', 'libx264', '-crf', '30', 'lq.mp4',
+    ]
+
+
+def test_multiple_outputs_different_sizes_use_split_filter():
+    runner = Runner('in.mp4', '1080.mp4')
+    runner.add_output_options(OutputVideoOptions(size='1920x1080', crf=20))
+    runner.add_output('720.mp4', OutputVideoOptions(size='hd720', crf=23))
+    runner.add_output('orig.mp4', OutputVideoOptions(crf=18))
+
+    cmd = runner._build_command(Path('in.mp4'), Path('1080.mp4'))
+
+    assert cmd == [
+        'ffmpeg', '-i', 'in.mp4',
+        '-filter_complex',
+        '[0:v]split=3[v0][v1][v2];[v0]scale=s=1920x1080[s0];[v1]scale=s=hd720[s1]',
+        '-map', '[s0]', '-map', '0:a?', '-crf', '20', '1080.mp4',
+        '-map', '[s1]', '-map', '0:a?', '-crf', '23', '720.mp4',
+        '-map', '[v2]', '-map', '0:a?', '-crf', '18', 'orig.mp4',
+    ]
+
+
+def test_audio_only_outputs_get_no_split_leg():
+    runner = Runner('in.mp4', '1080.mp4')
+    runner.add_output_options(OutputVideoOptions(size='1920x1080', crf=20))
+    runner.add_output('a.m4a', OutputAudioOptions(codec='aac', no_video=True))
+    runner.add_output('720.mp4', OutputVideoOptions(size='hd720', crf=23))
+    runner.add_output('b.mp3', OutputAudioOptions(codec='libmp3lame'))
+
+    cmd = runner._build_command(Path('in.mp4'), Path('1080.mp4'))
+
+    assert cmd == [
+        'ffmpeg', '-i', 'in.mp4',
+        '-filter_complex',
+        '[0:v]split=2[v0][v1];[v0]scale=s=1920x1080[s0];[v1]scale=s=hd720[s1]',
+        '-map', '[s0]', '-map', '0:a?', '-crf', '20', '1080.mp4',
+        '-map', '0:a?', '-c:a', 'aac', '-vn', 'a.m4a',
+        '-map', '[s1]', '-map', '0:a?', '-crf', '23', '720.mp4',
+        '-map', '0:a?', '-c:a', 'libmp3lame', 'b.mp3',
+    ]
+
+
+def test_audio_output_next_to_single_video_needs_no_split():
+    runner = Runner('in.mp4', '720.mp4')
+    runner.add_output_options(OutputVideoOptions(size='hd720'))
+    runner.add_output('a.m4a', OutputAudioOptions(codec='aac', no_video=True))
+
+    cmd = runner._build_command(Path('in.mp4'), Path('720.mp4'))
+
+    assert '-filter_complex' not in cmd
+    assert cmd[3:] == ['-s', 'hd720', '720.mp4', '-c:a', 'aac', '-vn', 'a.m4a']
+
+
+def test_multiple_outputs_in_batch_map_into_directories(tmp_path):
+    runner = Runner(tmp_path / 'src', tmp_path / 'hq')
+    runner.add_output(tmp_path / 'lq', OutputVideoOptions(crf=30))
+
+    cmd = runner._build_command(tmp_path / 'src' / 'a.mp4', tmp_path / 'hq' / 'a.mp4')
+
+    assert cmd[-1] == str(tmp_path / 'lq' / 'a.mp4')
+
+
+def test_threads_are_set_per_output():
+    runner = Runner('in.mp4', 'a.mp4', threads_per_job=4)
+    runner.add_output('b.mp4', OutputVideoOptions(threads=2))
+
+    cmd = runner._build_command(Path('in.mp4'), Path('a.mp4'))
+
+    assert cmd[3:] == ['-threads', '4', 'a.mp4', '-threads', '2', 'b.mp4']
@@ -0,0 +1,76 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from pympeg.metrics import ProcessUsage
+from pympeg.runner import Runner
+from pympeg.scheduling import (
+    dispatch_order, durations_or_sizes, file_sizes, lpt_order
+)
+
+
+@pytest.fixture
+def videos(tmp_path):
+    files = []
+    for name, size in [('a.mp4', 10), ('b.mp4', 300), ('c.mp4', 50)]:
+        path = tmp_path / name
+        path.write_bytes(b'\0' * size)
+        files.append(path)
+    return files
+
+
+# ===========================================================================
+# ORDENAÇÃO
+# ===========================================================================
+def test_lpt_order_is_longest_first_and_stable():
+    assert lpt_order([5, 30, 5, 10]) == [1, 3, 0, 2]
+
+
+def test_file_sizes_missing_file_weighs_zero(videos, tmp_path):
+    assert file_sizes(videos + [tmp_path / 'ghost.mp4']) == [10, 300, 50, 0]
+
+
+def test_durations_used_when_all_probed(videos):
+    durations = {'a.mp4': 3600.0, 'b.mp4': 60.0, 'c.mp4': 600.0}
+    weights = durations_or_sizes(videos, probe=lambda p: durations[p.name])
+    assert weights == [3600.0, 60.0, 600.0]
+
+
+def test_durations_fall_back_to_sizes(videos):
+    weights = durations_or_sizes(videos, probe=lambda p: None)
+    assert weights == [10, 300, 50]
+
+
+@patch('pympeg.scheduling.probe_duration')
+def test_dispatch_order_modes(mock_probe, videos):
+    mock_probe.side_effect = lambda p: {'a.mp4': 90.0, 'b.mp4': 1.0, 'c.mp4': 9.0}[p.name]
+
+    assert dispatch_order(videos, 'glob') == [0, 1, 2]
+    assert dispatch_order(videos, 'largest_first') == [1, 2, 0]
+    assert dispatch_order(videos, 'longest_first') == [0, 2, 1]
+
+
+def test_dispatch_order_invalid_mode(videos):
+    with pytest.raises(ValueError):
+        dispatch_order(videos, 'random')
+
+
+# ===========================================================================
+# RUNNER
+# ===========================================================================
+@patch('pympeg.runner.run_measured', return_value=ProcessUsage(0))
+def test_run_batch_dispatches_largest_first_but_reports_in_glob_order(
+    mock_subprocess, videos, tmp_path
+):
+    runner = Runner(tmp_path, tmp_path / 'out', schedule='largest_first')
+
+    results = runner.run_batch()
+
+    dispatched = [Path(c.args[0][c.args[0].index('-i') + 1]).name
+                  for c in mock_subprocess.call_args_list]
+    assert dispatched == ['b.mp4', 'c.mp4', 'a.mp4']
+    assert [r.input_file.name for r in results] == ['a.mp4', 'b.mp4', 'c.mp4']
+
+
+def test_runner_rejects_invalid_schedule():
+    with pytest.raises(ValueError):
+        Runner('in', 'out', schedule='random')
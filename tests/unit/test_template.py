@@ -0,0 +1,109 @@
+import os
+import pytest
+from pathlib import Path
+from pympeg import Builder, OutputVideoOptions, Runner
+from pympeg.journal import partial_path
+from pympeg.template import FlatOutput, JobTemplate, MirrorOutput, scan_files
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'aulas'
+    (root / 'modulo1').mkdir(parents=True)
+    for name in ('a.mp4', 'b.mkv', 'notas.txt', 'modulo1/c.mp4'):
+        (root / name).write_bytes(b'video')
+    partial_path(root / 'd.mp4').write_bytes(b'meio')
+    return root
+
+
+# ===========================================================================
+# TESTES: REGRAS DE SAÍDA
+# ===========================================================================
+def test_flat_output_keeps_name():
+    assert FlatOutput(Path('out'))(Path('in/a.mp4')) == Path('out/a.mp4')
+
+
+def test_flat_output_swaps_suffix():
+    assert FlatOutput(Path('out'), '.mkv')(Path('in/a.mp4')) == Path('out/a.mkv')
+
+
+def test_mirror_output_keeps_tree():
+    rule = MirrorOutput(Path('in'), Path('out'), '.webm')
+    assert rule(Path('in/mod/a.mp4')) == Path('out/mod/a.webm')
+
+
+# ===========================================================================
+# TESTES: VARREDURA
+# ===========================================================================
+def test_scan_files_is_lazy_and_filters(tree):
+    files = scan_files(tree, Runner.extensions)
+    assert iter(files) is files
+    assert sorted(p.name for p in files) == ['a.mp4', 'b.mkv']
+
+
+def test_scan_files_recursive(tree):
+    files = scan_files(tree, ['*.mp4'], recursive=True)
+    assert sorted(p.relative_to(tree).as_posix() for p in files) == ['a.mp4', 'modulo1/c.mp4']
+
+
+def test_scan_files_generic_patterns(tree):
+    assert [p.name for p in scan_files(tree, ['[ab].mp?'])] == ['a.mp4']
+
+
+# ===========================================================================
+# TESTES: TEMPLATE
+# ===========================================================================
+def test_template_compiles_prefix_once():
+    template = JobTemplate(
+        FlatOutput(Path('out')), ['-y'], ['-ss', '5'], ['-crf', '23']
+    )
+    assert template.prefix == ('ffmpeg', '-y', '-ss', '5', '-i')
+    assert template.command(Path('a.mp4'), Path('out/a.mp4')) == [
+        'ffmpeg', '-y', '-ss', '5', '-i', 'a.mp4', '-crf', '23', 'out/a.mp4'
+    ]
+
+
+def test_template_jobs_are_lazy():
+    calls = []
+
+    def paths():
+        for name in ('a.mp4', 'b.mp4'):
+            calls.append(name)
+            yield name
+
+    jobs = JobTemplate(FlatOutput(Path('out'))).jobs(paths())
+    assert calls == []
+    first = next(jobs)
+    assert calls == ['a.mp4']
+    assert first.output_file == Path('out/a.mp4')
+
+
+def test_template_accepts_scandir_entries(tree):
+    with os.scandir(tree) as entries:
+        jobs = list(JobTemplate(FlatOutput(Path('out'))).jobs(
+            e for e in entries if e.name == 'a.mp4'
+        ))
+    assert jobs[0].input_file == tree / 'a.mp4'
+
+
+def test_template_from_runner_matches_build_command(tree):
+    runner = Runner(tree, Path('out'))
+    runner.add_output_options(OutputVideoOptions(codec='libx264', crf=23))
+    job = next(runner.job_template().jobs([tree / 'a.mp4']))
+    assert job.command == runner._build_command(tree / 'a.mp4', Path('out/a.mp4'))
+
+
+def test_template_from_runner_rejects_extra_outputs():
+    runner = Runner('in', 'out')
+    runner.add_output('preview')
+    with pytest.raises(ValueError):
+        runner.job_template()
+
+
+def test_builder_exposes_template(tree):
+    template = Builder(tree, 'out').with_max_workers(2, threads_per_job=3).job_template(
+        MirrorOutput(tree, Path('out'), '.mkv')
+    )
+    job = next(template.jobs(scan_files(tree, ['*.mp4'], recursive=True)))
+    assert job.command[-3:] == ['-threads', '3', str(job.output_file)]
+    assert job.output_file.suffix == '.mkv'
@@ -0,0 +1,208 @@
+import pytest
+from pathlib import Path
+from pympeg import AsyncRunner, Builder, ChunkedEncoder, JobJournal, OutputCache, Runner
+from pympeg.options import OutputAudioOptions, OutputVideoOptions
+from pympeg.two_pass import TwoPassEncoder, parse_file_size, target_video_bitrate
+
+
+@pytest.fixture
+def fake_profile():
+    # Um minuto de mídia dá bitrates realistas para alvos de alguns MB.
+    return {'duration': 60.0, 'speed': 2000.0}
+
+
+def value(cmd, flag):
+    return cmd[cmd.index(flag) + 1]
+
+
+# ===========================================================================
+# TESTES: CÁLCULO DO BITRATE
+# ===========================================================================
+@pytest.mark.parametrize('text, expected', [
+    (1000, 1000),
+    ('25MB', 25_000_000),
+    ('8m', 8_000_000),
+    ('1.5 GiB', int(1.5 * 1024 ** 3)),
+    ('500kib', 512_000),
+])
+def test_parse_file_size(text, expected):
+    assert parse_file_size(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', 'muito', '10 tb', 0, '-5MB'])
+def test_parse_file_size_invalid(text):
+    with pytest.raises(ValueError):
+        parse_file_size(text)
+
+
+def test_target_bitrate_subtracts_audio_and_overhead():
+    # 10 MB em 100 s: 800 kbps no total, 2% de container, 128k de áudio.
+    assert target_video_bitrate(10_000_000, 100.0, 128_000, 0.02) == 656_000
+
+
+def test_target_too_small_raises():
+    with pytest.raises(ValueError):
+        target_video_bitrate(100_000, 600.0, 128_000)
+
+
+# ===========================================================================
+# TESTES: COMANDOS
+# ===========================================================================
+def test_pass_commands_share_isolated_passlog(tmp_path):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_output_options(OutputVideoOptions(codec='libx264', preset='slow', crf=20))
+    encoder = TwoPassEncoder(runner, '10MB', first_pass_preset='faster')
+
+    first, second = encoder.pass_commands(
+        Path('in.mp4'), Path('out.mp4'), tmp_path / 'passlog', 500_000
+    )
+
+    assert value(first, '-pass') == '1' and value(second, '-pass') == '2'
+    assert value(first, '-passlogfile') == value(second, '-passlogfile') == str(tmp_path / 'passlog')
+    assert value(first, '-preset') == 'faster' and value(second, '-preset') == 'slow'
+    assert '-crf' not in first and '-crf' not in second
+    assert first[-4:] == ['-an', '-f', 'null', '-']
+    assert second[-1] == 'out.mp4'
+
+
+def test_x265_passes_go_through_x265_params(tmp_path):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.add_output_options(OutputVideoOptions(codec='libx265', x265_params='aq-mode=3'))
+    first, second = TwoPassEncoder(runner, '10MB').pass_commands(
+        Path('in.mp4'), Path('out.mp4'), tmp_path / 'log', 500_000
+    )
+    assert '-pass' not in first
+    assert value(first, '-x265-params') == f'aq-mode=3:pass=1:stats={tmp_path / "log"}.log'
+    assert value(second, '-x265-params').endswith('pass=2:stats=' + str(tmp_path / 'log') + '.log')
+
+
+def test_audio_bitrate_follows_output_options(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    runner.add_output_options(OutputAudioOptions(bitrate='96k'))
+    assert TwoPassEncoder(runner, '10MB').audio_bitrate(videos / 'a.mp4') == 96_000
+
+
+def test_silent_input_has_no_audio_budget(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4', audio_codec=None)
+    assert TwoPassEncoder(runner, '10MB').audio_bitrate(videos / 'a.mp4') == 0
+
+
+# ===========================================================================
+# TESTES: EXECUÇÃO
+# ===========================================================================
+def test_two_pass_hits_target_size(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    runner.add_output_options(OutputAudioOptions(bitrate='128k'))
+    runner.two_pass = TwoPassEncoder(runner, '5MB')
+
+    result = runner.run()
+
+    assert result.ok
+    size = (tmp_path / 'a.mp4').stat().st_size
+    assert 0.95 * 5_000_000 <= size <= 5_000_000
+    assert not list(tmp_path.glob('.pympeg-pass-*'))
+
+
+def test_parallel_jobs_keep_passlogs_apart(tmp_path, videos, runner_for):
+    runner = runner_for(videos, tmp_path / 'out', speed=200.0)
+    runner.max_workers = 3
+    runner.two_pass = TwoPassEncoder(runner, '2MB')
+    passlogs = []
+
+    original = runner._execute
+
+    def spy(command_list, *args, **kwargs):
+        if '-passlogfile' in command_list:
+            passlogs.append(value(command_list, '-passlogfile'))
+        return original(command_list, *args, **kwargs)
+
+    runner._execute = spy
+    results = runner.run()
+
+    assert all(result.ok for result in results)
+    assert len(set(passlogs)) == 3
+    assert len(passlogs) == 6
+
+
+def test_second_pass_reports_progress(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    runner.two_pass = TwoPassEncoder(runner, '5MB')
+    updates = []
+    runner.on_progress = updates.append
+    runner.run()
+    assert [u.done for u in updates].count(True) == 1
+
+
+def test_target_size_is_a_separate_identity_field(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    plain = runner._job_command(videos / 'a.mp4', tmp_path / 'a.mp4')
+    runner.two_pass = TwoPassEncoder(runner, '5MB')
+    runner.journal = JobJournal(tmp_path / 'journal.jsonl')
+    assert runner.run().ok
+
+    entry = runner.journal.get(videos / 'a.mp4', tmp_path / 'a.mp4')
+    assert entry['args'] == plain
+    assert entry['settings'] == {
+        'target_size': 5_000_000, 'mux_overhead': 0.02, 'first_pass_preset': None
+    }
+
+    runner.two_pass = TwoPassEncoder(runner, '4MB')
+    assert not runner.journal.is_complete(
+        videos / 'a.mp4', tmp_path / 'a.mp4', plain, runner._job_settings()
+    )
+
+
+def test_target_size_changes_cache_key(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    with OutputCache(tmp_path / 'cache') as cache:
+        runner.output_cache = cache
+        plain = runner._cache_key(videos / 'a.mp4', tmp_path / 'a.mp4')
+        runner.two_pass = TwoPassEncoder(runner, '5MB')
+        assert runner._cache_key(videos / 'a.mp4', tmp_path / 'a.mp4') != plain
+
+
+def test_start_hook_reports_the_real_pass_commands(tmp_path, videos, runner_for):
+    runner = runner_for(videos / 'a.mp4', tmp_path / 'a.mp4')
+    runner.two_pass = TwoPassEncoder(runner, '5MB')
+    starts, executed = [], []
+    runner.hooks.register('on_start', starts.append)
+
+    original = runner._execute
+
+    def spy(command_list, *args, **kwargs):
+        executed.append(list(command_list))
+        return original(command_list, *args, **kwargs)
+
+    runner._execute = spy
+    assert runner.run().ok
+
+    event, = starts
+    assert list(event.passes) == executed
+    assert event.command == executed[-1]
+
+
+def test_unsupported_runners_reject_target_size(tmp_path):
+    runner = Runner('in.mp4', 'out.mp4')
+    runner.two_pass = TwoPassEncoder(runner, '5MB')
+    with pytest.raises(ValueError):
+        AsyncRunner.from_runner(runner)
+    with pytest.raises(ValueError):
+        ChunkedEncoder(runner)
+
+
+# ===========================================================================
+# TESTES: BUILDER
+# ===========================================================================
+def test_builder_with_target_size():
+    builder = Builder('in.mp4', 'out.mp4').with_target_size('25MB', first_pass_preset='veryfast')
+    encoder = builder._runner.two_pass
+    assert encoder.target_size == 25_000_000
+    assert encoder.first_pass_preset == 'veryfast'
+    assert encoder.runner is builder._runner
+
+
+def test_builder_with_target_size_invalid():
+    with pytest.raises(ValueError):
+        Builder('in.mp4', 'out.mp4').with_target_size('25MB', first_pass_preset='turbo')
+    with pytest.raises(TypeError):
+        Builder('in.mp4', 'out.mp4').with_target_size(25.5)
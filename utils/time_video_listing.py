@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
 from pathlib import Path
-from moviepy import VideoFileClip
+from pympeg import ProbeCache
+from pympeg.probe import probe_many
 import datetime
 
 def gerar_lista_tempos(diretorio):
@@ -21,11 +22,15 @@ def gerar_lista_tempos(diretorio):
         f.write("-" * 50 + "\n\n")
 
         lista_videos = sorted(pasta.glob("*.mp4"))
+        cache = ProbeCache()
+        probes = {r.path: r for r in probe_many(lista_videos, probe_func=cache.probe)}
 
         for video in lista_videos:
             try:
-                clip = VideoFileClip(str(video))
-                duracao_seg = clip.duration
+                resultado = probes[video]
+                if not resultado.ok:
+                    raise resultado.error
+                duracao_seg = resultado.info.duration
 
                 tempo_formatado = str(datetime.timedelta(seconds=int(duracao_seg)))
 
@@ -33,8 +38,6 @@ def gerar_lista_tempos(diretorio):
                 f.write(linha)
                 print(f"Processado: {video.name}")
 
-                clip.close()
-
             except Exception as e:
                 erro = f"ERRO ao ler {video.name}: {e}\n"
                 f.write(erro)